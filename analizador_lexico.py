@@ -1,32 +1,436 @@
 # lexer.py
-from tokens import TokenType, Token
+import re
+from typing import Iterator
+
+from tokens import TokenType, Token, TokenBuffer, StringTable
+from source_map import SourceMap
 
 
 class LexError(Exception):
     pass
 
 
+KEYWORDS = {
+    "int": TokenType.INT,
+    "float": TokenType.FLOAT,
+    "double": TokenType.DOUBLE,
+    "char": TokenType.CHAR,
+    "bool": TokenType.BOOL,
+    "void": TokenType.VOID,
+    "if": TokenType.IF,
+    "else": TokenType.ELSE,
+    "while": TokenType.WHILE,
+    "for": TokenType.FOR,
+    "switch": TokenType.SWITCH,
+    "case": TokenType.CASE,
+    "default": TokenType.DEFAULT,
+    "return": TokenType.RETURN,
+    "class": TokenType.CLASS,
+    "public": TokenType.PUBLIC,
+    "private": TokenType.PRIVATE,
+    "true": TokenType.TRUE,
+    "false": TokenType.FALSE,
+}
+
+OPERATORS = {
+    "(": TokenType.PAREN_IZQ,
+    ")": TokenType.PAREN_DER,
+    "{": TokenType.LLAVE_IZQ,
+    "}": TokenType.LLAVE_DER,
+    "[": TokenType.CORCHETE_IZQ,
+    "]": TokenType.CORCHETE_DER,
+    ";": TokenType.PUNTO_COMA,
+    ",": TokenType.COMA,
+    ".": TokenType.PUNTO,
+    "++": TokenType.OP_INC,
+    "+": TokenType.OP_SUMA,
+    "--": TokenType.OP_DEC,
+    "-": TokenType.OP_RESTA,
+    "*": TokenType.OP_MULT,
+    "%": TokenType.OP_MOD,
+    "/": TokenType.OP_DIV,
+    "==": TokenType.OP_IGUAL,
+    "=": TokenType.OP_ASIG,
+    "!=": TokenType.OP_DISTINTO,
+    "!": TokenType.OP_NOT,
+    "<=": TokenType.OP_MENOR_IG,
+    "<": TokenType.OP_MENOR,
+    ">=": TokenType.OP_MAYOR_IG,
+    ">": TokenType.OP_MAYOR,
+    "&&": TokenType.OP_AND,
+    "||": TokenType.OP_OR,
+}
+
+# Alternativas de token compartidas por los patrones del motor "regex".
+# Solo reconocen los casos "felices"; todo lo demás (errores, comentarios o
+# cadenas sin cerrar, dígitos o letras no ASCII) no hace match y se delega a
+# scan_token, así el resultado y los mensajes de LexError son idénticos a los
+# del motor escalar.
+TOKEN_ALTERNATIVES = r"""
+        (?P<ID>[A-Za-z_]\w*)
+      | (?P<OP>\+\+?|--?|[=!<>]=?|&&|\|\||/(?![*/])|[(){}\[\];,.*%])
+      | (?P<NUM_FLOAT>[0-9]+\.[0-9]+(?![0-9]|[^\x00-\x7f]))
+      | (?P<NUM_INT>[0-9]+(?![0-9]|\.?[^\x00-\x7f]|\.[0-9]))
+      | (?P<COMMENT_LINE>//[^\n]*)
+      | (?P<COMMENT_BLOCK>/\*.*?\*/)
+      | (?P<STRING>"[^"]*")
+      | (?P<CHAR_LITERAL>'[^\n]')
+      | (?P<END>\Z)
+"""
+
+# Expresión maestra: una sola alternancia con grupos nombrados, precedida de
+# los espacios en blanco que se saltan en el mismo match. Los saltos de
+# línea son un grupo aparte para llevar la cuenta de línea/columna.
+MASTER_PATTERN = re.compile(
+    r"[ \t\r]*(?:(?P<NEWLINE>\n)|" + TOKEN_ALTERNATIVES + ")",
+    re.VERBOSE | re.DOTALL,
+)
+
+# Variante sin contabilidad de posiciones (scan_buffer con lazy_positions):
+# el salto de línea es un espacio más.
+OFFSET_PATTERN = re.compile(
+    r"[ \t\r\n]*(?:" + TOKEN_ALTERNATIVES + ")",
+    re.VERBOSE | re.DOTALL,
+)
+
+# Misma variante sobre bytes (mmap/memoryview); solo se usa si el fuente es
+# ASCII, donde \w y los offsets de bytes coinciden con los de str.
+OFFSET_PATTERN_BYTES = re.compile(
+    rb"[ \t\r\n]*(?:" + TOKEN_ALTERNATIVES.encode("ascii") + rb")",
+    re.VERBOSE | re.DOTALL,
+)
+NON_ASCII_BYTES = re.compile(rb"[^\x00-\x7f]")
+
+KEYWORD_VALUES = {text: type_.value for text, type_ in KEYWORDS.items()}
+OPERATOR_VALUES = {text: type_.value for text, type_ in OPERATORS.items()}
+KEYWORD_VALUES_BYTES = {text.encode("ascii"): value for text, value in KEYWORD_VALUES.items()}
+OPERATOR_VALUES_BYTES = {text.encode("ascii"): value for text, value in OPERATOR_VALUES.items()}
+
+
 class Lexer:
-    def __init__(self, source: str):
-        self.source = source
+    # "numpy" necesita NumPy instalado (ver lexer_numpy.py)
+    ENGINES = ("scalar", "regex", "numpy")
+
+    def __init__(self, source, engine: str = "scalar", strings: StringTable = None,
+                 recover: bool = False):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown lexer engine: {engine!r}")
+        if isinstance(source, str):
+            self.source = source
+            self.data = None
+        else:
+            # bytes / mmap / memoryview (UTF-8): se decodifica solo si hace falta
+            self.source = None
+            self.data = source
+        self.engine = engine
+        # tabla de cadenas de la compilación (puede compartirse entre lexers)
+        self.strings = strings if strings is not None else StringTable()
+        # recover=True: cada LexError se registra en errors y se emite un
+        # token ERROR en lugar de abortar (ver recover_error)
+        self.recover = recover
+        self.errors: list[str] = []
         self.tokens: list[Token] = []
         self.start = 0
         self.current = 0
         self.line = 1
         self.column = 1
 
+    def text(self) -> str:
+        """Fuente como str, decodificando la entrada en bytes la primera vez"""
+        if self.source is None:
+            self.source = str(self.data, "utf-8")
+        return self.source
+
     def scan_tokens(self) -> list[Token]:
+        self.text()
+        if self.engine == "regex":
+            return self.scan_tokens_regex()
+        if self.engine == "numpy":
+            from lexer_numpy import scan_tokens_numpy
+            return scan_tokens_numpy(self)
+
         # BOF
         self.tokens.append(Token(TokenType.BOF, "BOF", 1, 1))
 
         while not self.is_at_end():
             self.start = self.current
-            self.scan_token()
+            try:
+                self.scan_token()
+            except LexError as e:
+                if not self.recover:
+                    raise
+                self.recover_error(e)
 
         # EOF
         self.tokens.append(Token(TokenType.EOF, "EOF", self.line, self.column))
         return self.tokens
 
+    def scan_tokens_parallel(self, workers: int = None) -> list[Token]:
+        """scan_tokens() repartido en procesos (ver lexer_parallel.py)"""
+        from lexer_parallel import scan_tokens_parallel
+        return scan_tokens_parallel(self, workers)
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Genera los tokens uno a uno sin acumularlos en self.tokens.
+
+        Produce el mismo flujo que scan_tokens (BOF ... EOF); pensado para
+        StreamingParser, que solo mantiene un pequeño buffer de lookahead.
+        """
+        self.text()
+        if self.engine == "regex":
+            yield from self._iter_tokens_regex()
+            return
+        if self.engine == "numpy":
+            # el motor numpy trabaja sobre todo el fuente de una vez
+            yield from self.scan_tokens()
+            return
+
+        yield Token(TokenType.BOF, "BOF", 1, 1)
+        tokens = self.tokens
+        while not self.is_at_end():
+            self.start = self.current
+            try:
+                self.scan_token()
+            except LexError as e:
+                if not self.recover:
+                    raise
+                self.recover_error(e)
+            if tokens:
+                yield tokens.pop()
+        yield Token(TokenType.EOF, "EOF", self.line, self.column)
+
+    def scan_buffer(self, lazy_positions: bool = False) -> TokenBuffer:
+        """Escanea todo el fuente a un TokenBuffer compacto.
+
+        Usa MASTER_PATTERN (con caída a scan_token) sin crear un Token por
+        token; el resultado equivale a scan_tokens().
+
+        Con lazy_positions=True los tokens solo guardan offsets: línea y
+        columna se calculan al pedirlas con un SourceMap (ver
+        _scan_buffer_offsets).
+        """
+        if lazy_positions:
+            return self._scan_buffer_offsets()
+
+        source = self.text()
+        n = len(source)
+        buf = TokenBuffer(source, self.strings)
+        kinds = buf.kinds
+        starts = buf.starts
+        ends = buf.ends
+        lines = buf.lines
+        columns = buf.columns
+        name_ids = buf.name_ids
+        intern = self.strings.intern
+        keyword_values = KEYWORD_VALUES
+        operator_values = OPERATOR_VALUES
+        id_value = TokenType.ID.value
+        kind_values = {
+            "NUM_INT": TokenType.NUM_INT.value,
+            "NUM_FLOAT": TokenType.NUM_FLOAT.value,
+            "CHAR_LITERAL": TokenType.CHAR_LITERAL.value,
+        }
+        string_value = TokenType.STRING.value
+
+        buf.append_special(TokenType.BOF, "BOF", 1, 1)
+        line = 1
+        line_base = -1
+        pos = 0
+
+        while pos < n:
+            scanner = MASTER_PATTERN.scanner(source, pos)
+            for m in iter(scanner.match, None):
+                kind = m.lastgroup
+                pos = m.end()
+                if kind == "NEWLINE":
+                    line += 1
+                    line_base = pos - 1
+                    continue
+                if kind == "COMMENT_LINE" or kind == "END":
+                    continue
+                start = m.start(kind)
+                name_id = -1
+                if kind == "ID":
+                    text = m.group(kind)
+                    value = keyword_values.get(text)
+                    if value is None:
+                        value = id_value
+                        name_id = intern(text)
+                    kinds.append(value)
+                elif kind == "OP":
+                    kinds.append(operator_values[m.group(kind)])
+                elif kind == "STRING" or kind == "COMMENT_BLOCK":
+                    text = m.group(kind)
+                    newlines = text.count("\n")
+                    if newlines:
+                        line += newlines
+                        line_base = start + text.rfind("\n") - 1
+                    if kind == "COMMENT_BLOCK":
+                        continue
+                    kinds.append(string_value)
+                    starts.append(start + 1)
+                    ends.append(pos - 1)
+                    lines.append(line)
+                    columns.append(start - line_base)
+                    name_ids.append(-1)
+                    continue
+                else:
+                    kinds.append(kind_values[kind])
+                starts.append(start)
+                ends.append(pos)
+                lines.append(line)
+                columns.append(start - line_base)
+                name_ids.append(name_id)
+            if pos >= n:
+                break
+            # Sin match: un token con la lógica escalar (incluye errores)
+            self.start = self.current = pos
+            self.line = line
+            self.column = pos - line_base
+            self.scan_token_or_error()
+            if self.tokens:
+                tok = self.tokens.pop()
+                if tok.type == TokenType.STRING:
+                    buf.append(tok.type, pos + 1, self.current - 1, tok.line, tok.column)
+                else:
+                    buf.append(tok.type, pos, self.current, tok.line, tok.column,
+                               -1 if tok.name_id is None else tok.name_id)
+            pos = self.current
+            line = self.line
+            line_base = pos - self.column
+
+        self.line = line
+        self.column = n - line_base
+        self.current = n
+        buf.append_special(TokenType.EOF, "EOF", self.line, self.column)
+        return buf
+
+    def _scan_buffer_offsets(self) -> TokenBuffer:
+        """scan_buffer sin contabilidad de línea/columna.
+
+        El camino sin errores no cuenta saltos de línea ni columnas; las
+        posiciones se resuelven bajo demanda con el SourceMap del buffer y
+        son el inicio real del token (línea y columna desde 1). Solo difieren
+        de scan_tokens() en tokens que siguen, en la misma línea, a un
+        comentario de bloque o cadena multilínea (donde el motor escalar
+        desplaza la columna) y en cadenas multilínea (que allí llevan la
+        línea final). Los mensajes de LexError son los mismos.
+
+        Si la entrada es bytes/mmap y es ASCII, se lexea directamente sobre
+        el buffer con OFFSET_PATTERN_BYTES, sin decodificar ni copiar: los
+        lexemas quedan como offsets y se decodifican al pedirlos. Con
+        cualquier byte no ASCII se decodifica todo y se usa el camino str.
+        """
+        if self.source is None and NON_ASCII_BYTES.search(self.data) is None:
+            source = self.data
+        else:
+            source = self.text()
+        n = len(source)
+        buf = TokenBuffer(source, self.strings, SourceMap(source))
+        buf.append_special(TokenType.BOF, "BOF", 1, 1, 0)
+        self._scan_offsets(buf, 0)
+        self.current = n
+        self.line, self.column = buf.source_map.line_col(n)
+        buf.append_special(TokenType.EOF, "EOF", self.line, self.column, n)
+        return buf
+
+    def _scan_offsets(self, buf: TokenBuffer, pos: int, resync=None, resync_from: int = None):
+        """Lexea buf.source desde `pos` añadiendo tokens (solo offsets) a buf.
+
+        `pos` debe ser un límite de token (0 o el final de un token). Si se
+        da `resync`, antes de añadir cada token que empieza en un offset
+        >= resync_from se llama resync(offset); si devuelve True se para ahí
+        sin añadirlo y se retorna ese offset (lo usa relex). Sin parar,
+        retorna None al llegar al final.
+        """
+        source = buf.source
+        if isinstance(source, str):
+            is_text = True
+            pattern = OFFSET_PATTERN
+            keyword_values = KEYWORD_VALUES
+            operator_values = OPERATOR_VALUES
+        else:
+            is_text = False
+            pattern = OFFSET_PATTERN_BYTES
+            keyword_values = KEYWORD_VALUES_BYTES
+            operator_values = OPERATOR_VALUES_BYTES
+        n = len(source)
+        if resync is None:
+            resync_from = n + 1
+        kinds = buf.kinds
+        starts = buf.starts
+        ends = buf.ends
+        name_ids = buf.name_ids
+        intern = self.strings.intern
+        name_cache = {}  # lexema (str o bytes) -> name_id
+        id_value = TokenType.ID.value
+        kind_values = {
+            "NUM_INT": TokenType.NUM_INT.value,
+            "NUM_FLOAT": TokenType.NUM_FLOAT.value,
+            "CHAR_LITERAL": TokenType.CHAR_LITERAL.value,
+            "STRING": TokenType.STRING.value,
+        }
+
+        while pos < n:
+            scanner = pattern.scanner(source, pos)
+            for m in iter(scanner.match, None):
+                kind = m.lastgroup
+                start = m.start(kind)
+                if start >= resync_from and resync(start):
+                    return start
+                pos = m.end()
+                if kind == "ID":
+                    text = m.group(kind)
+                    value = keyword_values.get(text)
+                    if value is None:
+                        name_id = name_cache.get(text)
+                        if name_id is None:
+                            name_id = intern(text if is_text else text.decode("ascii"))
+                            name_cache[text] = name_id
+                        kinds.append(id_value)
+                        name_ids.append(name_id)
+                    else:
+                        kinds.append(value)
+                        name_ids.append(-1)
+                    starts.append(start)
+                    ends.append(pos)
+                elif kind == "OP":
+                    kinds.append(operator_values[m.group(kind)])
+                    name_ids.append(-1)
+                    starts.append(start)
+                    ends.append(pos)
+                elif kind == "STRING":
+                    kinds.append(kind_values[kind])
+                    name_ids.append(-1)
+                    starts.append(start + 1)
+                    ends.append(pos - 1)
+                elif kind in kind_values:
+                    kinds.append(kind_values[kind])
+                    name_ids.append(-1)
+                    starts.append(start)
+                    ends.append(pos)
+                # COMMENT_LINE, COMMENT_BLOCK y END: no generan token
+            if pos >= n:
+                break
+            # Sin match: un token con la lógica escalar (incluye errores,
+            # que necesitan la línea actual). En ASCII los offsets de bytes
+            # valen para el texto decodificado.
+            self.text()
+            self.start = self.current = pos
+            self.line, self.column = buf.source_map.line_col(pos)
+            self.scan_token_or_error()
+            if self.tokens:
+                tok = self.tokens.pop()
+                if pos >= resync_from and resync(pos):
+                    return pos
+                name_id = -1 if tok.name_id is None else tok.name_id
+                if tok.type == TokenType.STRING:
+                    buf.append(tok.type, pos + 1, self.current - 1, 0, 0, name_id)
+                else:
+                    buf.append(tok.type, pos, self.current, 0, 0, name_id)
+            pos = self.current
+        return None
+
     # ----------------- helpers básicos -----------------
 
     def is_at_end(self) -> bool:
@@ -57,10 +461,46 @@ class Lexer:
         self.column += 1
         return True
 
-    def add_token(self, type_: TokenType, lexeme: str = None):
+    def add_token(self, type_: TokenType, lexeme: str = None, name_id: int = None):
         if lexeme is None:
             lexeme = self.source[self.start:self.current]
-        self.tokens.append(Token(type_, lexeme, self.line, self.column - len(lexeme)))
+        self.tokens.append(Token(type_, lexeme, self.line, self.column - len(lexeme), name_id))
+
+    # ----------------- recuperación de errores -----------------
+
+    def scan_token_or_error(self):
+        """scan_token; en modo recover un LexError no aborta el escaneo"""
+        try:
+            self.scan_token()
+        except LexError as e:
+            if not self.recover:
+                raise
+            self.recover_error(e)
+
+    def recover_error(self, error: LexError):
+        """Registra el error y emite un token ERROR con el texto saltado.
+
+        scan_token ya consumió lo inválido (el carácter suelto, o hasta el
+        final en comentarios y cadenas sin cerrar); un literal char de más
+        de un carácter se salta hasta su comilla de cierre si está en la
+        misma línea, para no encadenar errores. El token lleva la línea y
+        columna de su inicio.
+        """
+        self.errors.append(str(error))
+        source = self.source
+        if source[self.start] == "'":
+            line_end = source.find("\n", self.current)
+            close = source.find("'", self.current, len(source) if line_end < 0 else line_end)
+            if close >= 0:
+                self.column += close + 1 - self.current
+                self.current = close + 1
+        lexeme = source[self.start:self.current]
+        newlines = lexeme.count("\n")
+        if newlines:
+            column = self.start - source.rfind("\n", 0, self.start)
+        else:
+            column = self.column - len(lexeme)
+        self.tokens.append(Token(TokenType.ERROR, lexeme, self.line - newlines, column))
 
     # ----------------- lógica principal -----------------
 
@@ -197,7 +637,7 @@ class Lexer:
         # consume la comilla de cierre
         self.advance()
         # contenido sin comillas
-        value = self.source[self.start + 1:self.current - 1]
+        value = self.strings.canonical(self.source[self.start + 1:self.current - 1])
         self.tokens.append(Token(TokenType.STRING, value, self.line, self.column - len(value) - 2))
 
     def char_literal(self):
@@ -208,7 +648,7 @@ class Lexer:
         if self.peek() != "'":
             raise LexError(f"[L{self.line}] Char literal must be one character")
         self.advance()  # cierra '
-        lexeme = self.source[self.start:self.current]
+        lexeme = self.strings.canonical(self.source[self.start:self.current])
         self.tokens.append(Token(TokenType.CHAR_LITERAL, lexeme, self.line, self.column - len(lexeme)))
 
     def number(self):
@@ -220,10 +660,10 @@ class Lexer:
             self.advance()  # consume '.'
             while self.peek().isdigit():
                 self.advance()
-            lexeme = self.source[self.start:self.current]
+            lexeme = self.strings.canonical(self.source[self.start:self.current])
             self.add_token(TokenType.NUM_FLOAT, lexeme)
         else:
-            lexeme = self.source[self.start:self.current]
+            lexeme = self.strings.canonical(self.source[self.start:self.current])
             self.add_token(TokenType.NUM_INT, lexeme)
 
     # ----------------- identificadores / keywords -----------------
@@ -239,27 +679,99 @@ class Lexer:
             self.advance()
         text = self.source[self.start:self.current]
 
-        keywords = {
-            "int": TokenType.INT,
-            "float": TokenType.FLOAT,
-            "double": TokenType.DOUBLE,
-            "char": TokenType.CHAR,
-            "bool": TokenType.BOOL,
-            "void": TokenType.VOID,
-            "if": TokenType.IF,
-            "else": TokenType.ELSE,
-            "while": TokenType.WHILE,
-            "for": TokenType.FOR,
-            "switch": TokenType.SWITCH,
-            "case": TokenType.CASE,
-            "default": TokenType.DEFAULT,
-            "return": TokenType.RETURN,
-            "class": TokenType.CLASS,
-            "public": TokenType.PUBLIC,
-            "private": TokenType.PRIVATE,
-            "true": TokenType.TRUE,
-            "false": TokenType.FALSE,
-        }
+        type_ = KEYWORDS.get(text)
+        if type_ is not None:
+            self.add_token(type_, text)
+            return
+        name_id = self.strings.intern(text)
+        self.add_token(TokenType.ID, self.strings.names[name_id], name_id)
+
+    # ----------------- motor regex -----------------
+
+    def scan_tokens_regex(self) -> list[Token]:
+        self.tokens = list(self._iter_tokens_regex())
+        return self.tokens
 
-        type_ = keywords.get(text, TokenType.ID)
-        self.add_token(type_, text)
+    def _iter_tokens_regex(self) -> Iterator[Token]:
+        """Mismo flujo de tokens que el motor escalar, usando MASTER_PATTERN.
+
+        La columna se calcula como `pos - line_base`. Un salto de línea normal
+        deja line_base en su offset; uno dentro de comentario de bloque o
+        cadena lo deja un carácter antes, igual que hace el motor escalar
+        (column = 1 seguido de advance()).
+        """
+        source = self.source
+        n = len(source)
+        keywords = KEYWORDS
+        operators = OPERATORS
+        intern = self.strings.intern
+        names = self.strings.names
+        canonical = self.strings.canonical
+        tok_id = TokenType.ID
+        tok_string = TokenType.STRING
+        tok_char = TokenType.CHAR_LITERAL
+        tok_int = TokenType.NUM_INT
+        tok_float = TokenType.NUM_FLOAT
+
+        yield Token(TokenType.BOF, "BOF", 1, 1)
+        line = 1
+        line_base = -1
+        pos = 0
+
+        while pos < n:
+            scanner = MASTER_PATTERN.scanner(source, pos)
+            for m in iter(scanner.match, None):
+                kind = m.lastgroup
+                pos = m.end()
+                if kind == "ID":
+                    start = m.start(kind)
+                    text = m.group(kind)
+                    type_ = keywords.get(text)
+                    if type_ is not None:
+                        yield Token(type_, text, line, start - line_base)
+                    else:
+                        name_id = intern(text)
+                        yield Token(tok_id, names[name_id], line, start - line_base, name_id)
+                elif kind == "OP":
+                    start = m.start(kind)
+                    text = m.group(kind)
+                    yield Token(operators[text], text, line, start - line_base)
+                elif kind == "NEWLINE":
+                    line += 1
+                    line_base = pos - 1
+                elif kind == "NUM_INT":
+                    text = canonical(m.group(kind))
+                    yield Token(tok_int, text, line, m.start(kind) - line_base)
+                elif kind == "NUM_FLOAT":
+                    text = canonical(m.group(kind))
+                    yield Token(tok_float, text, line, m.start(kind) - line_base)
+                elif kind == "CHAR_LITERAL":
+                    text = canonical(m.group(kind))
+                    yield Token(tok_char, text, line, m.start(kind) - line_base)
+                elif kind == "STRING" or kind == "COMMENT_BLOCK":
+                    start = m.start(kind)
+                    text = m.group(kind)
+                    newlines = text.count("\n")
+                    if newlines:
+                        line += newlines
+                        line_base = start + text.rfind("\n") - 1
+                    if kind == "STRING":
+                        yield Token(tok_string, canonical(text[1:-1]), line, start - line_base)
+                # COMMENT_LINE y END: no generan token
+            if pos >= n:
+                break
+            # Sin match: un token con la lógica escalar (incluye errores)
+            self.start = self.current = pos
+            self.line = line
+            self.column = pos - line_base
+            self.scan_token_or_error()
+            if self.tokens:
+                yield self.tokens.pop()
+            pos = self.current
+            line = self.line
+            line_base = pos - self.column
+
+        self.line = line
+        self.column = n - line_base
+        self.current = n
+        yield Token(TokenType.EOF, "EOF", self.line, self.column)
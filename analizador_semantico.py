@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Set, Tuple
 from enum import Enum
 from ast_nodes import *
+from ast_visitor import NodeVisitor
 from tokens import TokenType
 
 
@@ -20,9 +21,14 @@ class TypeKind(Enum):
         return self.value
 
 
-@dataclass
+@dataclass(slots=True)
 class Symbol:
-    """Entrada en la tabla de símbolos"""
+    """Entrada en la tabla de símbolos (variables y parámetros).
+
+    Con __slots__: un programa grande tiene un símbolo por declaración. Los
+    datos propios de funciones y clases van en FunctionSymbol y
+    ClassSymbol; en el resto de los símbolos se leen como None.
+    """
     name: str
     type_: TypeKind
     kind: str  # "variable", "function", "class", "parameter"
@@ -31,13 +37,24 @@ class Symbol:
     is_initialized: bool = False
     is_array: bool = False  # True si es un arreglo
 
-    # Atributos adicionales para funciones
+    param_types = None
+    return_type = None
+    members = None
+    methods = None
+
+
+@dataclass(slots=True)
+class FunctionSymbol(Symbol):
+    """Símbolo de función o método"""
     param_types: Optional[List[TypeKind]] = None
     return_type: Optional[TypeKind] = None
 
-    # Atributos para clases
-    members: Optional[Dict[str, 'Symbol']] = None
-    methods: Optional[Dict[str, 'Symbol']] = None
+
+@dataclass(slots=True)
+class ClassSymbol(Symbol):
+    """Símbolo de clase"""
+    members: Optional[Dict[str, Symbol]] = None
+    methods: Optional[Dict[str, Symbol]] = None
 
 
 class SemanticError(Exception):
@@ -45,21 +62,46 @@ class SemanticError(Exception):
     pass
 
 
+def already_defined(name: str, token: Token) -> str:
+    """Mensaje de una redefinición en el mismo scope"""
+    return f"[L{token.line},C{token.column}] Symbol '{name}' already defined in this scope"
+
+
+TYPE_OF_TOKEN = {
+    TokenType.INT: TypeKind.INT,
+    TokenType.FLOAT: TypeKind.FLOAT,
+    TokenType.DOUBLE: TypeKind.DOUBLE,
+    TokenType.CHAR: TypeKind.CHAR,
+    TokenType.BOOL: TypeKind.BOOL,
+    TokenType.VOID: TypeKind.VOID,
+}
+
+
+def token_to_type(token: Token) -> TypeKind:
+    """Convierte un token de tipo a TypeKind"""
+    return TYPE_OF_TOKEN.get(token.type, TypeKind.ERROR)
+
+
 class Scope:
-    """Representa scope (nivel de visibilidad)"""
-    def __init__(self, scope_type: str, parent: Optional['Scope'] = None):
+    """Representa scope (nivel de visibilidad)
+
+    level es la profundidad de anidamiento; por defecto, la del padre + 1.
+    """
+    __slots__ = ("scope_type", "parent", "symbols", "level")
+
+    def __init__(self, scope_type: str, parent: Optional['Scope'] = None,
+                 level: Optional[int] = None):
         self.scope_type = scope_type  # "global", "class", "function", "block"
         self.parent = parent
         self.symbols: Dict[str, Symbol] = {}
-        self.level = parent.level + 1 if parent else 0
+        if level is None:
+            level = parent.level + 1 if parent else 0
+        self.level = level
 
     def define(self, name: str, symbol: Symbol):
         """Define un símbolo en este scope"""
         if name in self.symbols:
-            raise SemanticError(
-                f"[L{symbol.token.line},C{symbol.token.column}] "
-                f"Symbol '{name}' already defined in this scope"
-            )
+            raise SemanticError(already_defined(name, symbol.token))
         self.symbols[name] = symbol
 
     def lookup(self, name: str) -> Optional[Symbol]:
@@ -126,39 +168,70 @@ class TypeSystem:
         return True
 
 
-class SemanticAnalyzer:
-    """Analizador semántico con patrón Visitor"""
+class SemanticAnalyzer(NodeVisitor):
+    """Analizador semántico con patrón Visitor.
+
+    self.visit(node) despacha por type(node) (ver ast_visitor.py); las
+    expresiones retornan su TypeKind y lo anotan en node.expr_type. Los
+    scopes y símbolos los arma antes NameResolver (name_resolver.py): cada
+    uso y cada declaración del AST ya trae su Symbol, y aquí solo se
+    reportan errores y se verifican tipos. Tras analyze(), las pasadas
+    siguientes leen expr_type y symbol de los nodos, o usan type_of().
+    """
 
     def __init__(self):
-        self.current_scope: Optional[Scope] = None
+        super().__init__()
         self.global_scope: Optional[Scope] = None
         self.current_function: Optional[Symbol] = None
         self.current_class: Optional[Symbol] = None
         self.errors: List[str] = []
+        # True si analyze() se cortó por una excepción inesperada: los
+        # errores pueden estar incompletos (main.py no los guarda en la caché)
+        self.failed = False
         self.type_system = TypeSystem()
 
     def analyze(self, program: Program) -> List[str]:
         """Entrada principal del análisis semántico"""
         """print("[DEBUG-SEM] Iniciando analyze()")"""
-        self.global_scope = Scope("global")
-        self.current_scope = self.global_scope
-        """print(f"[DEBUG-SEM] Global scope creado")"""
+        from ast_visitor import deepest_node, run_deep
 
         try:
-            print(f"[DEBUG-SEM] Visitando programa con {len(program.declarations)} declaraciones")
-            self.visit_Program(program)
-            """print(f"[DEBUG-SEM] visit_Program completado")"""
+            # el AST puede venir de parse_iterative(), sin límite de
+            # anidamiento: las pasadas, recursivas, corren con pila grande
+            run_deep(self._analyze_program, program)
         except SemanticError as e:
             print(f"[DEBUG-SEM] SemanticError capturado: {e}")
             self.errors.append(str(e))
+        except RecursionError as e:
+            node = deepest_node(e)
+            tok = node.start_token if node is not None else program.start_token
+            where = f"[L{tok.line},C{tok.column}] " if tok is not None else ""
+            self.errors.append(f"{where}Nesting too deep for semantic analysis")
+            self.failed = True
         except Exception as e:
             print(f"[DEBUG-SEM] Excepción inesperada: {e}")
+            self.failed = True
             import traceback
             traceback.print_exc()
 
         """print(f"[DEBUG-SEM] Análisis completado con {len(self.errors)} errores")"""
         return self.errors
 
+    def _analyze_program(self, program: Program):
+        from name_resolver import NameResolver
+
+        self.global_scope = NameResolver().resolve(program)
+        print(f"[DEBUG-SEM] Visitando programa con {len(program.declarations)} declaraciones")
+        self.visit_Program(program)
+        """print(f"[DEBUG-SEM] visit_Program completado")"""
+
+    def analyze_parallel(self, program: Program, workers: int = None) -> List[str]:
+        """analyze() repartido en procesos por declaraciones de nivel superior
+        (ver semantic_parallel.py). Mismos errores, en el mismo orden.
+        """
+        from semantic_parallel import analyze_parallel
+        return analyze_parallel(self, program, workers)
+
     # ===== VISITORS: Programa y Declaraciones =====
 
     def visit_Program(self, node: Program):
@@ -173,76 +246,21 @@ class SemanticAnalyzer:
         # Segunda pasada: verificar cuerpos
         for i, decl in enumerate(node.declarations):
             """print(f"[DEBUG-SEM]   Visitando declaración {i}: {type(decl).__name__}")"""
-            self.visit_Declaration(decl)
+            self.visit(decl)
         """print("[DEBUG-SEM] visit_Program completado")"""
 
     def collect_declaration(self, node: Declaration):
-        """Pre-procesa declaraciones para registrar símbolos"""
-        if isinstance(node, VarDecl):
-            # Las variables globales se registran más tarde en visit_VarDecl
-            pass
-        elif isinstance(node, FuncDecl):
-            self.collect_FuncDecl(node)
-        elif isinstance(node, ClassDecl):
-            self.collect_ClassDecl(node)
-
-    def collect_FuncDecl(self, node: FuncDecl):
-        """Colecta firma de función"""
-        func_name = node.name_token.lexeme
-        return_type = self.token_to_type(node.return_type)
-
-        param_types = [self.token_to_type(p.type_token) for p in node.parameters]
-
-        sym = Symbol(
-            name=func_name,
-            type_=return_type,
-            kind="function",
-            token=node.name_token,
-            scope_level=self.current_scope.level,
-            param_types=param_types,
-            return_type=return_type
-        )
-
-        try:
-            self.current_scope.define(func_name, sym)
-        except SemanticError as e:
-            self.errors.append(str(e))
-
-    def collect_ClassDecl(self, node: ClassDecl):
-        """Colecta declaración de clase"""
-        class_name = node.name_token.lexeme
-
-        sym = Symbol(
-            name=class_name,
-            type_=TypeKind.ERROR,  # Las clases no tienen tipo primitivo
-            kind="class",
-            token=node.name_token,
-            scope_level=self.current_scope.level,
-            members={},
-            methods={}
-        )
-
-        try:
-            self.current_scope.define(class_name, sym)
-        except SemanticError as e:
-            self.errors.append(str(e))
+        """Reporta las funciones y clases cuyo nombre ya estaba definido"""
+        if isinstance(node, (FuncDecl, ClassDecl)):
+            self._check_defined(node.symbol, node.name_token)
 
     def visit_Declaration(self, node: Declaration):
-        """Visitor genérico para declaraciones"""
-        """print(f"[DEBUG-SEM] visit_Declaration: {type(node).__name__}")"""
-        if isinstance(node, VarDecl):
-            """print("[DEBUG-SEM]   -> visitando VarDecl")"""
-            self.visit_VarDecl(node)
-        elif isinstance(node, FuncDecl):
-            func_name = node.name_token.lexeme if hasattr(node, 'name_token') else "?"
-            """print(f"[DEBUG-SEM]   -> visitando FuncDecl '{func_name}'")"""
-            self.visit_FuncDecl(node)
-        elif isinstance(node, ClassDecl):
-            class_name = node.name_token.lexeme if hasattr(node, 'name_token') else "?"
-            """print(f"[DEBUG-SEM]   -> visitando ClassDecl '{class_name}'")"""
-            self.visit_ClassDecl(node)
-        else:
-            print(f"[DEBUG-SEM]   -> tipo desconocido!")
+        """Declaración sin visitor propio"""
+        print(f"[DEBUG-SEM]   -> tipo desconocido!")
+
+    def visit_ErrorDecl(self, node: ErrorDecl):
+        """Código descartado por el parser en modo recover"""
+        pass
 
     def visit_VarDecl(self, node: VarDecl):
         """Analiza declaración de variable"""
@@ -258,27 +276,12 @@ class SemanticAnalyzer:
             return
 
         for declarator in node.declarators:
-            var_name = declarator.name_token.lexeme
-
-            sym = Symbol(
-                name=var_name,
-                type_=var_type,
-                kind="variable",
-                token=declarator.name_token,
-                scope_level=self.current_scope.level,
-                is_initialized=declarator.initializer is not None,
-                is_array=declarator.is_array
-            )
-
-            try:
-                self.current_scope.define(var_name, sym)
-            except SemanticError as e:
-                self.errors.append(str(e))
+            if not self._check_defined(declarator.symbol, declarator.name_token):
                 continue
 
             # Verificar inicializador si existe
             if declarator.initializer:
-                init_type = self.visit_Expression(declarator.initializer)
+                init_type = self.visit(declarator.initializer)
                 if not self.type_system.is_assignable(var_type, init_type):
                     self.errors.append(
                         f"[L{declarator.name_token.line},C{declarator.name_token.column}] "
@@ -287,97 +290,38 @@ class SemanticAnalyzer:
 
     def visit_FuncDecl(self, node: FuncDecl):
         """Analiza declaración de función"""
-        func_name = node.name_token.lexeme
-        """print(f"[DEBUG-SEM] visit_FuncDecl: '{func_name}' con {len(node.parameters)} parámetros")"""
-
-        # Crear nuevo scope para la función
-        prev_scope = self.current_scope
-        self.current_scope = Scope("function", prev_scope)
+        """print(f"[DEBUG-SEM] visit_FuncDecl: '{node.name_token.lexeme}' con {len(node.parameters)} parámetros")"""
         prev_function = self.current_function
-        self.current_function = prev_scope.lookup(func_name)
-        """print(f"[DEBUG-SEM]   Scope de función creado")"""
+        self.current_function = node.symbol
 
         try:
-            # Registrar parámetros en el scope de la función
-            """print(f"[DEBUG-SEM]   Registrando {len(node.parameters)} parámetros")"""
             for param in node.parameters:
-                param_type = self.token_to_type(param.type_token)
-                if param_type == TypeKind.VOID:
+                if self.token_to_type(param.type_token) == TypeKind.VOID:
                     self.errors.append(
                         f"[L{param.type_token.line},C{param.type_token.column}] "
                         f"Parameter cannot have type 'void'"
                     )
                     continue
-
-                param_sym = Symbol(
-                    name=param.name_token.lexeme,
-                    type_=param_type,
-                    kind="parameter",
-                    token=param.name_token,
-                    scope_level=self.current_scope.level,
-                    is_initialized=True
-                )
-                try:
-                    self.current_scope.define(param.name_token.lexeme, param_sym)
-                except SemanticError as e:
-                    self.errors.append(str(e))
-            """print(f"[DEBUG-SEM]   Parámetros registrados, analizando body")"""
+                self._check_defined(param.symbol, param.name_token)
             # Analizar el cuerpo
             self.visit_BlockStmt(node.body)
-            """print(f"[DEBUG-SEM]   Body de '{func_name}' analizado")"""
 
         finally:
-            self.current_scope = prev_scope
             self.current_function = prev_function
 
     def visit_ClassDecl(self, node: ClassDecl):
         """Analiza declaración de clase"""
-        class_name = node.name_token.lexeme
-        class_sym = self.current_scope.lookup(class_name)
-
-        # Crear nuevo scope para la clase
-        prev_scope = self.current_scope
-        self.current_scope = Scope("class", prev_scope)
         prev_class = self.current_class
-        self.current_class = class_sym
+        self.current_class = node.symbol
 
         try:
+            # Primero los miembros, en el orden en que se definieron
             for member in node.members:
-                # Colectar miembros primero
                 if isinstance(member.declaration, VarDecl):
-                    # Registrar variable de miembro
                     for item in member.declaration.declarators:
-                        var_sym = Symbol(
-                            name=item.name_token.lexeme,
-                            type_=self.token_to_type(member.declaration.type_token),
-                            kind="variable",
-                            token=item.name_token,
-                            scope_level=self.current_scope.level
-                        )
-                        try:
-                            self.current_scope.define(item.name_token.lexeme, var_sym)
-                            if class_sym and class_sym.members is not None:
-                                class_sym.members[item.name_token.lexeme] = var_sym
-                        except SemanticError as e:
-                            self.errors.append(str(e))
-
+                        self._check_defined(item.symbol, item.name_token)
                 elif isinstance(member.declaration, FuncDecl):
-                    # Registrar método
-                    func_sym = Symbol(
-                        name=member.declaration.name_token.lexeme,
-                        type_=self.token_to_type(member.declaration.return_type),
-                        kind="function",
-                        token=member.declaration.name_token,
-                        scope_level=self.current_scope.level,
-                        param_types=[self.token_to_type(p.type_token) for p in member.declaration.parameters],
-                        return_type=self.token_to_type(member.declaration.return_type)
-                    )
-                    try:
-                        self.current_scope.define(member.declaration.name_token.lexeme, func_sym)
-                        if class_sym and class_sym.methods is not None:
-                            class_sym.methods[member.declaration.name_token.lexeme] = func_sym
-                    except SemanticError as e:
-                        self.errors.append(str(e))
+                    self._check_defined(member.declaration.symbol, member.declaration.name_token)
 
             # Segunda pasada: analizar cuerpos de métodos
             for member in node.members:
@@ -385,51 +329,27 @@ class SemanticAnalyzer:
                     self.visit_FuncDecl(member.declaration)
 
         finally:
-            self.current_scope = prev_scope
             self.current_class = prev_class
 
     # ===== VISITORS: Sentencias =====
 
     def visit_Statement(self, node: Statement):
-        """Visitor genérico para sentencias"""
-        if isinstance(node, ExprStmt):
-            self.visit_ExprStmt(node)
-        elif isinstance(node, VarDeclStmt):
-            self.visit_VarDeclStmt(node)
-        elif isinstance(node, BlockStmt):
-            self.visit_BlockStmt(node)
-        elif isinstance(node, IfStmt):
-            self.visit_IfStmt(node)
-        elif isinstance(node, WhileStmt):
-            self.visit_WhileStmt(node)
-        elif isinstance(node, ForStmt):
-            self.visit_ForStmt(node)
-        elif isinstance(node, SwitchStmt):
-            self.visit_SwitchStmt(node)
-        elif isinstance(node, ReturnStmt):
-            self.visit_ReturnStmt(node)
+        """Sentencia sin visitor propio (ErrorStmt): no hay nada que analizar"""
+        pass
 
     def visit_ExprStmt(self, node: ExprStmt):
         """Analiza sentencia de expresión"""
         """print(f"[DEBUG-SEM] visit_ExprStmt")"""
         if node.expression:
             """print(f"[DEBUG-SEM]   Expresión: {type(node.expression).__name__}")"""
-            self.visit_Expression(node.expression)
+            self.visit(node.expression)
 
     def visit_BlockStmt(self, node: BlockStmt):
         """Analiza bloque de sentencias"""
         """print(f"[DEBUG-SEM] visit_BlockStmt: {len(node.statements)} sentencias")"""
-        # Crear nuevo scope para el bloque
-        prev_scope = self.current_scope
-        self.current_scope = Scope("block", prev_scope)
-        """print(f"[DEBUG-SEM]   Nuevo scope de bloque creado")"""
-        try:
-            for i, stmt in enumerate(node.statements):
-                """print(f"[DEBUG-SEM]   Sentencia {i}: {type(stmt).__name__}")"""
-                self.visit_Statement(stmt)
-            """print(f"[DEBUG-SEM]   Bloque completado")"""
-        finally:
-            self.current_scope = prev_scope
+        for i, stmt in enumerate(node.statements):
+            """print(f"[DEBUG-SEM]   Sentencia {i}: {type(stmt).__name__}")"""
+            self.visit(stmt)
 
     def visit_VarDeclStmt(self, node: VarDeclStmt):
         """Analiza sentencia de declaración de variable"""
@@ -438,103 +358,84 @@ class SemanticAnalyzer:
 
     def visit_IfStmt(self, node: IfStmt):
         """Analiza sentencia if"""
-        cond_type = self.visit_Expression(node.condition)
+        cond_type = self.visit(node.condition)
         if cond_type != TypeKind.BOOL and cond_type != TypeKind.ERROR:
-            cond_line = self._get_node_line(node.condition)
+            cond_line = self._node_line(node.condition)
             self.errors.append(
                 f"[L{cond_line}] "
                 f"Condition must be boolean, got {cond_type}"
             )
 
-        self.visit_Statement(node.then_stmt)
+        self.visit(node.then_stmt)
         if node.else_stmt:
-            self.visit_Statement(node.else_stmt)
+            self.visit(node.else_stmt)
 
     def visit_WhileStmt(self, node: WhileStmt):
         """Analiza sentencia while"""
-        cond_type = self.visit_Expression(node.condition)
+        cond_type = self.visit(node.condition)
         if cond_type != TypeKind.BOOL and cond_type != TypeKind.ERROR:
-            cond_line = self._get_node_line(node.condition)
+            cond_line = self._node_line(node.condition)
             self.errors.append(
                 f"[L{cond_line}] "
                 f"Condition must be boolean, got {cond_type}"
             )
 
-        self.visit_Statement(node.body)
+        self.visit(node.body)
 
     def visit_ForStmt(self, node: ForStmt):
         """Analiza sentencia for"""
-        # Crear scope para el for
-        prev_scope = self.current_scope
-        self.current_scope = Scope("block", prev_scope)
+        if node.init:
+            # Init puede ser VarDecl, VarDeclSinPunto o Expression
+            if isinstance(node.init, (VarDecl, VarDeclSinPunto)):
+                # Ambos usan declarators
+                var_type = self.token_to_type(node.init.type_token)
+                for declarator in node.init.declarators:
+                    self._check_defined(declarator.symbol, declarator.name_token)
+
+                    if declarator.initializer:
+                        init_type = self.visit(declarator.initializer)
+                        if not self.type_system.is_assignable(var_type, init_type):
+                            self.errors.append(
+                                f"[L{declarator.name_token.line},C{declarator.name_token.column}] "
+                                f"Cannot assign {init_type} to {var_type}"
+                            )
+            else:
+                self.visit(node.init)
+
+        if node.condition:
+            cond_type = self.visit(node.condition)
+            if cond_type != TypeKind.BOOL and cond_type != TypeKind.ERROR:
+                cond_line = self._node_line(node.condition)
+                self.errors.append(
+                    f"[L{cond_line}] "
+                    f"Condition must be boolean, got {cond_type}"
+                )
+        if node.update:
+            self.visit(node.update)
 
-        try:
-            if node.init:
-                # Init puede ser VarDecl, VarDeclSinPunto o Expression
-                if isinstance(node.init, (VarDecl, VarDeclSinPunto)):
-                    # Ambos usan declarators
-                    var_type = self.token_to_type(node.init.type_token)
-                    for declarator in node.init.declarators:
-                        sym = Symbol(
-                            name=declarator.name_token.lexeme,
-                            type_=var_type,
-                            kind="variable",
-                            token=declarator.name_token,
-                            scope_level=self.current_scope.level,
-                            is_initialized=declarator.initializer is not None,
-                            is_array=declarator.is_array
-                        )
-                        try:
-                            self.current_scope.define(declarator.name_token.lexeme, sym)
-                        except SemanticError as e:
-                            self.errors.append(str(e))
-                        
-                        if declarator.initializer:
-                            init_type = self.visit_Expression(declarator.initializer)
-                            if not self.type_system.is_assignable(var_type, init_type):
-                                self.errors.append(
-                                    f"[L{declarator.name_token.line},C{declarator.name_token.column}] "
-                                    f"Cannot assign {init_type} to {var_type}"
-                                )
-                else:
-                    self.visit_Expression(node.init)
-            
-            if node.condition:
-                cond_type = self.visit_Expression(node.condition)
-                if cond_type != TypeKind.BOOL and cond_type != TypeKind.ERROR:
-                    cond_line = self._get_node_line(node.condition)
-                    self.errors.append(
-                        f"[L{cond_line}] "
-                        f"Condition must be boolean, got {cond_type}"
-                    )
-            if node.update:
-                self.visit_Expression(node.update)
-
-            self.visit_Statement(node.body)
-        finally:
-            self.current_scope = prev_scope
+        self.visit(node.body)
 
     def visit_SwitchStmt(self, node: SwitchStmt):
         """Analiza sentencia switch"""
-        switch_type = self.visit_Expression(node.expr)
+        switch_type = self.visit(node.expr)
 
         for case in node.cases:
             if case.case_expr:
-                case_type = self.visit_Expression(case.case_expr)
+                case_type = self.visit(case.case_expr)
                 if not self.type_system.is_assignable(switch_type, case_type):
-                    case_line = self._get_node_line(case.case_expr)
+                    case_line = self._node_line(case.case_expr)
                     self.errors.append(
                         f"[L{case_line}] "
                         f"Case type {case_type} not compatible with switch type {switch_type}"
                     )
 
             for stmt in case.statements:
-                self.visit_Statement(stmt)
+                self.visit(stmt)
 
     def visit_ReturnStmt(self, node: ReturnStmt):
         """Analiza sentencia return"""
         if self.current_function is None:
-            ret_line = self._get_node_line(node.return_expr) if node.return_expr else 0
+            ret_line = self._node_line(node)
             self.errors.append(
                 f"[L{ret_line}] "
                 f"Return outside function"
@@ -548,9 +449,9 @@ class SemanticAnalyzer:
                     f"Function expects return type {expected_return}, got void"
                 )
         else:
-            actual_return = self.visit_Expression(node.return_expr)
+            actual_return = self.visit(node.return_expr)
             if not self.type_system.is_assignable(expected_return, actual_return):
-                ret_line = self._get_node_line(node.return_expr)
+                ret_line = self._node_line(node.return_expr)
                 self.errors.append(
                     f"[L{ret_line}] "
                     f"Cannot return {actual_return} from function expecting {expected_return}"
@@ -559,113 +460,95 @@ class SemanticAnalyzer:
     # ===== VISITORS: Expresiones =====
 
     def visit_Expression(self, node: Expression) -> TypeKind:
-        """Visitor genérico para expresiones - retorna el tipo"""
-        if isinstance(node, AssignExpr):
-            return self.visit_AssignExpr(node)
-        elif isinstance(node, LogicalOrExpr):
-            return self.visit_LogicalOrExpr(node)
-        elif isinstance(node, LogicalAndExpr):
-            return self.visit_LogicalAndExpr(node)
-        elif isinstance(node, EqualityExpr):
-            return self.visit_EqualityExpr(node)
-        elif isinstance(node, RelationalExpr):
-            return self.visit_RelationalExpr(node)
-        elif isinstance(node, BinaryExpr):
-            return self.visit_BinaryExpr(node)
-        elif isinstance(node, UnaryExpr):
-            return self.visit_UnaryExpr(node)
-        elif isinstance(node, PostfixExpr):
-            return self.visit_PostfixExpr(node)
-        elif isinstance(node, CallExpr):
-            return self.visit_CallExpr(node)
-        elif isinstance(node, IndexExpr):
-            return self.visit_IndexExpr(node)
-        elif isinstance(node, LiteralExpr):
-            return self.visit_LiteralExpr(node)
-        elif isinstance(node, IdentifierExpr):
-            return self.visit_IdentifierExpr(node)
-        elif isinstance(node, GroupingExpr):
-            return self.visit_GroupingExpr(node)
-        return TypeKind.ERROR
+        """Expresión sin visitor propio"""
+        node.expr_type = TypeKind.ERROR
+        return node.expr_type
 
     def visit_AssignExpr(self, node: AssignExpr) -> TypeKind:
         """Analiza expresión de asignación"""
         # Verifica que el target sea válido (IdentifierExpr o IndexExpr)
         if not isinstance(node.target, (IdentifierExpr, IndexExpr)):
             self.errors.append(
-                f"[L{self._get_node_line(node.target)}] Invalid assignment target"
+                f"[L{self._node_line(node.target)}] Invalid assignment target"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
         
         if isinstance(node.target, IdentifierExpr):
             # Asignación simple: id = expr
             target_name = node.target.id_token.lexeme
-            target_sym = self.current_scope.lookup(target_name)
+            target_sym = node.target.symbol
 
             if target_sym is None:
                 self.errors.append(
                     f"[L{node.target.id_token.line},C{node.target.id_token.column}] "
                     f"Undefined variable '{target_name}'"
                 )
-                return TypeKind.ERROR
+                node.expr_type = TypeKind.ERROR
+                return node.expr_type
 
-            value_type = self.visit_Expression(node.value)
+            value_type = self.visit(node.value)
             
             if not self.type_system.is_assignable(target_sym.type_, value_type):
                 self.errors.append(
                     f"[L{node.target.id_token.line},C{node.target.id_token.column}] "
                     f"Cannot assign {value_type} to {target_sym.type_}"
                 )
-                return TypeKind.ERROR
+                node.expr_type = TypeKind.ERROR
+                return node.expr_type
             
             node.expr_type = target_sym.type_
-            return target_sym.type_
+            return node.expr_type
         
         elif isinstance(node.target, IndexExpr):
             # Asignación a índice: arr[idx] = expr
             arr_name = node.target.array_token.lexeme
-            arr_sym = self.current_scope.lookup(arr_name)
+            arr_sym = node.target.symbol
             
             if arr_sym is None:
                 self.errors.append(
                     f"[L{node.target.array_token.line},C{node.target.array_token.column}] "
                     f"Undefined array '{arr_name}'"
                 )
-                return TypeKind.ERROR
+                node.expr_type = TypeKind.ERROR
+                return node.expr_type
             
             if not arr_sym.is_array:
                 self.errors.append(
                     f"[L{node.target.array_token.line},C{node.target.array_token.column}] "
                     f"'{arr_name}' is not an array"
                 )
-                return TypeKind.ERROR
+                node.expr_type = TypeKind.ERROR
+                return node.expr_type
             
             # Verifica el índice
-            index_type = self.visit_Expression(node.target.index)
+            index_type = self.visit(node.target.index)
             if index_type != TypeKind.INT:
                 self.errors.append(
-                    f"[L{self._get_node_line(node.target.index)}] "
+                    f"[L{self._node_line(node.target.index)}] "
                     f"Array index must be INT, got {index_type}"
                 )
             
-            value_type = self.visit_Expression(node.value)
+            value_type = self.visit(node.value)
             
             if not self.type_system.is_assignable(arr_sym.type_, value_type):
                 self.errors.append(
                     f"[L{node.target.array_token.line},C{node.target.array_token.column}] "
                     f"Cannot assign {value_type} to array element type {arr_sym.type_}"
                 )
-                return TypeKind.ERROR
+                node.expr_type = TypeKind.ERROR
+                return node.expr_type
             
             node.expr_type = arr_sym.type_
-            return arr_sym.type_
+            return node.expr_type
 
-        return target_sym.type_
+        node.expr_type = target_sym.type_
+        return node.expr_type
 
     def visit_LogicalOrExpr(self, node: LogicalOrExpr) -> TypeKind:
         """EXPRLOGICA': op_or EXPRAND EXPRLOGICA'"""
-        left_type = self.visit_Expression(node.left)
-        right_type = self.visit_Expression(node.right)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
         
         if left_type != TypeKind.BOOL or right_type != TypeKind.BOOL:
             if left_type != TypeKind.ERROR and right_type != TypeKind.ERROR:
@@ -673,12 +556,13 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Logical OR requires BOOL operands, got {left_type} and {right_type}"
                 )
-        return TypeKind.BOOL
+        node.expr_type = TypeKind.BOOL
+        return node.expr_type
 
     def visit_LogicalAndExpr(self, node: LogicalAndExpr) -> TypeKind:
         """EXPRAND': op_and EXPRIGUALDAD EXPRAND'"""
-        left_type = self.visit_Expression(node.left)
-        right_type = self.visit_Expression(node.right)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
         
         if left_type != TypeKind.BOOL or right_type != TypeKind.BOOL:
             if left_type != TypeKind.ERROR and right_type != TypeKind.ERROR:
@@ -686,12 +570,13 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Logical AND requires BOOL operands, got {left_type} and {right_type}"
                 )
-        return TypeKind.BOOL
+        node.expr_type = TypeKind.BOOL
+        return node.expr_type
 
     def visit_EqualityExpr(self, node: EqualityExpr) -> TypeKind:
         """EXPRIGUALDAD': (op_igual | op_distinto) EXPRRELACIONAL"""
-        left_type = self.visit_Expression(node.left)
-        right_type = self.visit_Expression(node.right)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
         
         if not self.type_system.is_assignable(left_type, right_type) and \
            not self.type_system.is_assignable(right_type, left_type):
@@ -700,12 +585,13 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Equality operator requires compatible types, got {left_type} and {right_type}"
                 )
-        return TypeKind.BOOL
+        node.expr_type = TypeKind.BOOL
+        return node.expr_type
 
     def visit_RelationalExpr(self, node: RelationalExpr) -> TypeKind:
         """EXPRRELACIONAL': relop EXPRADITIVA"""
-        left_type = self.visit_Expression(node.left)
-        right_type = self.visit_Expression(node.right)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
         
         # Operadores relacionales requieren tipos numéricos
         if not self.type_system.is_numeric(left_type) or \
@@ -715,12 +601,13 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Relational operator requires numeric operands, got {left_type} and {right_type}"
                 )
-        return TypeKind.BOOL
+        node.expr_type = TypeKind.BOOL
+        return node.expr_type
 
     def visit_BinaryExpr(self, node: BinaryExpr) -> TypeKind:
         """Analiza expresión binaria"""
-        left_type = self.visit_Expression(node.left)
-        right_type = self.visit_Expression(node.right)
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
 
         op_type = node.operator.type
 
@@ -730,7 +617,8 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Invalid operands for {node.operator.lexeme}: {left_type} and {right_type}"
                 )
-            return left_type if left_type != TypeKind.ERROR else right_type
+            node.expr_type = left_type if left_type != TypeKind.ERROR else right_type
+            return node.expr_type
 
         elif op_type in [TokenType.OP_MENOR, TokenType.OP_MENOR_IG, TokenType.OP_MAYOR, TokenType.OP_MAYOR_IG,
                          TokenType.OP_IGUAL, TokenType.OP_DISTINTO]:
@@ -739,7 +627,8 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Invalid operands for {node.operator.lexeme}: {left_type} and {right_type}"
                 )
-            return TypeKind.BOOL
+            node.expr_type = TypeKind.BOOL
+            return node.expr_type
 
         elif op_type in [TokenType.OP_AND, TokenType.OP_OR]:
             if not self.type_system.is_compatible_for_op(left_type, right_type, "logical"):
@@ -747,13 +636,15 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Invalid operands for {node.operator.lexeme}: {left_type} and {right_type}"
                 )
-            return TypeKind.BOOL
+            node.expr_type = TypeKind.BOOL
+            return node.expr_type
 
-        return TypeKind.ERROR
+        node.expr_type = TypeKind.ERROR
+        return node.expr_type
 
     def visit_UnaryExpr(self, node: UnaryExpr) -> TypeKind:
         """Analiza expresión unaria"""
-        operand_type = self.visit_Expression(node.operand)
+        operand_type = self.visit(node.operand)
 
         if node.operator.type == TokenType.OP_NOT:
             if not self.type_system.is_compatible_for_op(operand_type, operand_type, "unary_logical"):
@@ -761,7 +652,8 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Cannot apply ! to {operand_type}"
                 )
-            return TypeKind.BOOL
+            node.expr_type = TypeKind.BOOL
+            return node.expr_type
 
         elif node.operator.type in [TokenType.OP_RESTA, TokenType.OP_INC, TokenType.OP_DEC]:
             if not self.type_system.is_compatible_for_op(operand_type, operand_type, "unary_arithmetic"):
@@ -769,13 +661,15 @@ class SemanticAnalyzer:
                     f"[L{node.operator.line},C{node.operator.column}] "
                     f"Cannot apply {node.operator.lexeme} to {operand_type}"
                 )
-            return operand_type
+            node.expr_type = operand_type
+            return node.expr_type
 
-        return operand_type
+        node.expr_type = operand_type
+        return node.expr_type
 
     def visit_PostfixExpr(self, node: PostfixExpr) -> TypeKind:
         """Analiza expresión postfija: expr++ o expr--"""
-        operand_type = self.visit_Expression(node.operand)
+        operand_type = self.visit(node.operand)
         
         # Operando debe ser una variable (IdentifierExpr)
         if not isinstance(node.operand, IdentifierExpr):
@@ -783,7 +677,8 @@ class SemanticAnalyzer:
                 f"[L{node.operator.line},C{node.operator.column}] "
                 f"Cannot apply {node.operator.lexeme} to non-variable"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
         
         # Tipo debe ser numérico
         if not self.type_system.is_numeric(operand_type):
@@ -791,28 +686,32 @@ class SemanticAnalyzer:
                 f"[L{node.operator.line},C{node.operator.column}] "
                 f"Cannot apply {node.operator.lexeme} to {operand_type}"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
         
-        return operand_type
+        node.expr_type = operand_type
+        return node.expr_type
 
     def visit_CallExpr(self, node: CallExpr) -> TypeKind:
         """Analiza llamada a función"""
         func_name = node.func_token.lexeme
-        func_sym = self.current_scope.lookup(func_name)
+        func_sym = node.symbol
 
         if func_sym is None:
             self.errors.append(
                 f"[L{node.func_token.line},C{node.func_token.column}] "
                 f"Undefined function '{func_name}'"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
 
         if func_sym.kind != "function":
             self.errors.append(
                 f"[L{node.func_token.line},C{node.func_token.column}] "
                 f"'{func_name}' is not a function"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
 
         # Verificar argumentos
         if len(node.arguments) != len(func_sym.param_types or []):
@@ -823,7 +722,7 @@ class SemanticAnalyzer:
             )
 
         for i, arg in enumerate(node.arguments):
-            arg_type = self.visit_Expression(arg)
+            arg_type = self.visit(arg)
             if i < len(func_sym.param_types or []):
                 expected_type = func_sym.param_types[i]
                 if not self.type_system.is_assignable(expected_type, arg_type):
@@ -832,81 +731,89 @@ class SemanticAnalyzer:
                         f"Argument {i} type mismatch: expected {expected_type}, got {arg_type}"
                     )
 
-        return func_sym.return_type or TypeKind.ERROR
+        node.expr_type = func_sym.return_type or TypeKind.ERROR
+        return node.expr_type
 
     def visit_IndexExpr(self, node: IndexExpr) -> TypeKind:
         """Analiza acceso a arreglo"""
         array_name = node.array_token.lexeme
-        array_sym = self.current_scope.lookup(array_name)
+        array_sym = node.symbol
 
         if array_sym is None:
             self.errors.append(
                 f"[L{node.array_token.line},C{node.array_token.column}] "
                 f"Undefined variable '{array_name}'"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
 
-        index_type = self.visit_Expression(node.index)
+        index_type = self.visit(node.index)
         if not self.type_system.is_numeric(index_type):
             self.errors.append(
                 f"[L{node.array_token.line}] "
                 f"Array index must be numeric, got {index_type}"
             )
 
-        return array_sym.type_
+        node.expr_type = array_sym.type_
+        return node.expr_type
 
     def visit_LiteralExpr(self, node: LiteralExpr) -> TypeKind:
         """Analiza literal"""
-        return self.type_system.get_literal_type(node.value_token)
+        node.expr_type = self.type_system.get_literal_type(node.value_token)
+        return node.expr_type
 
     def visit_IdentifierExpr(self, node: IdentifierExpr) -> TypeKind:
         """Analiza identificador (variable)"""
         var_name = node.id_token.lexeme
-        var_sym = self.current_scope.lookup(var_name)
+        var_sym = node.symbol
 
         if var_sym is None:
             self.errors.append(
                 f"[L{node.id_token.line},C{node.id_token.column}] "
                 f"Undefined variable '{var_name}'"
             )
-            return TypeKind.ERROR
+            node.expr_type = TypeKind.ERROR
+            return node.expr_type
 
-        return var_sym.type_
+        node.expr_type = var_sym.type_
+        return node.expr_type
 
     def visit_GroupingExpr(self, node: GroupingExpr) -> TypeKind:
         """Analiza expresión agrupada"""
-        return self.visit_Expression(node.expression)
+        node.expr_type = self.visit(node.expression)
+        return node.expr_type
 
     # ===== Utilidades =====
 
-    def _get_node_line(self, node: Expression) -> int:
-        """Extrae la línea de un nodo de expresión"""
-        if isinstance(node, LiteralExpr):
-            return node.value_token.line
-        elif isinstance(node, IdentifierExpr):
-            return node.id_token.line
-        elif isinstance(node, CallExpr):
-            return node.func_token.line
-        elif isinstance(node, IndexExpr):
-            return node.array_token.line
-        elif isinstance(node, BinaryExpr):
-            return node.operator.line
-        elif isinstance(node, UnaryExpr):
-            return node.operator.line
-        elif isinstance(node, AssignExpr):
-            return node.target_token.line
-        elif isinstance(node, GroupingExpr):
-            return self._get_node_line(node.expression)
-        return 0
+    def type_of(self, node: Expression) -> TypeKind:
+        """Tipo de una expresión ya analizada, sin recorrerla de nuevo.
+
+        Si el análisis no la visitó (p. ej. el inicializador de una variable
+        redefinida), la tipa ahora y guarda el resultado; los errores de ese
+        subárbol no se agregan a self.errors.
+        """
+        if node.expr_type is None:
+            errors = self.errors
+            self.errors = []
+            try:
+                self.visit(node)
+            finally:
+                self.errors = errors
+        return node.expr_type
+
+    def _node_line(self, node) -> int:
+        """Línea del primer token del nodo (0 si no tiene span)"""
+        return node.start_token.line if node.start_token is not None else 0
+
+    def _check_defined(self, symbol: Symbol, name_token: Token) -> bool:
+        """True si la declaración de name_token definió su símbolo; si no
+        (el nombre ya estaba en su scope), registra el error
+        """
+        if symbol.token is name_token:
+            return True
+        self.errors.append(already_defined(name_token.lexeme, name_token))
+        return False
 
     def token_to_type(self, token: Token) -> TypeKind:
         """Convierte un token de tipo a TypeKind"""
-        type_map = {
-            TokenType.INT: TypeKind.INT,
-            TokenType.FLOAT: TypeKind.FLOAT,
-            TokenType.DOUBLE: TypeKind.DOUBLE,
-            TokenType.CHAR: TypeKind.CHAR,
-            TokenType.BOOL: TypeKind.BOOL,
-            TokenType.VOID: TypeKind.VOID,
-        }
-        return type_map.get(token.type, TypeKind.ERROR)
+        return token_to_type(token)
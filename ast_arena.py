@@ -0,0 +1,278 @@
+# ast_arena.py
+import typing
+from array import array
+from dataclasses import fields, is_dataclass
+from typing import Iterator, List
+
+import ast_nodes
+from tokens import Token, TokenBuffer, TokenView
+
+
+# AST plano: todos los nodos de un Program en unas pocas columnas array,
+# sin un objeto Python por nodo. Un nodo es un índice i:
+#   kinds[i]   código de su clase en NODE_CLASSES
+#   first[i]   posición de sus campos en slots (tantos como su esquema)
+# Cada campo ocupa slots según su categoría:
+#   TOKEN  índice en la lista de tokens (-1 = None)
+#   NODE   índice de nodo (-1 = None)
+#   LIST   dos slots: inicio en children y cantidad de nodos
+#   FLAG   0 / 1
+#   TEXT   índice en texts (mensajes de ErrorDecl / ErrorStmt)
+# Los nodos se guardan en postorden: hijos antes que el padre, la raíz es
+# el último. Los campos solo por nombre (start_token / end_token) van tras
+# los posicionales. Los campos con compare=False (anotaciones del análisis
+# semántico como Expression.expr_type o los symbol de NameResolver) no se
+# guardan.
+
+TOKEN, NODE, LIST, FLAG, TEXT = range(5)
+
+# nodos concretos: las bases abstractas solo tienen los campos del span
+NODE_CLASSES = tuple(
+    node_class for node_class in vars(ast_nodes).values()
+    if isinstance(node_class, type) and is_dataclass(node_class)
+    and any(not field.kw_only for field in fields(node_class))
+)
+KIND_OF = {node_class: kind for kind, node_class in enumerate(NODE_CLASSES)}
+
+
+def _category(annotation) -> int:
+    if typing.get_origin(annotation) is typing.Union:
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+    if annotation is Token:
+        return TOKEN
+    if annotation is bool:
+        return FLAG
+    if annotation is str:
+        return TEXT
+    if typing.get_origin(annotation) is list:
+        return LIST
+    return NODE
+
+
+def _schema(node_class) -> tuple:
+    """((nombre, categoría, slot relativo), ...) de los campos guardados"""
+    schema = []
+    slot = 0
+    stored = [field for field in fields(node_class) if field.compare]
+    for field in sorted(stored, key=lambda field: field.kw_only):
+        category = _category(field.type)
+        schema.append((field.name, category, slot))
+        slot += 2 if category == LIST else 1
+    return tuple(schema)
+
+
+# por código de clase
+SCHEMAS = [_schema(node_class) for node_class in NODE_CLASSES]
+# nombres de los campos solo por nombre, al final de cada esquema
+KEYWORD_FIELDS = [
+    tuple(field.name for field in fields(node_class) if field.compare and field.kw_only)
+    for node_class in NODE_CLASSES
+]
+
+
+class ASTArena:
+    """AST de un Program en columnas array (ver arriba).
+
+    tokens es la secuencia de la que salen los índices de token (la lista
+    del Lexer o un TokenBuffer). Al serializarse con pickle solo viajan las
+    columnas y texts: el receptor asigna arena.tokens.
+    """
+
+    def __init__(self, tokens=None):
+        self.tokens = tokens
+        self.kinds = array("B")
+        self.first = array("i")
+        self.slots = array("i")
+        self.children = array("i")
+        self.texts: list[str] = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getstate__(self):
+        return self.kinds, self.first, self.slots, self.children, self.texts
+
+    def __setstate__(self, state):
+        self.kinds, self.first, self.slots, self.children, self.texts = state
+        self.tokens = None
+
+    @property
+    def root(self) -> int:
+        return len(self.kinds) - 1
+
+    # ===== construcción =====
+
+    def add(self, node_class, values: list) -> int:
+        """Añade un nodo y retorna su índice.
+
+        values sigue el esquema de node_class: índice de token o de nodo
+        (o -1), lista de índices de nodo, bool o str.
+        """
+        kind = KIND_OF[node_class]
+        slots = self.slots
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.first.append(len(slots))
+        for (_, category, _), value in zip(SCHEMAS[kind], values):
+            if category == LIST:
+                slots.append(len(self.children))
+                slots.append(len(value))
+                self.children.extend(value)
+            elif category == TEXT:
+                slots.append(len(self.texts))
+                self.texts.append(value)
+            else:
+                slots.append(value)
+        return index
+
+    @classmethod
+    def from_tree(cls, program: ast_nodes.Program, tokens) -> "ASTArena":
+        """Convierte un AST de ast_nodes. tokens debe contener (por identidad)
+        todos los Token del árbol, como la lista que recibió el Parser; con
+        un TokenBuffer, los tokens del árbol son TokenView de ese buffer.
+        """
+        arena = cls(tokens)
+        if isinstance(tokens, TokenBuffer):
+            # cada acceso al buffer crea un TokenView nuevo: la posición
+            # está en la vista
+            def index_of(tok):
+                if isinstance(tok, TokenView) and tok.buffer is tokens:
+                    return tok.index
+                raise ValueError(f"Token not in the token sequence: {tok!r}")
+        else:
+            token_index = {id(tok): i for i, tok in enumerate(tokens)}
+
+            def index_of(tok):
+                if id(tok) in token_index:
+                    return token_index[id(tok)]
+                raise ValueError(f"Token not in the token sequence: {tok!r}")
+        done = []  # índices de los nodos ya convertidos, en orden
+        # pila explícita (postorden): sin límite de anidamiento
+        stack = [(program, False)]
+        while stack:
+            node, ready = stack.pop()
+            schema = SCHEMAS[KIND_OF[type(node)]]
+            if not ready:
+                stack.append((node, True))
+                for name, category, _ in reversed(schema):
+                    value = getattr(node, name)
+                    if category == NODE and value is not None:
+                        stack.append((value, False))
+                    elif category == LIST:
+                        stack.extend((item, False) for item in reversed(value))
+                continue
+
+            pending = sum(
+                len(getattr(node, name)) if category == LIST
+                else category == NODE and getattr(node, name) is not None
+                for name, category, _ in schema
+            )
+            converted = iter(done[len(done) - pending:])
+            del done[len(done) - pending:]
+            values = []
+            for name, category, _ in schema:
+                value = getattr(node, name)
+                if category == TOKEN:
+                    values.append(-1 if value is None else index_of(value))
+                elif category == NODE:
+                    values.append(-1 if value is None else next(converted))
+                elif category == LIST:
+                    values.append([next(converted) for _ in value])
+                elif category == FLAG:
+                    values.append(int(value))
+                else:
+                    values.append(value)
+            done.append(arena.add(type(node), values))
+        return arena
+
+    # ===== recorrido =====
+
+    def node_class(self, i: int):
+        return NODE_CLASSES[self.kinds[i]]
+
+    def field(self, i: int, name: str):
+        """Valor del campo: Token, índice de nodo (o None), lista de índices,
+        bool o str
+        """
+        for field_name, category, slot in SCHEMAS[self.kinds[i]]:
+            if field_name == name:
+                value = self.slots[self.first[i] + slot]
+                if category == TOKEN:
+                    if value < 0:
+                        return None
+                    if self.tokens is None:
+                        raise ValueError("ASTArena without tokens: assign arena.tokens")
+                    return self.tokens[value]
+                if category == NODE:
+                    return None if value < 0 else value
+                if category == LIST:
+                    count = self.slots[self.first[i] + slot + 1]
+                    return self.children[value:value + count].tolist()
+                if category == FLAG:
+                    return bool(value)
+                return self.texts[value]
+        raise AttributeError(f"{self.node_class(i).__name__} has no field {name!r}")
+
+    def token_index(self, i: int, name: str) -> int:
+        """Índice del token del campo name (-1 si es None)"""
+        for field_name, category, slot in SCHEMAS[self.kinds[i]]:
+            if field_name == name and category == TOKEN:
+                return self.slots[self.first[i] + slot]
+        raise AttributeError(f"{self.node_class(i).__name__} has no token field {name!r}")
+
+    def child_nodes(self, i: int) -> List[int]:
+        """Índices de los nodos hijos, en el orden de los campos"""
+        slots = self.slots
+        base = self.first[i]
+        result = []
+        for _, category, slot in SCHEMAS[self.kinds[i]]:
+            if category == NODE:
+                child = slots[base + slot]
+                if child >= 0:
+                    result.append(child)
+            elif category == LIST:
+                start = slots[base + slot]
+                result.extend(self.children[start:start + slots[base + slot + 1]])
+        return result
+
+    def walk(self, i: int = None) -> Iterator[int]:
+        """Recorre en preorden el subárbol de i (por defecto, todo el Program)"""
+        stack = [self.root if i is None else i]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(self.child_nodes(node)))
+
+    def to_tree(self, i: int = None):
+        """Reconstruye los objetos de ast_nodes del subárbol de i"""
+        if self.tokens is None:
+            raise ValueError("ASTArena without tokens: assign arena.tokens")
+        # los hijos siempre tienen índice menor que el padre
+        root = self.root if i is None else i
+        order = range(len(self.kinds)) if i is None else sorted(self.walk(i))
+        tokens, kinds, first, slots, children = (
+            self.tokens, self.kinds, self.first, self.slots, self.children)
+        built = {}
+        for node in order:
+            kind = kinds[node]
+            keywords = KEYWORD_FIELDS[kind]
+            base = first[node]
+            values = []
+            for _, category, slot in SCHEMAS[kind]:
+                value = slots[base + slot]
+                if category == TOKEN:
+                    value = None if value < 0 else tokens[value]
+                elif category == NODE:
+                    value = None if value < 0 else built.pop(value)
+                elif category == LIST:
+                    value = [built.pop(child)
+                             for child in children[value:value + slots[base + slot + 1]]]
+                elif category == FLAG:
+                    value = bool(value)
+                else:
+                    value = self.texts[value]
+                values.append(value)
+            positional = len(values) - len(keywords)
+            built[node] = NODE_CLASSES[kind](*values[:positional],
+                                             **dict(zip(keywords, values[positional:])))
+        return built[root]
@@ -1,26 +1,41 @@
 # ast_nodes.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Optional
 from tokens import Token
 
+# Los nodos usan __slots__ (sin __dict__ por instancia): un programa grande
+# tiene millones de nodos. Solo se pueden asignar los campos declarados.
+
+
+@dataclass(slots=True)
+class Node:
+    """Base de todos los nodos: primer y último token del fuente que cubre.
+
+    Los anota el Parser al construir cada nodo (None en nodos armados a
+    mano). Son campos solo por nombre, así los constructores posicionales
+    no cambian.
+    """
+    start_token: Optional[Token] = field(default=None, kw_only=True, repr=False)
+    end_token: Optional[Token] = field(default=None, kw_only=True, repr=False)
+
 
 # ===== NODOS RAÍZ =====
 
-@dataclass
-class Program:
+@dataclass(slots=True)
+class Program(Node):
     """Nodo raíz del programa"""
     declarations: List['Declaration']
 
 
 # ===== DECLARACIONES =====
 
-@dataclass
-class Declaration:
+@dataclass(slots=True)
+class Declaration(Node):
     """Clase base abstracta para declaraciones"""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Declaration):
     """DECLVAR: TIPO LISTAID punto_coma"""
     type_token: Token  # Token del tipo (int, float, etc.)
@@ -30,60 +45,78 @@ class VarDecl(Declaration):
         return f"VarDecl({self.type_token.lexeme}, {len(self.declarators)} declarators)"
 
 
-@dataclass
-class VarDeclarator:
+@dataclass(slots=True)
+class VarDeclarator(Node):
     """Un item en LISTAID: id INICIALIZACION"""
     name_token: Token  # Token del identificador
     initializer: Optional['Expression']  # None si no hay inicializador
     is_array: bool = False  # True si es un arreglo
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclSinPunto(Declaration):
     """DECLVARSINPUNTO: TIPO LISTAID (sin punto y coma, para for init)"""
     type_token: Token
     declarators: List['VarDeclarator']
 
 
-@dataclass
+@dataclass(slots=True)
 class FuncDecl(Declaration):
     """DECLFUNC: TIPO id paren_izq PARAMETROS paren_der BLOQUE"""
     return_type: Token  # Token del tipo de retorno
     name_token: Token  # Token del nombre de la función
     parameters: List['Param']  # Lista de parámetros
     body: 'BlockStmt'  # Cuerpo de la función
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
 
-@dataclass
-class Param:
+@dataclass(slots=True)
+class Param(Node):
     """PARAM: TIPO id"""
     type_token: Token
     name_token: Token
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassDecl(Declaration):
     """DECLCLASE: class id llave_izq LISTAMIEMBROS llave_der"""
     name_token: Token
     members: List['ClassMember']  # Métodos y variables de clase
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
 
-@dataclass
-class ClassMember:
+@dataclass(slots=True)
+class ClassMember(Node):
     """MIEMBRO: MODIFICADORACCESO DECLVAR | MODIFICADORACCESO DECLFUNC"""
     access_modifier: Optional[Token]  # PUBLIC, PRIVATE, o None (default private)
     declaration: 'Declaration'  # VarDecl o FuncDecl
 
 
+@dataclass(slots=True)
+class ErrorDecl(Declaration):
+    """Declaración descartada por un error de sintaxis (Parser en modo recover)"""
+    token: Token  # Token donde se detectó el error
+    message: str  # Mensaje del ParserError
+
+
 # ===== SENTENCIAS =====
 
-@dataclass
-class Statement:
+@dataclass(slots=True)
+class Statement(Node):
     """Clase base abstracta para sentencias"""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
+class ErrorStmt(Statement):
+    """Sentencia descartada por un error de sintaxis (Parser en modo recover)"""
+    token: Token  # Token donde se detectó el error
+    message: str  # Mensaje del ParserError
+
+
+@dataclass(slots=True)
 class ExprStmt(Statement):
     """SENTENCIAEXPR: EXPR punto_coma | punto_coma"""
     expression: Optional['Expression']  # None si es solo `;`
@@ -92,7 +125,7 @@ class ExprStmt(Statement):
         return f"ExprStmt({self.expression})"
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockStmt(Statement):
     """BLOQUE: llave_izq LISTASENTENCIAS llave_der"""
     statements: List[Statement]
@@ -101,7 +134,7 @@ class BlockStmt(Statement):
         return f"BlockStmt({len(self.statements)} stmts)"
 
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Statement):
     """SENTENCIASEL: if paren_izq EXPR paren_der SENTENCIA [else SENTENCIA]"""
     condition: 'Expression'
@@ -112,7 +145,7 @@ class IfStmt(Statement):
         return f"IfStmt(cond={self.condition})"
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Statement):
     """SENTENCIAITER: while paren_izq EXPR paren_der SENTENCIA"""
     condition: 'Expression'
@@ -122,7 +155,7 @@ class WhileStmt(Statement):
         return f"WhileStmt(cond={self.condition})"
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDeclStmt(Statement):
     """Variable declaration within statements (int x = 0;)"""
     var_decl: 'VarDecl'
@@ -131,7 +164,7 @@ class VarDeclStmt(Statement):
         return f"VarDeclStmt({self.var_decl})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ForStmt(Statement):
     """SENTENCIAITER: for paren_izq FORINIT punto_coma EXPR punto_coma FORUPDATE paren_der SENTENCIA"""
     init: Optional['Declaration | Expression']  # DECLVARSINPUNTO o EXPR o ε
@@ -143,7 +176,7 @@ class ForStmt(Statement):
         return f"ForStmt()"
 
 
-@dataclass
+@dataclass(slots=True)
 class SwitchStmt(Statement):
     """SENTENCIASWITCH: switch paren_izq EXPR paren_der llave_izq LISTACASOS llave_der"""
     expr: 'Expression'
@@ -153,8 +186,8 @@ class SwitchStmt(Statement):
         return f"SwitchStmt({len(self.cases)} cases)"
 
 
-@dataclass
-class CaseStmt:
+@dataclass(slots=True)
+class CaseStmt(Node):
     """CASO: case EXPR punto_coma LISTASENTENCIAS | default punto_coma LISTASENTENCIAS"""
     case_expr: Optional['Expression']  # None si es default
     statements: List[Statement]
@@ -163,7 +196,7 @@ class CaseStmt:
         return f"CaseStmt(default={self.case_expr is None})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(Statement):
     """SENTENCIARET: return EXPR punto_coma | return punto_coma"""
     return_expr: Optional['Expression']
@@ -174,13 +207,17 @@ class ReturnStmt(Statement):
 
 # ===== EXPRESIONES =====
 
-@dataclass
-class Expression:
-    """Clase base abstracta para expresiones"""
-    pass
+@dataclass(slots=True)
+class Expression(Node):
+    """Clase base abstracta para expresiones.
+
+    expr_type es el TypeKind inferido por SemanticAnalyzer (None antes del
+    análisis, o si el análisis no visitó la expresión).
+    """
+    expr_type: Optional['TypeKind'] = field(default=None, kw_only=True, compare=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignExpr(Expression):
     """EXPRASIGNACION': op_asig EXPRASIGNACION (derecha-asociativa)"""
     target: Expression  # IdentifierExpr o IndexExpr
@@ -190,7 +227,7 @@ class AssignExpr(Expression):
         return f"AssignExpr({self.target} = ...)"
 
 
-@dataclass
+@dataclass(slots=True)
 class LogicalOrExpr(Expression):
     """EXPRLOGICA': op_or EXPRAND EXPRLOGICA'"""
     left: Expression
@@ -201,7 +238,7 @@ class LogicalOrExpr(Expression):
         return f"LogicalOrExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class LogicalAndExpr(Expression):
     """EXPRAND': op_and EXPRIGUALDAD EXPRAND'"""
     left: Expression
@@ -212,7 +249,7 @@ class LogicalAndExpr(Expression):
         return f"LogicalAndExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class EqualityExpr(Expression):
     """EXPRIGUALDAD': (op_igual | op_distinto) EXPRRELACIONAL"""
     left: Expression
@@ -223,7 +260,7 @@ class EqualityExpr(Expression):
         return f"EqualityExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class RelationalExpr(Expression):
     """EXPRRELACIONAL': (op_menor | op_menor_ig | op_mayor | op_mayor_ig) EXPRADITIVA"""
     left: Expression
@@ -234,7 +271,7 @@ class RelationalExpr(Expression):
         return f"RelationalExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryExpr(Expression):
     """Expresión binaria: +, -, *, /, %"""
     left: Expression
@@ -245,7 +282,7 @@ class BinaryExpr(Expression):
         return f"BinaryExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryExpr(Expression):
     """FACTOR: op_not, op_resta (prefijo); ++expr, --expr (prefijo)"""
     operator: Token  # OP_NOT, OP_RESTA, OP_INC, OP_DEC
@@ -256,7 +293,7 @@ class UnaryExpr(Expression):
         return f"UnaryExpr({self.operator.type}, prefix={self.is_prefix})"
 
 
-@dataclass
+@dataclass(slots=True)
 class PostfixExpr(Expression):
     """EXPRPOSTFIJA': expr++ o expr--"""
     operand: Expression
@@ -266,27 +303,29 @@ class PostfixExpr(Expression):
         return f"PostfixExpr({self.operator.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class CallExpr(Expression):
     """LLAMADAFUNC: id paren_izq ARGSOPTS paren_der"""
     func_token: Token  # Token del nombre de la función
     arguments: List[Expression]
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
     def __repr__(self):
         return f"CallExpr({self.func_token.lexeme})"
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexExpr(Expression):
     """ACCESOARREGLO: id corchete_izq EXPR corchete_der"""
     array_token: Token  # Token del identificador del arreglo
     index: Expression
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
     def __repr__(self):
         return f"IndexExpr({self.array_token.lexeme})"
 
 
-@dataclass
+@dataclass(slots=True)
 class LiteralExpr(Expression):
     """LITERAL: num_int, num_float, num_exp, string, char, true, false"""
     value_token: Token  # Token que contiene el literal
@@ -295,16 +334,17 @@ class LiteralExpr(Expression):
         return f"LiteralExpr({self.value_token.type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class IdentifierExpr(Expression):
     """EXPRPRIMARIA: id"""
     id_token: Token
+    symbol: Optional['Symbol'] = field(default=None, compare=False, repr=False)  # lo anota NameResolver
 
     def __repr__(self):
         return f"IdentifierExpr({self.id_token.lexeme})"
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupingExpr(Expression):
     """EXPRPRIMARIA: paren_izq EXPR paren_der"""
     expression: Expression
@@ -0,0 +1,126 @@
+# ast_visitor.py
+import sys
+import threading
+from dataclasses import fields
+
+import ast_nodes
+from ast_nodes import Node
+
+
+# clases de nodo de ast_nodes (incluye las bases abstractas)
+NODE_CLASSES = tuple(
+    node_class for node_class in vars(ast_nodes).values()
+    if isinstance(node_class, type) and issubclass(node_class, Node)
+)
+
+# Los recorridos son recursivos: un nivel de anidamiento del fuente son
+# dos o tres llamadas. run_deep los corre en un hilo con esta pila y este
+# límite de recursión (alcanza para decenas de miles de niveles; en Python
+# 3.11+ las llamadas entre funciones Python casi no usan la pila de C)
+DEEP_STACK_SIZE = 256 * 2**20
+DEEP_RECURSION_LIMIT = 200_000
+
+
+class _DispatchTable(dict):
+    """clase de nodo -> método ligado; resuelve y guarda las clases nuevas"""
+
+    def __init__(self, visitor):
+        super().__init__()
+        self.visitor = visitor
+
+    def __missing__(self, node_class):
+        method = getattr(self.visitor, self.visitor._method_name(node_class))
+        self[node_class] = method
+        return method
+
+
+class NodeVisitor:
+    """Base de los recorridos del AST con despacho por tabla.
+
+    visit(node) llama al visit_<Clase> de la clase del nodo o, si no está
+    definido, al de su base más cercana (visit_Expression, visit_Statement,
+    visit_Declaration...); sin ninguno, a generic_visit. Los nombres se
+    resuelven una vez por subclase de NodeVisitor y cada instancia guarda
+    la tabla con los métodos ya ligados: despachar es un acceso a dict por
+    type(node), sin cadenas de isinstance.
+    """
+
+    def __init__(self):
+        self._dispatch = _DispatchTable(self)
+        for node_class, name in self._method_names().items():
+            self._dispatch[node_class] = getattr(self, name)
+
+    @classmethod
+    def _method_names(cls) -> dict:
+        """clase de nodo -> nombre del método, calculado una vez por clase"""
+        names = cls.__dict__.get("_visit_names")
+        if names is None:
+            names = {node_class: cls._method_name(node_class) for node_class in NODE_CLASSES}
+            cls._visit_names = names
+        return names
+
+    @classmethod
+    def _method_name(cls, node_class) -> str:
+        for base in node_class.__mro__:
+            name = "visit_" + base.__name__
+            if hasattr(cls, name):
+                return name
+        return "generic_visit"
+
+    def visit(self, node):
+        return self._dispatch[type(node)](node)
+
+    def generic_visit(self, node):
+        """Visita los hijos del nodo en el orden de sus campos"""
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, Node):
+                self.visit(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Node):
+                        self.visit(item)
+
+
+# ===== recursión profunda =====
+
+def run_deep(func, *args):
+    """Llama func(*args) en un hilo con DEEP_STACK_SIZE de pila y el límite
+    de recursión en DEEP_RECURSION_LIMIT. Retorna su resultado o relanza su
+    excepción (RecursionError si se pasó del límite).
+    """
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func(*args)
+        except BaseException as e:
+            outcome["error"] = e
+
+    old_limit = sys.getrecursionlimit()
+    old_stack_size = threading.stack_size(DEEP_STACK_SIZE)
+    try:
+        sys.setrecursionlimit(max(old_limit, DEEP_RECURSION_LIMIT))
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(old_stack_size)
+        sys.setrecursionlimit(old_limit)
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def deepest_node(error: BaseException) -> Node:
+    """Nodo con tokens que se estaba visitando más adentro cuando se lanzó
+    error (la variable `node` de los visit_*), o None
+    """
+    deepest = None
+    tb = error.__traceback__
+    while tb is not None:
+        node = tb.tb_frame.f_locals.get("node")
+        if isinstance(node, Node) and node.start_token is not None:
+            deepest = node
+        tb = tb.tb_next
+    return deepest
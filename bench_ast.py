@@ -0,0 +1,160 @@
+# bench_ast.py
+"""Benchmark de los nodos del AST: dataclasses con __slots__ (ast_nodes)
+frente a las mismas dataclasses con __dict__ por instancia.
+
+Arma un programa sintético de N funciones (por defecto 100k) clonando el
+AST de una función parseada; los tokens se comparten, así solo se mide
+lo que ocupan los nodos. Mide la memoria de los nodos (sys.getsizeof de
+cada nodo, de su __dict__ si lo tiene y de sus listas), una lectura de
+todos los campos de todos los nodos con getattr(), y lecturas directas
+(node.campo, las que hacen Parser y SemanticAnalyzer) de los campos de
+LiteralExpr, IdentifierExpr y BinaryExpr.
+
+Uso: python bench_ast.py [funciones]
+"""
+import dataclasses
+import gc
+import sys
+import time
+from dataclasses import fields, is_dataclass, make_dataclass
+
+import ast_nodes
+from ast_nodes import Program
+from analizador_lexico import Lexer
+from parser import Parser
+
+
+FUNCTION = """
+int f(int a, int b) {
+    int x = a + b * 2;
+    float y = 1.5;
+    if (x > 10 && y < 3.0) {
+        x = x - 1;
+    } else {
+        x = f(x, b) % 7;
+    }
+    while (x != 0) {
+        x = x / 2;
+    }
+    return x + 1;
+}
+"""
+
+SLOTTED = {
+    node_class: node_class
+    for node_class in vars(ast_nodes).values()
+    if isinstance(node_class, type) and is_dataclass(node_class)
+}
+# mismas clases y campos, sin __slots__
+PLAIN = {
+    node_class: make_dataclass(node_class.__name__, [
+        (field.name, field.type, dataclasses.field(default=field.default, kw_only=field.kw_only))
+        for field in fields(node_class)
+    ])
+    for node_class in SLOTTED
+}
+FIELDS = {
+    node_class: tuple(field.name for field in fields(node_class))
+    for node_class in list(SLOTTED.values()) + list(PLAIN.values())
+}
+
+
+def clone(node, classes: dict):
+    """Copia profunda de un AST usando classes[tipo original] para cada nodo"""
+    if isinstance(node, list):
+        return [clone(item, classes) for item in node]
+    node_class = classes.get(type(node))
+    if node_class is None:
+        return node  # Token, None, bool...
+    return node_class(**{name: clone(getattr(node, name), classes) for name in FIELDS[type(node)]})
+
+
+def nodes_size(program) -> int:
+    """Bytes de los nodos, sus __dict__ y sus listas (sin tokens)"""
+    size = 0
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            size += sys.getsizeof(node)
+            stack.extend(node)
+            continue
+        names = FIELDS.get(type(node))
+        if names:
+            size += sys.getsizeof(node)
+            if hasattr(node, "__dict__"):
+                size += sys.getsizeof(node.__dict__)
+            for name in names:
+                stack.append(getattr(node, name))
+    return size
+
+
+def read_all_fields(program, rounds: int = 3) -> float:
+    """Mejor tiempo de un recorrido que lee todos los campos (getattr)"""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        stack = [program]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+                continue
+            names = FIELDS.get(type(node))
+            if names:
+                for name in names:
+                    stack.append(getattr(node, name))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def read_hot_fields(program, rounds: int = 5) -> float:
+    """Lecturas directas (node.campo) de los nodos más numerosos"""
+    nodes = {"BinaryExpr": [], "IdentifierExpr": [], "LiteralExpr": []}
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        names = FIELDS.get(type(node))
+        if names:
+            if type(node).__name__ in nodes:
+                nodes[type(node).__name__].append(node)
+            for name in names:
+                stack.append(getattr(node, name))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for node in nodes["BinaryExpr"]:
+            node.left, node.operator, node.right
+        for node in nodes["IdentifierExpr"]:
+            node.id_token
+        for node in nodes["LiteralExpr"]:
+            node.value_token
+    return time.perf_counter() - start
+
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    function = Parser(Lexer(FUNCTION).scan_tokens()).parse().declarations[0]
+
+    results = {}
+    gc.disable()  # millones de objetos sin ciclos: el GC solo mete ruido
+    for label, classes in (("__dict__", PLAIN), ("__slots__", SLOTTED)):
+        program = classes[Program]([clone(function, classes) for _ in range(functions)])
+        results[label] = (nodes_size(program), read_all_fields(program), read_hot_fields(program))
+        del program
+    gc.enable()
+
+    print(f"Programa sintético: {functions} funciones")
+    print(f"{'':10} {'memoria nodos':>14} {'getattr()':>12} {'node.campo':>13}")
+    for label, (size, walk, hot) in results.items():
+        print(f"{label:10} {size / 2**20:11.1f} MB {walk:10.2f} s {hot:11.2f} s")
+    (size_d, walk_d, hot_d), (size_s, walk_s, hot_s) = results.values()
+    print(f"{'ahorro':10} {100 * (1 - size_s / size_d):12.0f} % "
+          f"{100 * (1 - walk_s / walk_d):10.0f} % {100 * (1 - hot_s / hot_d):11.0f} %")
+
+
+if __name__ == "__main__":
+    main()
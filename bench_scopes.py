@@ -0,0 +1,178 @@
+# bench_scopes.py
+"""Benchmark de scopes y símbolos del análisis semántico: scopes perezosos
+y Symbol con __slots__ (lo actual) frente a un Scope con su dict por cada
+bloque abierto y un Symbol con __dict__ y todos los campos de funciones y
+clases (como antes).
+
+Arma un programa sintético de N bloques (por defecto 100k): funciones con
+bloques anidados y seguidos (if / while / for / bloques sueltos), de los
+que solo uno de cada cuatro declara variables, y usos de las variables
+de afuera en cada bloque. Para cada versión corre
+SemanticAnalyzer.analyze() y mide:
+  - objetos Scope creados
+  - pico de memoria durante el análisis y memoria que queda retenida
+    (símbolos anotados en el AST), con tracemalloc
+  - RSS del proceso antes y después del análisis (Linux: /proc/self/statm)
+  - tiempo del análisis (sin tracemalloc)
+
+Cada versión se mide en un proceso propio, que parsea el programa él
+mismo: la memoria que liberó una medición no se reutiliza en la otra.
+
+Uso: python bench_scopes.py [bloques]
+"""
+import contextlib
+import dataclasses
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, make_dataclass
+from typing import Any, Optional
+
+import name_resolver
+from analizador_lexico import Lexer
+from parser import Parser
+from analizador_semantico import SemanticAnalyzer, Scope, Symbol
+from name_resolver import NameResolver
+
+BLOCKS_PER_FUNCTION = 100
+
+
+# ===== versión anterior =====
+
+class EagerNameResolver(NameResolver):
+    """NameResolver que crea el Scope (y su dict) de cada scope al abrirlo"""
+
+    def _enter(self, scope_type: str):
+        super()._enter(scope_type)
+        if len(self.scopes) > 1:  # el global ya lo crea _start()
+            self._materialize()
+
+
+# Symbol con __dict__ por instancia y los campos de funciones y clases en
+# todos los símbolos
+PLAIN_SYMBOL = make_dataclass("Symbol", [
+    (field.name, field.type, dataclasses.field(default=field.default))
+    for field in fields(Symbol)
+] + [
+    (name, Optional[Any], dataclasses.field(default=None))
+    for name in ("param_types", "return_type", "members", "methods")
+])
+# mismos métodos que Scope, sin __slots__
+PLAIN_SCOPE = type("Scope", (), {
+    name: value for name, value in vars(Scope).items()
+    if name != "__slots__" and name not in Scope.__slots__
+})
+
+# versión -> (clase del resolver, clases de name_resolver a reemplazar)
+VERSIONS = {
+    "antes": (EagerNameResolver, {
+        "Symbol": PLAIN_SYMBOL, "FunctionSymbol": PLAIN_SYMBOL,
+        "ClassSymbol": PLAIN_SYMBOL, "Scope": PLAIN_SCOPE,
+    }),
+    "ahora": (NameResolver, {}),
+}
+
+
+def function_source(i: int) -> str:
+    """Función con BLOCKS_PER_FUNCTION bloques (el cuerpo no cuenta)"""
+    lines = [f"int f{i}(int a, int b) {{", "    int x = a;"]
+    for j in range(BLOCKS_PER_FUNCTION // 4):
+        # cuatro bloques: uno con declaración y tres sin ninguna
+        lines.append(f"    if (x > {j}) {{ int t = x + b; x = t * 2; }}")
+        lines.append(f"    while (x < {j}) {{ x = x + a; }}")
+        lines.append("    for (x = 0; x < b; x++) { b = b - 1; }")
+        lines.append("    { x = x % 7; }")
+    lines.append("    return x;")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def analyze(ast) -> list:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SemanticAnalyzer().analyze(ast)
+
+
+def measure(version: str, functions: int) -> tuple:
+    """Mide una versión (en un proceso del pool). Retorna (errores, Scope
+    creados, pico MB, retenido MB, RSS antes MB, RSS después MB, tiempo s)
+    """
+    # analyze() importa NameResolver de name_resolver al llamarse
+    resolver, classes = VERSIONS[version]
+    name_resolver.NameResolver = resolver
+    for name, replacement in classes.items():
+        setattr(name_resolver, name, replacement)
+
+    source = "\n".join(function_source(i) for i in range(functions))
+    ast = Parser(Lexer(source).scan_tokens()).parse()
+    del source
+
+    # cuenta los Scope creados durante el análisis
+    scopes = 0
+    scope_class = name_resolver.Scope
+    scope_init = scope_class.__init__
+
+    def counting_init(self, *args, **kwargs):
+        nonlocal scopes
+        scopes += 1
+        scope_init(self, *args, **kwargs)
+
+    scope_class.__init__ = counting_init
+    # RSS sin tracemalloc, que tiene su propio costo por bloque
+    gc.collect()
+    rss_before = rss_mb()
+    errors = analyze(ast)
+    rss_after = rss_mb()
+    scope_class.__init__ = scope_init
+
+    # los símbolos del primer análisis se liberan al reemplazarlos: retained
+    # cuenta solo los de este
+    gc.collect()
+    tracemalloc.start()
+    analyze(ast)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        analyze(ast)
+        best = min(best, time.perf_counter() - start)
+    return (len(errors), scopes, peak / 2**20, retained / 2**20,
+            rss_before, rss_after, best)
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    functions = max(1, blocks // BLOCKS_PER_FUNCTION)
+
+    results = {}
+    for version in VERSIONS:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results[version] = pool.submit(measure, version, functions).result()
+
+    print(f"Programa sintético: {functions * BLOCKS_PER_FUNCTION} bloques "
+          f"en {functions} funciones, {results['ahora'][0]} errores")
+    print(f"{'':7} {'Scope creados':>14} {'pico':>9} {'retenido':>11} "
+          f"{'RSS':>22} {'tiempo':>8}")
+    for version, (_, scopes, peak, retained, rss_before, rss_after, best) in results.items():
+        print(f"{version:7} {scopes:>14} {peak:6.1f} MB {retained:8.1f} MB "
+              f"{rss_before:7.1f} -> {rss_after:6.1f} MB {best:6.2f} s")
+    before, after = results["antes"], results["ahora"]
+    print(f"{'ahorro':7} {100 * (1 - after[1] / before[1]):13.0f} % "
+          f"{100 * (1 - after[2] / before[2]):7.0f} % {100 * (1 - after[3] / before[3]):9.0f} % "
+          f"{'+%.1f -> +%.1f MB' % (before[5] - before[4], after[5] - after[4]):>22} "
+          f"{100 * (1 - after[6] / before[6]):6.0f} %")
+
+
+if __name__ == "__main__":
+    main()
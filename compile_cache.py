@@ -0,0 +1,218 @@
+# compile_cache.py
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+from array import _array_reconstructor, array
+from importlib.util import find_spec
+from typing import List, Optional
+
+from tokens import Token, TOKEN_TYPES_BY_VALUE
+from ast_nodes import Program
+from ast_arena import ASTArena
+
+
+# Caché en disco de una compilación: tokens, AST y errores de cada fase,
+# en un archivo por fuente, nombrado por el SHA-256 del fuente y de la
+# versión del compilador. El formato es binario y por columnas:
+#   MAGIC + pickle de (tokens en arrays, AST como columnas de ASTArena,
+#   errores léxicos, sintácticos y semánticos)
+
+MAGIC = b"CCACHE1\n"
+
+# módulos cuyo código decide el resultado: si cambia alguno, cambia la versión
+COMPILER_MODULES = (
+    "tokens", "analizador_lexico", "lexer_numpy", "ast_nodes", "parser",
+    "parser_ll1", "analizador_semantico", "ast_visitor", "name_resolver",
+    "ast_arena", "compile_cache",
+)
+
+DEFAULT_DIRECTORY = ".compile_cache"
+
+_compiler_version = None
+
+
+def compiler_version() -> str:
+    """Hash del código de los módulos del compilador"""
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256(MAGIC)
+        for name in COMPILER_MODULES:
+            spec = find_spec(name)
+            if spec is not None and spec.origin:
+                with open(spec.origin, "rb") as f:
+                    digest.update(f.read())
+        _compiler_version = digest.hexdigest()
+    return _compiler_version
+
+
+class CompileResult:
+    """Resultado de compilar un fuente.
+
+    Las fases que no llegaron a correr quedan en None: sin AST si hubo
+    errores léxicos, sin errores semánticos si hubo errores de sintaxis.
+    """
+
+    def __init__(self, tokens: List[Token] = None, lexer_errors: List[str] = None,
+                 ast: Program = None, parser_errors: List[str] = None,
+                 semantic_errors: List[str] = None):
+        self.tokens = tokens
+        self.lexer_errors = lexer_errors
+        self.ast = ast
+        self.parser_errors = parser_errors
+        self.semantic_errors = semantic_errors
+
+
+def _dump_tokens(tokens: List[Token]) -> tuple:
+    return (
+        array("B", [tok.type.value for tok in tokens]),
+        [tok.lexeme for tok in tokens],  # pickle guarda una vez cada cadena repetida
+        array("i", [tok.line for tok in tokens]),
+        array("i", [tok.column for tok in tokens]),
+        [tok.name_id for tok in tokens],
+    )
+
+
+def _load_tokens(columns: tuple) -> List[Token]:
+    kinds, lexemes, lines, columns, name_ids = columns
+    return list(map(Token, map(TOKEN_TYPES_BY_VALUE.__getitem__, kinds),
+                    lexemes, lines, columns, name_ids))
+
+
+def _new_file_mode() -> int:
+    """Permisos de un archivo recién creado según la umask del proceso"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _is_array(value, typecode: str) -> bool:
+    return isinstance(value, array) and value.typecode == typecode
+
+
+def _is_str_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def _decode(entry) -> CompileResult:
+    """Arma el CompileResult de lo leído de un archivo de la caché.
+    ValueError si no tiene la forma que escribe store(); un archivo dañado
+    que pasa estos chequeos falla al armar el AST (IndexError, KeyError,
+    TypeError...)
+    """
+    if not (isinstance(entry, tuple) and len(entry) == 5):
+        raise ValueError("Malformed cache entry")
+    token_columns, arena, lexer_errors, parser_errors, semantic_errors = entry
+
+    if not (isinstance(token_columns, tuple) and len(token_columns) == 5):
+        raise ValueError("Malformed token columns")
+    kinds, lexemes, lines, columns, name_ids = token_columns
+    if not (_is_array(kinds, "B") and _is_str_list(lexemes) and _is_array(lines, "i")
+            and _is_array(columns, "i") and isinstance(name_ids, list)
+            and len(kinds) == len(lexemes) == len(lines) == len(columns) == len(name_ids)):
+        raise ValueError("Malformed token columns")
+    if kinds and not (min(kinds) > 0 and max(kinds) < len(TOKEN_TYPES_BY_VALUE)):
+        raise ValueError("Unknown token type in cache entry")
+    if not all(name_id is None or type(name_id) is int for name_id in name_ids):
+        raise ValueError("Malformed token columns")
+
+    if arena is not None and not (
+            isinstance(arena, ASTArena) and _is_array(arena.kinds, "B")
+            and _is_array(arena.first, "i") and _is_array(arena.slots, "i")
+            and _is_array(arena.children, "i") and _is_str_list(arena.texts)):
+        raise ValueError("Malformed AST arena")
+    for errors in (lexer_errors, parser_errors, semantic_errors):
+        if errors is not None and not _is_str_list(errors):
+            raise ValueError("Malformed error list")
+
+    tokens = _load_tokens(token_columns)
+    ast = None
+    if arena is not None:
+        arena.tokens = tokens
+        ast = arena.to_tree()
+    return CompileResult(tokens, lexer_errors, ast, parser_errors, semantic_errors)
+
+
+# lo único que pickle necesita importar para leer un archivo de la caché:
+# arrays de tokens y columnas, y el ASTArena
+_CACHE_CLASSES = {
+    ("array", "array"): array,
+    ("array", "_array_reconstructor"): _array_reconstructor,
+    ("ast_arena", "ASTArena"): ASTArena,
+}
+
+
+class _CacheUnpickler(pickle.Unpickler):
+    """Unpickler que solo resuelve _CACHE_CLASSES: cualquiera que pueda
+    escribir en el directorio de la caché no puede hacer que load()
+    importe o llame otra cosa
+    """
+
+    def find_class(self, module: str, name: str):
+        try:
+            return _CACHE_CLASSES[module, name]
+        except KeyError:
+            raise pickle.UnpicklingError(f"{module}.{name} no permitido en la caché") from None
+
+
+class CompileCache:
+    """Caché de compilaciones en un directorio.
+
+    load() retorna el CompileResult guardado para ese fuente o None; un
+    archivo ilegible, de otra versión o que pide otras clases que las de
+    _CACHE_CLASSES cuenta como ausente. store() escribe en un temporal y lo
+    renombra, así un proceso concurrente nunca lee un archivo a medias; el
+    archivo queda con los permisos que da la umask, como uno creado con
+    open().
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY):
+        self.directory = directory
+
+    def key(self, source: str) -> str:
+        digest = hashlib.sha256(compiler_version().encode("ascii"))
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, source: str) -> str:
+        return os.path.join(self.directory, self.key(source) + ".bin")
+
+    def load(self, source: str) -> Optional[CompileResult]:
+        try:
+            with open(self.path(source), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(MAGIC):
+            return None
+        try:
+            return _decode(_CacheUnpickler(io.BytesIO(data[len(MAGIC):])).load())
+        except Exception:
+            # un archivo dañado puede fallar de muchas formas: además de
+            # UnpicklingError, el unpickler de C da EOFError, OverflowError o
+            # MemoryError con largos rotos, y armar el AST IndexError, KeyError...
+            return None
+
+    def store(self, source: str, result: CompileResult):
+        arena = None
+        if result.ast is not None:
+            arena = ASTArena.from_tree(result.ast, result.tokens)
+        data = pickle.dumps(
+            (_dump_tokens(result.tokens), arena, result.lexer_errors,
+             result.parser_errors, result.semantic_errors),
+            pickle.HIGHEST_PROTOCOL,
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC)
+                f.write(data)
+            # mkstemp crea el archivo con 0600: se le dan los permisos de un
+            # archivo nuevo, así una caché compartida la leen los demás
+            os.chmod(temp_path, _new_file_mode())
+            os.replace(temp_path, self.path(source))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
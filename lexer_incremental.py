@@ -0,0 +1,92 @@
+# lexer_incremental.py
+from array import array
+from bisect import bisect_left
+
+from tokens import TokenType, TokenBuffer
+from source_map import SourceMap
+from analizador_lexico import Lexer
+
+
+# caracteres que el lexer mira más allá del final de un token
+# (un entero seguido de '.' y dígito pasa a ser NUM_FLOAT)
+LOOKAHEAD = 2
+
+
+def relex(old_tokens: TokenBuffer, edit_start: int, edit_end: int, new_text: str) -> TokenBuffer:
+    """Re-lexea solo la zona dañada tras reemplazar fuente[edit_start:edit_end].
+
+    old_tokens debe venir de scan_buffer(lazy_positions=True) (solo
+    offsets; línea y columna salen del SourceMap). Se reanuda el escaneo
+    en el final del último token que la edición no puede alterar, y se
+    para en cuanto un token nuevo, ya pasada la zona editada, empieza donde
+    empezaba uno viejo: desde ahí el texto y el estado del escáner son los
+    mismos, así que la cola vieja se reutiliza desplazando sus offsets. Las
+    líneas de la cola salen del SourceMap del fuente nuevo.
+
+    El resultado equivale a Lexer(fuente_nuevo).scan_buffer(lazy_positions=True)
+    y comparte la StringTable de old_tokens. Un error léxico en la zona
+    re-lexeada lanza LexError igual que el escaneo completo.
+    """
+    if old_tokens.source_map is None:
+        raise ValueError("relex needs a TokenBuffer built with lazy_positions=True")
+    old_source = old_tokens.source
+    if not isinstance(old_source, str):
+        # bytes/mmap solo se lexean directamente si son ASCII: mismos offsets
+        old_source = str(old_source, "utf-8")
+    if not 0 <= edit_start <= edit_end <= len(old_source):
+        raise ValueError(f"Invalid edit range: {edit_start}..{edit_end}")
+
+    source = old_source[:edit_start] + new_text + old_source[edit_end:]
+    delta = len(new_text) - (edit_end - edit_start)
+    kinds = old_tokens.kinds
+    starts = old_tokens.starts
+    ends = old_tokens.ends
+    name_ids = old_tokens.name_ids
+    last = len(kinds) - 1  # EOF
+    string_value = TokenType.STRING.value
+
+    # primer token que la edición puede alterar (con margen por lookahead);
+    # los anteriores se conservan y se reanuda al final del previo
+    first = bisect_left(ends, edit_start - LOOKAHEAD - 1, 1, last)
+    if first > 1:
+        pos = ends[first - 1] + (kinds[first - 1] == string_value)
+    else:
+        pos = 0
+
+    buf = TokenBuffer(source, old_tokens.strings, SourceMap(source))
+    buf.kinds = kinds[:first]
+    buf.starts = starts[:first]
+    buf.ends = ends[:first]
+    buf.name_ids = name_ids[:first]
+    buf.extra_lexemes = {i: lexeme for i, lexeme in old_tokens.extra_lexemes.items()
+                         if i < first}
+
+    resumed = [last]
+
+    def resync(offset: int) -> bool:
+        # ¿empezaba un token viejo en este mismo punto del texto?
+        old_offset = offset - delta
+        j = bisect_left(starts, old_offset, first, last + 1)
+        if j <= last and starts[j] - (kinds[j] == string_value) == old_offset:
+            resumed[0] = j
+            return True
+        return False
+
+    lexer = Lexer(source, strings=old_tokens.strings)
+    lexer._scan_offsets(buf, pos, resync, edit_start + len(new_text))
+
+    # cola intacta (incluye EOF) con los offsets desplazados
+    j = resumed[0]
+    shift = len(buf.kinds) - j
+    for i, lexeme in old_tokens.extra_lexemes.items():
+        if i >= j:
+            buf.extra_lexemes[i + shift] = lexeme
+    buf.kinds.extend(kinds[j:])
+    buf.name_ids.extend(name_ids[j:])
+    if delta:
+        buf.starts.extend(array("i", [start + delta for start in starts[j:]]))
+        buf.ends.extend(array("i", [end + delta for end in ends[j:]]))
+    else:
+        buf.starts.extend(starts[j:])
+        buf.ends.extend(ends[j:])
+    return buf
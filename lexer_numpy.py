@@ -0,0 +1,315 @@
+# lexer_numpy.py
+import numpy as np
+
+from tokens import TokenType, Token, TOKEN_TYPES_BY_VALUE
+from analizador_lexico import KEYWORDS, OPERATORS
+
+
+# ----------------- clases de carácter -----------------
+
+WS, NL, ALPHA, DIGIT, SINGLE, PAIRABLE, SPECIAL, OTHER, NONASCII, COVERED = range(10)
+
+CHAR_CLASS = np.full(128, OTHER, dtype=np.uint8)
+for _ch in " \t\r":
+    CHAR_CLASS[ord(_ch)] = WS
+CHAR_CLASS[ord("\n")] = NL
+for _ch in "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_":
+    CHAR_CLASS[ord(_ch)] = ALPHA
+for _ch in "0123456789":
+    CHAR_CLASS[ord(_ch)] = DIGIT
+for _ch in "(){}[];,.*%":
+    CHAR_CLASS[ord(_ch)] = SINGLE
+for _ch in "+-=!<>&|":
+    CHAR_CLASS[ord(_ch)] = PAIRABLE
+for _ch in "/\"'":
+    CHAR_CLASS[ord(_ch)] = SPECIAL
+
+# valor de TokenType de cada operador de un carácter (0 = no es token solo)
+SINGLE_VALUE = np.zeros(128, dtype=np.int32)
+for _text, _type in OPERATORS.items():
+    if len(_text) == 1 and _text not in "&|":
+        SINGLE_VALUE[ord(_text)] = _type.value
+
+# segundo carácter que forma operador doble con cada carácter
+PAIR_SECOND = np.zeros(128, dtype=np.uint8)
+for _text in OPERATORS:
+    if len(_text) == 2:
+        PAIR_SECOND[ord(_text[0])] = ord(_text[1])
+PAIR_VALUE = {(ord(t[0]), ord(t[1])): v.value for t, v in OPERATORS.items() if len(t) == 2}
+
+# códigos de elemento que no son TokenType
+SKIP = -1    # comentario: no genera token
+AMBIG = -2   # región que se resuelve con Lexer.scan_token
+
+ID_VALUE = TokenType.ID.value
+STRING_VALUE = TokenType.STRING.value
+CHAR_VALUE = TokenType.CHAR_LITERAL.value
+INT_VALUE = TokenType.NUM_INT.value
+FLOAT_VALUE = TokenType.NUM_FLOAT.value
+DIV_VALUE = TokenType.OP_DIV.value
+
+
+def _codes(source: str) -> np.ndarray:
+    if source.isascii():
+        return np.frombuffer(source.encode("ascii"), dtype=np.uint8)
+    return np.frombuffer(source.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+
+def _classify(codes: np.ndarray) -> np.ndarray:
+    if codes.dtype == np.uint8:
+        return CHAR_CLASS[codes]
+    return np.where(codes < 128, CHAR_CLASS[np.minimum(codes, 127)], NONASCII).astype(np.uint8)
+
+
+def _special_spans(source: str, positions) -> list:
+    """Comentarios, cadenas, literales de carácter y '/' en orden de aparición.
+
+    Es la única parte secuencial: solo visita las posiciones de '/', '"' y
+    "'" que no caen dentro de un comentario o cadena anterior.
+    """
+    n = len(source)
+    spans = []
+    cursor = 0
+    for p in positions:
+        if p < cursor:
+            continue
+        ch = source[p]
+        if ch == "/":
+            nxt = source[p + 1] if p + 1 < n else ""
+            if nxt == "/":
+                end = source.find("\n", p)
+                end = n if end < 0 else end
+                spans.append((p, end, SKIP))
+            elif nxt == "*":
+                end = source.find("*/", p + 2)
+                if end < 0:
+                    spans.append((p, n, AMBIG))
+                    break
+                end += 2
+                spans.append((p, end, SKIP))
+            else:
+                end = p + 1
+                spans.append((p, end, DIV_VALUE))
+        elif ch == '"':
+            end = source.find('"', p + 1)
+            if end < 0:
+                spans.append((p, n, AMBIG))
+                break
+            end += 1
+            spans.append((p, end, STRING_VALUE))
+        else:
+            if p + 2 < n and source[p + 1] != "\n" and source[p + 2] == "'":
+                end = p + 3
+                spans.append((p, end, CHAR_VALUE))
+            elif p + 1 < n and source[p + 1] != "\n":
+                # literal inválido: el escalar consume "'x" y, en modo
+                # recover, salta hasta la comilla de cierre de la línea
+                end = p + 2
+                line_end = source.find("\n", end)
+                close = source.find("'", end, n if line_end < 0 else line_end)
+                if close >= 0:
+                    end = close + 1
+                spans.append((p, min(end, n), AMBIG))
+            else:
+                end = p + 1
+                spans.append((p, end, AMBIG))
+        cursor = end
+    return spans
+
+
+def _word_items(source: str, cls: np.ndarray, n: int):
+    """Elementos de las corridas alfanuméricas (identificadores y números)"""
+    word = (cls == ALPHA) | (cls == DIGIT) | (cls == NONASCII)
+    padded = np.concatenate(([False], word, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    run_starts = edges[0::2]
+    run_ends = edges[1::2]
+    if len(run_starts) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    alpha_count = np.concatenate(([0], np.cumsum(cls == ALPHA)))
+    other_count = np.concatenate(([0], np.cumsum(cls == NONASCII)))
+    has_alpha = alpha_count[run_ends] > alpha_count[run_starts]
+    has_other = other_count[run_ends] > other_count[run_starts]
+    first = cls[run_starts]
+
+    codes = np.where(first == ALPHA, ID_VALUE, INT_VALUE)
+    codes = np.where(has_other | ((first == DIGIT) & has_alpha), AMBIG, codes)
+    starts = run_starts.copy()
+    ends = run_ends.copy()
+
+    # números seguidos de '.': posible NUM_FLOAT, se resuelve uno a uno
+    after = run_ends + 1
+    candidates = np.flatnonzero(
+        (codes == INT_VALUE) & (after < n)
+        & (cls[np.minimum(run_ends, n - 1)] == SINGLE)
+    )
+    next_run = np.searchsorted(run_starts, after)
+    for i in candidates.tolist():
+        end = int(run_ends[i])
+        if source[end] != "." or codes[i] == SKIP:
+            continue
+        follow = int(next_run[i])
+        if follow >= len(run_starts) or run_starts[follow] != end + 1:
+            continue
+        follow_class = cls[end + 1]
+        if follow_class == DIGIT and codes[follow] == INT_VALUE:
+            ends[i] = run_ends[follow]
+            codes[i] = FLOAT_VALUE
+            codes[follow] = SKIP  # ya forma parte del flotante
+            follow_end = int(run_ends[follow])
+            if follow_end + 1 < n and source[follow_end] == "." and cls[follow_end + 1] in (DIGIT, NONASCII):
+                codes[i] = AMBIG  # "1.2.3": el escalar decide
+        elif follow_class in (DIGIT, NONASCII):
+            ends[i] = run_ends[follow]
+            codes[i] = AMBIG
+            codes[follow] = SKIP
+    keep = codes != SKIP
+    return starts[keep], ends[keep], codes[keep]
+
+
+def _operator_items(codes_arr: np.ndarray, cls: np.ndarray, n: int, float_dots):
+    """Elementos de operadores y símbolos de uno o dos caracteres"""
+    small = np.minimum(codes_arr, 127).astype(np.intp)
+    pairable = cls == PAIRABLE
+    nxt = np.concatenate((small[1:], [0]))
+    pair = pairable & (PAIR_SECOND[small] == nxt) & (PAIR_SECOND[small] != 0)
+    prev_pair = np.concatenate(([False], pair[:-1]))
+    pair_start = pair & ~prev_pair
+    chain = pair & prev_pair  # "+++", "===", "<==": el escalar decide
+
+    singles = (cls == SINGLE) | (pairable & ~pair & ~prev_pair)
+    single_pos = np.flatnonzero(singles)
+    if len(float_dots):
+        single_pos = np.setdiff1d(single_pos, float_dots, assume_unique=True)
+    single_codes = SINGLE_VALUE[small[single_pos]].astype(np.int64)
+    single_codes[single_codes == 0] = AMBIG  # '&' o '|' sueltos
+
+    pair_pos = np.flatnonzero(pair_start)
+    pair_codes = np.fromiter(
+        (PAIR_VALUE[(a, b)] for a, b in zip(small[pair_pos].tolist(), small[pair_pos + 1].tolist())),
+        dtype=np.int64, count=len(pair_pos),
+    )
+    chain_pos = np.flatnonzero(chain) - 1
+
+    other_pos = np.flatnonzero(cls == OTHER)
+
+    starts = np.concatenate((single_pos, pair_pos, chain_pos, other_pos))
+    ends = np.concatenate((single_pos + 1, pair_pos + 2, chain_pos + 3, other_pos + 1))
+    codes = np.concatenate((
+        single_codes, pair_codes,
+        np.full(len(chain_pos), AMBIG, dtype=np.int64),
+        np.full(len(other_pos), AMBIG, dtype=np.int64),
+    ))
+    return starts, np.minimum(ends, n), codes
+
+
+def scan_tokens_numpy(lexer) -> list[Token]:
+    """Motor "numpy" de Lexer: mismo flujo de tokens que scan_tokens().
+
+    Clasifica todo el fuente de una vez (arreglo uint8, o uint32 si hay
+    caracteres no ASCII) y obtiene los límites de identificadores, números y
+    operadores con operaciones vectorizadas; comentarios, cadenas y
+    literales de carácter se ubican con un recorrido que solo visita '/',
+    '"' y "'". Lo ambiguo (operadores encadenados como "+++", números con
+    letras, caracteres no ASCII, errores) se resuelve con Lexer.scan_token,
+    así los tokens y los mensajes de LexError son los del motor escalar.
+    """
+    source = lexer.text()
+    n = len(source)
+    tokens = lexer.tokens
+    tokens.append(Token(TokenType.BOF, "BOF", 1, 1))
+    if n == 0:
+        tokens.append(Token(TokenType.EOF, "EOF", 1, 1))
+        return tokens
+
+    codes_arr = _codes(source)
+    cls = _classify(codes_arr)
+
+    spans = _special_spans(source, np.flatnonzero(cls == SPECIAL).tolist())
+    if spans:
+        span_arr = np.array(spans, dtype=np.int64)
+        span_starts, span_ends, span_codes = span_arr[:, 0], span_arr[:, 1], span_arr[:, 2]
+        delta = np.zeros(n + 1, dtype=np.int32)
+        np.add.at(delta, span_starts, 1)
+        np.add.at(delta, span_ends, -1)
+        covered = np.cumsum(delta[:n]) > 0
+        cls = np.where(covered, COVERED, cls).astype(np.uint8)
+    else:
+        span_starts = span_ends = span_codes = np.zeros(0, dtype=np.int64)
+        covered = np.zeros(n, dtype=bool)
+
+    word_starts, word_ends, word_codes = _word_items(source, cls, n)
+    # el '.' de cada flotante ya está dentro de su token
+    float_dots = np.array(
+        [source.index(".", s) for s in word_starts[word_codes == FLOAT_VALUE].tolist()],
+        dtype=np.int64,
+    )
+    op_starts, op_ends, op_codes = _operator_items(codes_arr, cls, n, float_dots)
+
+    starts = np.concatenate((word_starts, op_starts, span_starts)).astype(np.int64)
+    ends = np.concatenate((word_ends, op_ends, span_ends)).astype(np.int64)
+    codes = np.concatenate((word_codes, op_codes, span_codes)).astype(np.int64)
+    order = np.lexsort((codes != AMBIG, starts))
+    starts, ends, codes = starts[order], ends[order], codes[order]
+
+    # línea / columna: un salto de línea dentro de comentario o cadena deja
+    # la base de columna un carácter antes (igual que el motor escalar)
+    newlines = np.flatnonzero(codes_arr == 10)
+    line_bases = np.concatenate(([-1], newlines - covered[newlines]))
+    anchor = np.where(codes == STRING_VALUE, ends, starts)
+    line_index = np.searchsorted(newlines, anchor)
+    lines = line_index + 1
+    columns = starts - line_bases[line_index]
+
+    keywords = KEYWORDS
+    types = TOKEN_TYPES_BY_VALUE
+    intern = lexer.strings.intern
+    names = lexer.strings.names
+    canonical = lexer.strings.canonical
+
+    pos = 0
+    for start, end, code, line, column in zip(
+        starts.tolist(), ends.tolist(), codes.tolist(), lines.tolist(), columns.tolist()
+    ):
+        if start < pos:
+            if end <= pos:
+                continue
+            # el escalar terminó a mitad de este elemento: sigue el escalar
+            start = pos
+            code = AMBIG
+            line = lexer.line
+            column = lexer.column
+        if code >= 0:
+            if code == ID_VALUE:
+                text = source[start:end]
+                type_ = keywords.get(text)
+                if type_ is not None:
+                    tokens.append(Token(type_, text, line, column))
+                else:
+                    name_id = intern(text)
+                    tokens.append(Token(TokenType.ID, names[name_id], line, column, name_id))
+            elif code == STRING_VALUE:
+                tokens.append(Token(TokenType.STRING, canonical(source[start + 1:end - 1]), line, column))
+            elif code == INT_VALUE or code == FLOAT_VALUE or code == CHAR_VALUE:
+                tokens.append(Token(types[code], canonical(source[start:end]), line, column))
+            else:
+                tokens.append(Token(types[code], source[start:end], line, column))
+            pos = end
+        elif code == SKIP:
+            pos = end
+        else:
+            lexer.current = start
+            lexer.line = line
+            lexer.column = column
+            while lexer.current < end:
+                lexer.start = lexer.current
+                lexer.scan_token_or_error()
+            pos = lexer.current
+
+    lexer.current = n
+    lexer.line = len(newlines) + 1
+    lexer.column = n - int(line_bases[-1])
+    tokens.append(Token(TokenType.EOF, "EOF", lexer.line, lexer.column))
+    return tokens
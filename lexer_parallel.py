@@ -0,0 +1,127 @@
+# lexer_parallel.py
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from tokens import TokenType, Token, TOKEN_TYPES_BY_VALUE
+from analizador_lexico import Lexer, LexError
+
+
+# por debajo de este tamaño por trozo no compensa repartir el trabajo
+MIN_CHUNK_SIZE = 64 * 1024
+
+
+def split_at_newlines(source: str, parts: int) -> list[int]:
+    """Offsets de inicio de cada trozo: 0 y posiciones justo tras un '\\n'"""
+    n = len(source)
+    starts = [0]
+    for i in range(1, parts):
+        newline = source.find("\n", max(i * n // parts, starts[-1]))
+        if newline < 0 or newline + 1 >= n:
+            break
+        if newline + 1 > starts[-1]:
+            starts.append(newline + 1)
+    return starts
+
+
+def _lex_chunk(chunk: str, engine: str):
+    """Lexea un trozo de forma aislada (en un proceso del pool).
+
+    Retorna columnas compactas (tipos, lexemas, líneas, columnas) con líneas
+    relativas al trozo, más la posición final; o None si el trozo no se
+    pudo lexear solo (error real, o comentario/cadena que cruza el corte).
+    """
+    try:
+        tokens = Lexer(chunk, engine=engine).scan_tokens()
+    except LexError:
+        return None
+    body = tokens[1:-1]
+    eof = tokens[-1]
+    return (
+        array("i", [t.type.value for t in body]),
+        [t.lexeme for t in body],
+        array("i", [t.line for t in body]),
+        array("i", [t.column for t in body]),
+        eof.line,
+        eof.column,
+    )
+
+
+def scan_tokens_parallel(lexer: Lexer, workers: int = None) -> list[Token]:
+    """Lexea el fuente de `lexer` en paralelo; equivale a lexer.scan_tokens().
+
+    El fuente se corta en inicios de línea y cada trozo se lexea en un
+    ProcessPoolExecutor con el motor del lexer. Al unir, las líneas se
+    desplazan a su posición global. Un trozo que falló (error real, o un
+    comentario de bloque o cadena que cruza el corte) se vuelve a lexear en
+    este proceso desde su inicio, que es un punto seguro, con la lógica
+    escalar hasta caer exactamente en el inicio de un trozo posterior; los
+    errores reales salen así con el mismo mensaje que en scan_tokens().
+    """
+    source = lexer.text()
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers, max(1, len(source) // MIN_CHUNK_SIZE))
+    if parts <= 1:
+        return lexer.scan_tokens()
+
+    starts = split_at_newlines(source, parts)
+    ends = starts[1:] + [len(source)]
+    first_lines = [1]
+    for start, end in zip(starts, ends):
+        first_lines.append(first_lines[-1] + source.count("\n", start, end))
+
+    with ProcessPoolExecutor(max_workers=len(starts)) as pool:
+        results = list(pool.map(
+            _lex_chunk,
+            [source[start:end] for start, end in zip(starts, ends)],
+            [lexer.engine] * len(starts),
+        ))
+
+    tokens = lexer.tokens
+    tokens.append(Token(TokenType.BOF, "BOF", 1, 1))
+    types = TOKEN_TYPES_BY_VALUE
+    tok_id = TokenType.ID.value
+    literals = (TokenType.NUM_INT.value, TokenType.NUM_FLOAT.value,
+                TokenType.STRING.value, TokenType.CHAR_LITERAL.value)
+    intern = lexer.strings.intern
+    names = lexer.strings.names
+    canonical = lexer.strings.canonical
+
+    k = 0
+    while k < len(starts):
+        result = results[k]
+        if result is not None:
+            kinds, lexemes, lines, columns, end_line, end_column = result
+            shift = first_lines[k] - 1
+            for kind, lexeme, line, column in zip(kinds, lexemes, lines, columns):
+                if kind == tok_id:
+                    name_id = intern(lexeme)
+                    tokens.append(Token(types[kind], names[name_id], line + shift, column, name_id))
+                elif kind in literals:
+                    tokens.append(Token(types[kind], canonical(lexeme), line + shift, column))
+                else:
+                    tokens.append(Token(types[kind], lexeme, line + shift, column))
+            lexer.line = end_line + shift
+            lexer.column = end_column
+            k += 1
+            continue
+
+        # re-lexeo secuencial desde el inicio del trozo k (punto seguro)
+        lexer.current = starts[k]
+        lexer.line = first_lines[k]
+        lexer.column = 1
+        k += 1
+        while not lexer.is_at_end():
+            lexer.start = lexer.current
+            lexer.scan_token_or_error()
+            while k < len(starts) and starts[k] < lexer.current:
+                k += 1
+            if k < len(starts) and starts[k] == lexer.current:
+                # se consumió un '\n' normal: estado limpio al inicio del trozo k
+                break
+        else:
+            k = len(starts)
+
+    lexer.current = len(source)
+    tokens.append(Token(TokenType.EOF, "EOF", lexer.line, lexer.column))
+    return tokens
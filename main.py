@@ -1,6 +1,7 @@
-from analizador_lexico import Lexer, LexError
+from analizador_lexico import Lexer
 from parser import Parser, ParserError
 from analizador_semantico import SemanticAnalyzer
+from compile_cache import CompileCache, CompileResult
 import sys
 
 # Configurar encoding para Windows
@@ -23,18 +24,38 @@ def main():
         print(f" Error al leer archivo: {e}")
         return
 
+    # caché en disco: un fuente sin cambios no se vuelve a compilar
+    cache = CompileCache()
+    result = cache.load(code)
+    if result is not None:
+        print(f"[DEBUG] Resultados cargados de la caché ({cache.path(code)})")
+    else:
+        result = CompileResult()
+    # True si alguna fase corrió en esta ejecución: solo entonces hay algo
+    # nuevo que guardar en la caché
+    updated = False
+
     # ===== FASE 1: ANÁLISIS LÉXICO =====
-    print("\n[DEBUG] Iniciando análisis léxico...")
-    try:
-        lexer = Lexer(code)
-        tokens = lexer.scan_tokens()
-        print(f"[DEBUG] Análisis léxico completado ({len(tokens)} tokens generados)")
-    except LexError as e:
-        print(" Error lexico:")
-        print(e)
-        return
-    except Exception as e:
-        print(f" Error inesperado en análisis léxico: {e}")
+    if result.tokens is None:
+        print("\n[DEBUG] Iniciando análisis léxico...")
+        try:
+            # modo recover: reporta todos los errores léxicos en una sola pasada
+            lexer = Lexer(code, recover=True)
+            result.tokens = lexer.scan_tokens()
+            result.lexer_errors = lexer.errors
+            updated = True
+            print(f"[DEBUG] Análisis léxico completado ({len(result.tokens)} tokens generados)")
+        except Exception as e:
+            print(f" Error inesperado en análisis léxico: {e}")
+            return
+    tokens = result.tokens
+
+    if result.lexer_errors:
+        print(" Errores lexicos encontrados:")
+        for error in result.lexer_errors:
+            print(f"  • {error}")
+        if updated:
+            cache.store(code, result)
         return
 
     print("--- TOKENS ---")
@@ -43,36 +64,54 @@ def main():
 
     # ===== FASE 2: ANÁLISIS SINTÁCTICO (Genera AST) =====
     print("\n--- ANALISIS SINTACTICO ---")
-    print("[DEBUG] Iniciando análisis sintáctico...")
-    try:
-        parser = Parser(tokens)
-        print("[DEBUG] Parser inicializado, comenzando parse()...")
-        ast = parser.parse()  # Retorna el AST (Program node)
-        print(f"[DEBUG] Análisis sintáctico completado, AST generado")
-        print(" Sintaxis valida")
-    except ParserError as e:
-        print(" Error de sintaxis:")
-        print(e)
-        return
-    except Exception as e:
-        print(f" Error inesperado en análisis sintáctico: {e}")
-        import traceback
-        traceback.print_exc()
+    if result.ast is None:
+        print("[DEBUG] Iniciando análisis sintáctico...")
+        try:
+            # modo recover: reporta todos los errores de sintaxis en una sola pasada
+            parser = Parser(tokens, recover=True)
+            print("[DEBUG] Parser inicializado, comenzando parse_iterative()...")
+            result.ast = parser.parse_iterative()  # Retorna el AST (Program node), sin límite de anidamiento
+            result.parser_errors = parser.errors
+            updated = True
+            print(f"[DEBUG] Análisis sintáctico completado, AST generado")
+        except ParserError as e:
+            print(" Error de sintaxis:")
+            print(e)
+            return
+        except Exception as e:
+            print(f" Error inesperado en análisis sintáctico: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+    ast = result.ast
+
+    if result.parser_errors:
+        print(" Errores de sintaxis encontrados:")
+        for error in result.parser_errors:
+            print(f"  • {error}")
+        if updated:
+            cache.store(code, result)
         return
+    print(" Sintaxis valida")
 
     # ===== FASE 3: ANÁLISIS SEMÁNTICO =====
     print("\n--- ANALISIS SEMANTICO ---")
-    print("[DEBUG] Iniciando análisis semántico...")
-    try:
-        analyzer = SemanticAnalyzer()
-        print("[DEBUG] SemanticAnalyzer inicializado")
-        semantic_errors = analyzer.analyze(ast)
-        print(f"[DEBUG] Análisis semántico completado ({len(semantic_errors)} errores encontrados)")
-    except Exception as e:
-        print(f" Error inesperado en análisis semántico: {e}")
-        import traceback
-        traceback.print_exc()
-        return
+    if result.semantic_errors is None:
+        print("[DEBUG] Iniciando análisis semántico...")
+        try:
+            analyzer = SemanticAnalyzer()
+            print("[DEBUG] SemanticAnalyzer inicializado")
+            result.semantic_errors = analyzer.analyze(ast)
+            print(f"[DEBUG] Análisis semántico completado ({len(result.semantic_errors)} errores encontrados)")
+        except Exception as e:
+            print(f" Error inesperado en análisis semántico: {e}")
+            import traceback
+            traceback.print_exc()
+            return
+        # un análisis cortado por una excepción no se guarda: se repite
+        if not analyzer.failed:
+            cache.store(code, result)
+    semantic_errors = result.semantic_errors
 
     if semantic_errors:
         print(" Errores semanticos encontrados:")
@@ -0,0 +1,349 @@
+# name_resolver.py
+from typing import Dict, List, Optional, Tuple
+
+from ast_nodes import *
+from ast_visitor import NodeVisitor
+from analizador_semantico import ClassSymbol, FunctionSymbol, Scope, Symbol, TypeKind, token_to_type
+
+
+class NameResolver(NodeVisitor):
+    """Pasada de resolución de nombres, previa a la verificación de tipos.
+
+    Abre scopes y define símbolos en el mismo orden que SemanticAnalyzer
+    los usa, crea los Symbol y anota cada uso (IdentifierExpr, CallExpr,
+    IndexExpr) con el símbolo al que se refiere, o None si no hay ninguno
+    visible. Cada declaración (VarDeclarator, Param, FuncDecl, ClassDecl)
+    guarda el símbolo que queda con su nombre en su scope: el propio, o el
+    de la declaración anterior si el nombre ya estaba definido. Los
+    parámetros y variables void no se definen (symbol None). Los expr_type
+    de un análisis anterior se borran, así no quedan tipos viejos en las
+    expresiones que SemanticAnalyzer no vuelva a visitar.
+
+    Los nombres visibles están en un solo dict nombre -> símbolo y cada
+    scope abierto recuerda qué símbolos taparon sus definiciones, para
+    restaurarlos al cerrarse: resolver un uso es un acceso a dict, sin
+    recorrer la cadena de scopes, y se hace una sola vez por uso.
+
+    Abrir un scope no crea nada: su Scope (con su dict) y su lista de
+    símbolos tapados se crean con la primera definición. Los bloques sin
+    declaraciones, la mayoría, no cuestan más que un tipo y dos None en
+    las pilas.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.global_scope: Optional[Scope] = None
+        # scope creado más interno (el padre de los que se creen)
+        self.scope: Optional[Scope] = None
+        self.visible: Dict[str, Symbol] = {}
+        # pilas, un elemento por scope abierto: su tipo, su Scope y los
+        # (nombre, símbolo tapado o None) de sus definiciones; None los dos
+        # últimos mientras no defina nada
+        self.scope_types: List[str] = []
+        self.scopes: List[Optional[Scope]] = []
+        self.shadowed: List[Optional[List[Tuple[str, Optional[Symbol]]]]] = []
+
+    def resolve(self, program: Program) -> Scope:
+        """Anota el AST y retorna el scope global"""
+        self._start()
+        self.visit(program)
+        return self.global_scope
+
+    def resolve_declarations(self, program: Program, start: int, stop: int) -> Scope:
+        """Anota solo program.declarations[start:stop] (ver semantic_parallel.py).
+
+        Parte del scope global que tendría resolve() al llegar a la primera:
+        todas las funciones y clases, y las variables globales declaradas
+        antes. Las declaraciones anteriores no se anotan.
+        """
+        self._start()
+        declarations = program.declarations
+        self._define_functions_and_classes(declarations)
+        for decl in declarations[:start]:
+            if isinstance(decl, VarDecl):
+                var_type = token_to_type(decl.type_token)
+                if var_type != TypeKind.VOID:
+                    for declarator in decl.declarators:
+                        self._define(self._variable_symbol(declarator, var_type))
+        for decl in declarations[start:stop]:
+            self.visit(decl)
+        return self.global_scope
+
+    def _start(self):
+        self.scope = None
+        self.visible = {}
+        self.scope_types = []
+        self.scopes = []
+        self.shadowed = []
+        self._enter("global")
+        self.global_scope = self._materialize()
+
+    # ===== Scopes =====
+
+    def _enter(self, scope_type: str):
+        self.scope_types.append(scope_type)
+        self.scopes.append(None)
+        self.shadowed.append(None)
+
+    def _leave(self):
+        self.scope_types.pop()
+        scope = self.scopes.pop()
+        shadowed = self.shadowed.pop()
+        if scope is None:
+            return
+        visible = self.visible
+        for name, symbol in reversed(shadowed):
+            if symbol is None:
+                del visible[name]
+            else:
+                visible[name] = symbol
+        self.scope = scope.parent
+
+    def _materialize(self) -> Scope:
+        """Crea el Scope del scope abierto más interno"""
+        level = len(self.scopes) - 1
+        self.scope = self.scopes[-1] = Scope(self.scope_types[-1], self.scope, level)
+        self.shadowed[-1] = []
+        return self.scope
+
+    def _level(self) -> int:
+        """Profundidad del scope abierto más interno"""
+        return len(self.scopes) - 1
+
+    def _define(self, symbol: Symbol) -> Symbol:
+        """Define symbol en el scope actual si su nombre está libre ahí;
+        retorna el símbolo que queda con ese nombre
+        """
+        name = symbol.name
+        scope = self.scopes[-1]
+        if scope is None:
+            scope = self._materialize()
+        else:
+            existing = scope.lookup_local(name)
+            if existing is not None:
+                return existing
+        scope.symbols[name] = symbol
+        self.shadowed[-1].append((name, self.visible.get(name)))
+        self.visible[name] = symbol
+        return symbol
+
+    def _variable_symbol(self, declarator: VarDeclarator, var_type: TypeKind) -> Symbol:
+        return Symbol(
+            name=declarator.name_token.lexeme,
+            type_=var_type,
+            kind="variable",
+            token=declarator.name_token,
+            scope_level=self._level(),
+            is_initialized=declarator.initializer is not None,
+            is_array=declarator.is_array
+        )
+
+    def _function_symbol(self, node: FuncDecl) -> Symbol:
+        return_type = token_to_type(node.return_type)
+        return FunctionSymbol(
+            name=node.name_token.lexeme,
+            type_=return_type,
+            kind="function",
+            token=node.name_token,
+            scope_level=self._level(),
+            param_types=[token_to_type(p.type_token) for p in node.parameters],
+            return_type=return_type
+        )
+
+    # ===== Declaraciones =====
+
+    def visit_Program(self, node: Program):
+        # Funciones y clases se definen antes de visitar cualquier cuerpo;
+        # las variables globales, al llegar a su declaración
+        self._define_functions_and_classes(node.declarations)
+        for decl in node.declarations:
+            self.visit(decl)
+
+    def _define_functions_and_classes(self, declarations: List[Declaration]):
+        for decl in declarations:
+            if isinstance(decl, FuncDecl):
+                decl.symbol = self._define(self._function_symbol(decl))
+            elif isinstance(decl, ClassDecl):
+                decl.symbol = self._define(ClassSymbol(
+                    name=decl.name_token.lexeme,
+                    type_=TypeKind.ERROR,
+                    kind="class",
+                    token=decl.name_token,
+                    scope_level=self._level(),
+                    members={},
+                    methods={}
+                ))
+
+    def visit_VarDecl(self, node: VarDecl):
+        var_type = token_to_type(node.type_token)
+        for declarator in node.declarators:
+            if var_type == TypeKind.VOID:
+                declarator.symbol = None
+            else:
+                declarator.symbol = self._define(self._variable_symbol(declarator, var_type))
+            if declarator.initializer is not None:
+                self.visit(declarator.initializer)
+
+    def visit_FuncDecl(self, node: FuncDecl):
+        # node.symbol lo asignó visit_Program o visit_ClassDecl
+        self._enter("function")
+        for param in node.parameters:
+            param_type = token_to_type(param.type_token)
+            if param_type == TypeKind.VOID:
+                param.symbol = None
+                continue
+            param.symbol = self._define(Symbol(
+                name=param.name_token.lexeme,
+                type_=param_type,
+                kind="parameter",
+                token=param.name_token,
+                scope_level=self._level(),
+                is_initialized=True
+            ))
+        self.visit_BlockStmt(node.body)
+        self._leave()
+
+    def visit_ClassDecl(self, node: ClassDecl):
+        class_sym = node.symbol
+        self._enter("class")
+        for member in node.members:
+            declaration = member.declaration
+            if isinstance(declaration, VarDecl):
+                member_type = token_to_type(declaration.type_token)
+                for item in declaration.declarators:
+                    var_sym = Symbol(
+                        name=item.name_token.lexeme,
+                        type_=member_type,
+                        kind="variable",
+                        token=item.name_token,
+                        scope_level=self._level()
+                    )
+                    item.symbol = self._define(var_sym)
+                    if item.symbol is var_sym and class_sym is not None and class_sym.members is not None:
+                        class_sym.members[var_sym.name] = var_sym
+                    if item.initializer is not None:
+                        self.visit(item.initializer)
+            elif isinstance(declaration, FuncDecl):
+                func_sym = self._function_symbol(declaration)
+                declaration.symbol = self._define(func_sym)
+                if declaration.symbol is func_sym and class_sym is not None and class_sym.methods is not None:
+                    class_sym.methods[func_sym.name] = func_sym
+
+        # Segunda pasada: cuerpos de los métodos, con todos los miembros visibles
+        for member in node.members:
+            if isinstance(member.declaration, FuncDecl):
+                self.visit_FuncDecl(member.declaration)
+        self._leave()
+
+    def visit_ErrorDecl(self, node: ErrorDecl):
+        pass
+
+    # ===== Sentencias =====
+
+    def visit_ErrorStmt(self, node: ErrorStmt):
+        pass
+
+    def visit_ExprStmt(self, node: ExprStmt):
+        if node.expression is not None:
+            self.visit(node.expression)
+
+    def visit_BlockStmt(self, node: BlockStmt):
+        self._enter("block")
+        for stmt in node.statements:
+            self.visit(stmt)
+        self._leave()
+
+    def visit_VarDeclStmt(self, node: VarDeclStmt):
+        self.visit_VarDecl(node.var_decl)
+
+    def visit_IfStmt(self, node: IfStmt):
+        self.visit(node.condition)
+        self.visit(node.then_stmt)
+        if node.else_stmt is not None:
+            self.visit(node.else_stmt)
+
+    def visit_WhileStmt(self, node: WhileStmt):
+        self.visit(node.condition)
+        self.visit(node.body)
+
+    def visit_ForStmt(self, node: ForStmt):
+        self._enter("block")
+        init = node.init
+        if isinstance(init, (VarDecl, VarDeclSinPunto)):
+            # Sin chequeo de void, como SemanticAnalyzer.visit_ForStmt
+            var_type = token_to_type(init.type_token)
+            for declarator in init.declarators:
+                declarator.symbol = self._define(self._variable_symbol(declarator, var_type))
+                if declarator.initializer is not None:
+                    self.visit(declarator.initializer)
+        elif init is not None:
+            self.visit(init)
+        if node.condition is not None:
+            self.visit(node.condition)
+        if node.update is not None:
+            self.visit(node.update)
+        self.visit(node.body)
+        self._leave()
+
+    def visit_SwitchStmt(self, node: SwitchStmt):
+        self.visit(node.expr)
+        for case in node.cases:
+            if case.case_expr is not None:
+                self.visit(case.case_expr)
+            for stmt in case.statements:
+                self.visit(stmt)
+
+    def visit_ReturnStmt(self, node: ReturnStmt):
+        if node.return_expr is not None:
+            self.visit(node.return_expr)
+
+    # ===== Expresiones =====
+    # Cada expresión pierde el expr_type de un análisis anterior: su tipo
+    # depende de los símbolos que se resuelven ahora
+
+    def visit_IdentifierExpr(self, node: IdentifierExpr):
+        node.symbol = self.visible.get(node.id_token.lexeme)
+        node.expr_type = None
+
+    def visit_CallExpr(self, node: CallExpr):
+        node.symbol = self.visible.get(node.func_token.lexeme)
+        node.expr_type = None
+        for arg in node.arguments:
+            self.visit(arg)
+
+    def visit_IndexExpr(self, node: IndexExpr):
+        node.symbol = self.visible.get(node.array_token.lexeme)
+        node.expr_type = None
+        self.visit(node.index)
+
+    def visit_AssignExpr(self, node: AssignExpr):
+        node.expr_type = None
+        self.visit(node.target)
+        self.visit(node.value)
+
+    def _visit_operands(self, node):
+        node.expr_type = None
+        self.visit(node.left)
+        self.visit(node.right)
+
+    visit_LogicalOrExpr = visit_LogicalAndExpr = visit_EqualityExpr = _visit_operands
+    visit_RelationalExpr = visit_BinaryExpr = _visit_operands
+
+    def visit_UnaryExpr(self, node: UnaryExpr):
+        node.expr_type = None
+        self.visit(node.operand)
+
+    def visit_PostfixExpr(self, node: PostfixExpr):
+        node.expr_type = None
+        self.visit(node.operand)
+
+    def visit_GroupingExpr(self, node: GroupingExpr):
+        node.expr_type = None
+        self.visit(node.expression)
+
+    def visit_LiteralExpr(self, node: LiteralExpr):
+        node.expr_type = None
+
+    def visit_Expression(self, node: Expression):
+        node.expr_type = None
+        self.generic_visit(node)
@@ -1,4 +1,7 @@
 # parser.py
+from collections import deque
+from typing import Iterable
+
 from tokens import TokenType, Token
 from ast_nodes import *
 
@@ -7,10 +10,110 @@ class ParserError(Exception):
     pass
 
 
+# Tabla de binding power del motor "pratt": operador binario -> (potencia,
+# nodo). Todos asocian a la izquierda; la asignación (derecha-asociativa y
+# con chequeo de destino) se trata aparte, como en expr_asign.
+BINARY_OPERATORS = {
+    TokenType.OP_OR: (1, LogicalOrExpr),
+    TokenType.OP_AND: (2, LogicalAndExpr),
+    TokenType.OP_IGUAL: (3, EqualityExpr),
+    TokenType.OP_DISTINTO: (3, EqualityExpr),
+    TokenType.OP_MENOR: (4, RelationalExpr),
+    TokenType.OP_MENOR_IG: (4, RelationalExpr),
+    TokenType.OP_MAYOR: (4, RelationalExpr),
+    TokenType.OP_MAYOR_IG: (4, RelationalExpr),
+    TokenType.OP_SUMA: (5, BinaryExpr),
+    TokenType.OP_RESTA: (5, BinaryExpr),
+    TokenType.OP_MULT: (6, BinaryExpr),
+    TokenType.OP_DIV: (6, BinaryExpr),
+    TokenType.OP_MOD: (6, BinaryExpr),
+}
+LITERAL_TYPES = frozenset((
+    TokenType.NUM_INT, TokenType.NUM_FLOAT,
+    TokenType.STRING, TokenType.CHAR_LITERAL,
+    TokenType.TRUE, TokenType.FALSE,
+))
+
+# Puntos de sincronización del modo recover (panic mode), como valores de
+# TokenType. Salen de FIRST&FOLLOW.md: FOLLOW(DECL) para declaraciones y,
+# para miembros y sentencias, la parte de FOLLOW(MIEMBRO)/FOLLOW(SENTENCIA)
+# y FOLLOW(CASO) que no puede continuar una expresión rota (sin id,
+# literales ni '('). ';' y '}' se tratan aparte en synchronize.
+_TIPOS = (
+    TokenType.INT, TokenType.FLOAT, TokenType.DOUBLE,
+    TokenType.CHAR, TokenType.BOOL, TokenType.VOID,
+)
+SYNC_DECL = frozenset(t.value for t in _TIPOS + (TokenType.CLASS,))
+SYNC_MIEMBRO = SYNC_DECL | {
+    TokenType.PUBLIC.value, TokenType.PRIVATE.value, TokenType.LLAVE_DER.value,
+}
+SYNC_SENTENCIA = SYNC_DECL | {t.value for t in (
+    TokenType.IF, TokenType.WHILE, TokenType.FOR, TokenType.SWITCH,
+    TokenType.RETURN, TokenType.CASE, TokenType.DEFAULT, TokenType.LLAVE_DER,
+)}
+
+
+def synchronize(kind_at, start: int, pos: int, stop: frozenset) -> int:
+    """Posición donde reanudar tras un error en pos, dentro del elemento
+    (declaración, miembro o sentencia) que empezó en start.
+
+    kind_at(i) es el TokenType.value del token i. Se salta hasta pasar un
+    ';' o hasta un token de stop; los bloques { } que se saltan (incluidos
+    los abiertos por el elemento antes del error) se descartan enteros. Una
+    '}' suelta que no está en stop se consume. Siempre avanza al menos un
+    token respecto de start, salvo en EOF.
+    """
+    eof = TokenType.EOF.value
+    semicolon = TokenType.PUNTO_COMA.value
+    open_brace = TokenType.LLAVE_IZQ.value
+    close_brace = TokenType.LLAVE_DER.value
+
+    # llaves que el elemento abrió antes del error
+    depth = 0
+    for i in range(start, pos):
+        kind = kind_at(i)
+        if kind == open_brace:
+            depth += 1
+        elif kind == close_brace and depth:
+            depth -= 1
+
+    while True:
+        kind = kind_at(pos)
+        if kind == eof:
+            return pos
+        if depth == 0:
+            if kind in stop and pos > start:
+                return pos
+            if kind == semicolon or kind == close_brace:
+                return pos + 1
+        elif kind == close_brace:
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        if kind == open_brace:
+            depth += 1
+        pos += 1
+
+
 class Parser:
-    def __init__(self, tokens):
+    # motores de expresiones: descenso recursivo por niveles o Pratt
+    EXPR_ENGINES = ("descent", "pratt")
+
+    def __init__(self, tokens, expr_engine: str = "descent", recover: bool = False):
         self.tokens = tokens
         self.pos = 0
+        self._set_expr_engine(expr_engine)
+        # recover=True: los errores de sintaxis se acumulan en errors y el
+        # AST lleva ErrorDecl/ErrorStmt donde estaba el código roto
+        self.recover = recover
+        self.errors: list[str] = []
+
+    def _set_expr_engine(self, expr_engine: str):
+        if expr_engine not in self.EXPR_ENGINES:
+            raise ValueError(f"Unknown expression engine: {expr_engine!r}")
+        self.expr_engine = expr_engine
+        if expr_engine == "pratt":
+            self.expr = self.expr_pratt
 
     # ===== helpers básicos =====
 
@@ -24,6 +127,13 @@ class Parser:
             return self.tokens[-1]
         return self.tokens[self.pos + 1]
 
+    def previous(self):
+        return self.tokens[self.pos - 1]
+
+    def advance(self):
+        self.pos += 1
+        return self.previous()
+
     def check(self, *types):
         if self.pos >= len(self.tokens):
             return False
@@ -31,28 +141,95 @@ class Parser:
 
     def match(self, *types):
         if self.check(*types):
-            self.pos += 1
+            self.advance()
             return True
         return False
 
     def consume(self, type_, msg):
         if self.check(type_):
-            tok = self.current()
-            self.pos += 1
-            return tok
+            return self.advance()
+        raise self._error(msg)
+
+    def spanned(self, node, start_token):
+        """Anota en node su primer token y el último consumido; retorna node"""
+        node.start_token = start_token
+        node.end_token = self.previous()
+        return node
+
+    def _error(self, msg) -> ParserError:
         tok = self.current()
-        raise ParserError(
+        return ParserError(
             f"[L{tok.line},C{tok.column}] {msg}. Found {tok.type} ({tok.lexeme!r})"
         )
 
+    # ===== recuperación de errores =====
+
+    def recover_error(self, error: ParserError, node_class, start: int, stop: frozenset):
+        """Modo recover: registra el error, sincroniza y retorna el nodo de error.
+
+        Sin recover relanza error. start es la posición donde empezó el
+        elemento que falló (ver synchronize).
+        """
+        if not self.recover:
+            raise error
+        self.errors.append(str(error))
+        tok = self.current()
+        tokens = self.tokens
+        self.pos = synchronize(lambda i: tokens[i].type.value, start, self.pos, stop)
+        # cubre los tokens descartados
+        return node_class(tok, str(error), start_token=tokens[start],
+                          end_token=tokens[max(self.pos, start + 1) - 1])
+
     # ===== entrada principal =====
 
     def parse(self) -> Program:
         """Análisis léxico: retorna el AST raíz"""
-        self.consume(TokenType.BOF, "Expected BOF at start of file")
-        program = self.programa()
-        self.consume(TokenType.EOF, "Expected EOF at end of file")
-        return program
+        try:
+            bof = self.consume(TokenType.BOF, "Expected BOF at start of file")
+            program = self.programa()
+            self.consume(TokenType.EOF, "Expected EOF at end of file")
+        except RecursionError:
+            raise self.too_deep_error() from None
+        return self.spanned(program, bof)
+
+    def too_deep_error(self) -> ParserError:
+        tok = self.current()
+        return ParserError(
+            f"[L{tok.line},C{tok.column}] Nesting too deep for the recursive parser "
+            f"(use parse_iterative)"
+        )
+
+    def parse_iterative(self) -> Program:
+        """parse() con pila explícita en lugar de recursión (ver parser_ll1.py).
+
+        Mismo AST y mismos errores; la profundidad de anidamiento solo la
+        limita la memoria. Necesita la secuencia de tokens completa.
+        """
+        from parser_ll1 import LL1Parser
+        parser = LL1Parser(self.tokens, recover=self.recover)
+        try:
+            return parser.parse()
+        finally:
+            self.pos = parser.pos
+            self.errors.extend(parser.errors)
+
+    def parse_declarations(self) -> List[Declaration]:
+        """ListaDecl hasta EOF, sin BOF: para un trozo de declaraciones completas
+        (ver parser_parallel.py y parser_incremental.py)
+        """
+        try:
+            declarations = self.lista_decl()
+            self.consume(TokenType.EOF, "Expected EOF at end of file")
+        except RecursionError:
+            raise self.too_deep_error() from None
+        return declarations
+
+    def parse_parallel(self, workers: int = None) -> Program:
+        """parse() repartido en procesos por declaraciones de nivel superior
+        (ver parser_parallel.py). Necesita la secuencia de tokens completa.
+        """
+        from parser_parallel import parse_parallel
+        return parse_parallel(self, workers)
 
     # ===== gramática alta =====
 
@@ -65,8 +242,19 @@ class Parser:
     # ListaDecl → Decl ListaDecl | ε
     def lista_decl(self) -> List[Declaration]:
         declarations = []
-        while self.es_inicio_decl():
-            decl = self.decl()
+        while True:
+            start = self.pos
+            if self.es_inicio_decl():
+                try:
+                    decl = self.decl()
+                except ParserError as e:
+                    decl = self.recover_error(e, ErrorDecl, start, SYNC_DECL)
+            elif self.recover and not self.check(TokenType.EOF):
+                # basura entre declaraciones: el error que daría parse() en EOF
+                error = self._error("Expected EOF at end of file")
+                decl = self.recover_error(error, ErrorDecl, start, SYNC_DECL)
+            else:
+                break
             if decl:
                 declarations.append(decl)
         return declarations
@@ -98,16 +286,16 @@ class Parser:
         
         # Primer item
         init_expr = self.inicializacion()
-        declarators.append(VarDeclarator(first_id, init_expr, is_array=False))
+        declarators.append(self.spanned(VarDeclarator(first_id, init_expr, is_array=False), first_id))
         
         # Items adicionales
         while self.match(TokenType.COMA):
             id_token = self.consume(TokenType.ID, "Expected identifier after ','")
             init_expr = self.inicializacion()
-            declarators.append(VarDeclarator(id_token, init_expr, is_array=False))
+            declarators.append(self.spanned(VarDeclarator(id_token, init_expr, is_array=False), id_token))
         
         self.consume(TokenType.PUNTO_COMA, "Expected ';' after variable declaration")
-        return VarDecl(type_token, declarators)
+        return self.spanned(VarDecl(type_token, declarators), type_token)
 
     # DeclVarSinPunto → TIPO LISTAID (sin punto y coma, para for init)
     def decl_var_sin_punto(self, type_token: Token, first_id: Token) -> VarDeclSinPunto:
@@ -115,15 +303,15 @@ class Parser:
         
         # Primer item
         init_expr = self.inicializacion()
-        declarators.append(VarDeclarator(first_id, init_expr, is_array=False))
+        declarators.append(self.spanned(VarDeclarator(first_id, init_expr, is_array=False), first_id))
         
         # Items adicionales
         while self.match(TokenType.COMA):
             id_token = self.consume(TokenType.ID, "Expected identifier after ','")
             init_expr = self.inicializacion()
-            declarators.append(VarDeclarator(id_token, init_expr, is_array=False))
+            declarators.append(self.spanned(VarDeclarator(id_token, init_expr, is_array=False), id_token))
         
-        return VarDeclSinPunto(type_token, declarators)
+        return self.spanned(VarDeclSinPunto(type_token, declarators), type_token)
 
     # Inicializacion → OP_ASIG Expr | ε
     def inicializacion(self) -> Optional[Expression]:
@@ -138,7 +326,7 @@ class Parser:
             TokenType.INT, TokenType.FLOAT, TokenType.DOUBLE,
             TokenType.CHAR, TokenType.BOOL, TokenType.VOID
         ):
-            return self.tokens[self.pos - 1]  # Devuelve el token que acabamos de consumir
+            return self.previous()  # Devuelve el token que acabamos de consumir
         raise ParserError(
             "Expected type (int, float, double, char, bool, void)"
         )
@@ -156,7 +344,7 @@ class Parser:
         self.consume(TokenType.PAREN_DER, "Expected ')' after parameters")
         body = self.bloque()
         
-        return FuncDecl(return_type, id_tok, parameters, body)
+        return self.spanned(FuncDecl(return_type, id_tok, parameters, body), return_type)
 
     # Parametros → ParamLista | ε
     def parametros(self) -> List[Param]:
@@ -173,26 +361,32 @@ class Parser:
     def param(self) -> Param:
         type_token = self.tipo()
         name_token = self.consume(TokenType.ID, "Expected parameter name")
-        return Param(type_token, name_token)
+        return self.spanned(Param(type_token, name_token), type_token)
 
     # ===== clases =====
 
     # DeclClase → CLASS ID LLAVE_IZQ ListaMiembros LLAVE_DER
     def decl_clase(self) -> ClassDecl:
-        self.consume(TokenType.CLASS, "Expected 'class'")
+        class_tok = self.consume(TokenType.CLASS, "Expected 'class'")
         class_name = self.consume(TokenType.ID, "Expected class name")
         self.consume(TokenType.LLAVE_IZQ, "Expected '{' after class name")
         
         members = self.lista_miembros()
         
         self.consume(TokenType.LLAVE_DER, "Expected '}' after class body")
-        return ClassDecl(class_name, members)
+        return self.spanned(ClassDecl(class_name, members), class_tok)
 
     # ListaMiembros → Miembro ListaMiembros | ε
     def lista_miembros(self) -> List[ClassMember]:
         members = []
         while self.es_inicio_miembro():
-            member = self.miembro()
+            start = self.pos
+            try:
+                member = self.miembro()
+            except ParserError as e:
+                error_decl = self.recover_error(e, ErrorDecl, start, SYNC_MIEMBRO)
+                member = ClassMember(None, error_decl, start_token=error_decl.start_token,
+                                     end_token=error_decl.end_token)
             if member:
                 members.append(member)
         return members
@@ -206,6 +400,7 @@ class Parser:
 
     # Miembro → ModificadorAcceso DeclVar | ModificadorAcceso DeclFunc
     def miembro(self) -> Optional[ClassMember]:
+        start_tok = self.current()
         access_mod = self.modificador_acceso()
         type_token = self.tipo()
         id_tok = self.consume(TokenType.ID, "Expected identifier in class member")
@@ -215,31 +410,35 @@ class Parser:
         else:
             decl = self.decl_var_resto(type_token, id_tok)
         
-        return ClassMember(access_mod, decl)
+        return self.spanned(ClassMember(access_mod, decl), start_tok)
 
     # ModificadorAcceso → PUBLIC | PRIVATE | ε
     def modificador_acceso(self) -> Optional[Token]:
         """Retorna el token del modificador o None"""
         if self.match(TokenType.PUBLIC):
-            return self.tokens[self.pos - 1]
+            return self.previous()
         if self.match(TokenType.PRIVATE):
-            return self.tokens[self.pos - 1]
+            return self.previous()
         return None
 
     # ===== bloques y sentencias =====
 
     # Bloque → LLAVE_IZQ ListaSentencias LLAVE_DER
     def bloque(self) -> BlockStmt:
-        self.consume(TokenType.LLAVE_IZQ, "Expected '{'")
+        open_tok = self.consume(TokenType.LLAVE_IZQ, "Expected '{'")
         statements = self.lista_sentencias()
         self.consume(TokenType.LLAVE_DER, "Expected '}'")
-        return BlockStmt(statements)
+        return self.spanned(BlockStmt(statements), open_tok)
 
     # ListaSentencias → Sentencia ListaSentencias | ε
     def lista_sentencias(self) -> List[Statement]:
         statements = []
         while self.es_inicio_sentencia():
-            stmt = self.sentencia()
+            start = self.pos
+            try:
+                stmt = self.sentencia()
+            except ParserError as e:
+                stmt = self.recover_error(e, ErrorStmt, start, SYNC_SENTENCIA)
             if stmt:
                 statements.append(stmt)
         return statements
@@ -270,7 +469,7 @@ class Parser:
                 # Es una declaración de arreglo
                 size_expr = self.expr()
                 self.consume(TokenType.CORCHETE_DER, "Expected ']' after array size")
-                declarators.append(VarDeclarator(id_tok, None, is_array=True))
+                declarators.append(self.spanned(VarDeclarator(id_tok, None, is_array=True), id_tok))
                 
                 # Mas items si hay comas
                 while self.match(TokenType.COMA):
@@ -280,7 +479,7 @@ class Parser:
                         self.expr()
                         self.consume(TokenType.CORCHETE_DER, "Expected ']'")
                         is_arr = True
-                    declarators.append(VarDeclarator(id_token, None, is_array=is_arr))
+                    declarators.append(self.spanned(VarDeclarator(id_token, None, is_array=is_arr), id_token))
                 
                 self.consume(TokenType.PUNTO_COMA, "Expected ';' after array declaration")
             else:
@@ -288,20 +487,20 @@ class Parser:
                 init_expr = None
                 if self.match(TokenType.OP_ASIG):
                     init_expr = self.expr()
-                declarators.append(VarDeclarator(id_tok, init_expr, is_array=False))
+                declarators.append(self.spanned(VarDeclarator(id_tok, init_expr, is_array=False), id_tok))
                 
                 while self.match(TokenType.COMA):
                     id_token = self.consume(TokenType.ID, "Expected identifier")
                     init_expr = None
                     if self.match(TokenType.OP_ASIG):
                         init_expr = self.expr()
-                    declarators.append(VarDeclarator(id_token, init_expr, is_array=False))
+                    declarators.append(self.spanned(VarDeclarator(id_token, init_expr, is_array=False), id_token))
                 
                 self.consume(TokenType.PUNTO_COMA, "Expected ';' after variable declaration")
             
             # Retornar como VarDeclStmt
-            var_decl = VarDecl(type_token, declarators)
-            return VarDeclStmt(var_decl)
+            var_decl = self.spanned(VarDecl(type_token, declarators), type_token)
+            return self.spanned(VarDeclStmt(var_decl), type_token)
         
         elif self.check(TokenType.LLAVE_IZQ):
             return self.bloque()
@@ -317,15 +516,16 @@ class Parser:
             return self.sentencia_ret()
         else:
             # SentenciaExpr → Expr PUNTO_COMA | PUNTO_COMA
+            start_tok = self.current()
             if self.match(TokenType.PUNTO_COMA):
-                return ExprStmt(None)
+                return self.spanned(ExprStmt(None), start_tok)
             expr_node = self.expr()
             self.consume(TokenType.PUNTO_COMA, "Expected ';' after expression")
-            return ExprStmt(expr_node)
+            return self.spanned(ExprStmt(expr_node), start_tok)
 
     # if / else
     def sentencia_sel(self) -> IfStmt:
-        self.consume(TokenType.IF, "Expected 'if'")
+        if_tok = self.consume(TokenType.IF, "Expected 'if'")
         self.consume(TokenType.PAREN_IZQ, "Expected '(' after 'if'")
         condition = self.expr()
         self.consume(TokenType.PAREN_DER, "Expected ')' after if condition")
@@ -335,21 +535,21 @@ class Parser:
         if self.match(TokenType.ELSE):
             else_stmt = self.sentencia()
         
-        return IfStmt(condition, then_stmt, else_stmt)
+        return self.spanned(IfStmt(condition, then_stmt, else_stmt), if_tok)
 
     # while
     def sentencia_while(self) -> WhileStmt:
-        self.consume(TokenType.WHILE, "Expected 'while'")
+        while_tok = self.consume(TokenType.WHILE, "Expected 'while'")
         self.consume(TokenType.PAREN_IZQ, "Expected '(' after 'while'")
         condition = self.expr()
         self.consume(TokenType.PAREN_DER, "Expected ')' after while condition")
         body = self.sentencia()
         
-        return WhileStmt(condition, body)
+        return self.spanned(WhileStmt(condition, body), while_tok)
 
     # for
     def sentencia_for(self) -> ForStmt:
-        self.consume(TokenType.FOR, "Expected 'for'")
+        for_tok = self.consume(TokenType.FOR, "Expected 'for'")
         self.consume(TokenType.PAREN_IZQ, "Expected '(' after 'for'")
         
         # ForInit puede ser: Expr, DeclVar (sin punto y coma), o vacío
@@ -366,7 +566,7 @@ class Parser:
                 init_expr = None
                 if self.match(TokenType.OP_ASIG):
                     init_expr = self.expr()
-                declarators = [VarDeclarator(id_tok, init_expr, is_array=False)]
+                declarators = [self.spanned(VarDeclarator(id_tok, init_expr, is_array=False), id_tok)]
                 
                 # Más items si hay comas
                 while self.match(TokenType.COMA):
@@ -374,9 +574,9 @@ class Parser:
                     init_expr = None
                     if self.match(TokenType.OP_ASIG):
                         init_expr = self.expr()
-                    declarators.append(VarDeclarator(id_token, init_expr, is_array=False))
+                    declarators.append(self.spanned(VarDeclarator(id_token, init_expr, is_array=False), id_token))
                 
-                init = VarDeclSinPunto(type_token, declarators)
+                init = self.spanned(VarDeclSinPunto(type_token, declarators), type_token)
             else:
                 # Es una expresión normal
                 init = self.expr()
@@ -395,11 +595,11 @@ class Parser:
         
         body = self.sentencia()
         
-        return ForStmt(init, condition, update, body)
+        return self.spanned(ForStmt(init, condition, update, body), for_tok)
 
     # switch
     def sentencia_switch(self) -> SwitchStmt:
-        self.consume(TokenType.SWITCH, "Expected 'switch'")
+        switch_tok = self.consume(TokenType.SWITCH, "Expected 'switch'")
         self.consume(TokenType.PAREN_IZQ, "Expected '(' after 'switch'")
         expr_node = self.expr()
         self.consume(TokenType.PAREN_DER, "Expected ')' after switch expr")
@@ -409,7 +609,7 @@ class Parser:
         
         self.consume(TokenType.LLAVE_DER, "Expected '}' after switch body")
         
-        return SwitchStmt(expr_node, cases)
+        return self.spanned(SwitchStmt(expr_node, cases), switch_tok)
 
     # ListaCasos → Caso ListaCasos | ε
     def lista_casos(self) -> List[CaseStmt]:
@@ -422,28 +622,29 @@ class Parser:
 
     # Caso → case Expr PUNTO_COMA ListaSentencias | default PUNTO_COMA ListaSentencias
     def caso(self) -> Optional[CaseStmt]:
+        start_tok = self.current()
         if self.match(TokenType.CASE):
             case_expr = self.expr()
             self.consume(TokenType.PUNTO_COMA, "Expected ':' after case expression")
             statements = self.lista_sentencias()
-            return CaseStmt(case_expr, statements)
+            return self.spanned(CaseStmt(case_expr, statements), start_tok)
         elif self.match(TokenType.DEFAULT):
             self.consume(TokenType.PUNTO_COMA, "Expected ':' after default")
             statements = self.lista_sentencias()
-            return CaseStmt(None, statements)
+            return self.spanned(CaseStmt(None, statements), start_tok)
         return None
 
     # return
     # SentenciaRet → RETURN Expr PUNTO_COMA | RETURN PUNTO_COMA
     def sentencia_ret(self) -> ReturnStmt:
-        self.consume(TokenType.RETURN, "Expected 'return'")
+        return_tok = self.consume(TokenType.RETURN, "Expected 'return'")
         
         return_expr = None
         if not self.check(TokenType.PUNTO_COMA):
             return_expr = self.expr()
         
         self.consume(TokenType.PUNTO_COMA, "Expected ';' after 'return'")
-        return ReturnStmt(return_expr)
+        return self.spanned(ReturnStmt(return_expr), return_tok)
 
     # ===== expresiones =====
 
@@ -460,7 +661,7 @@ class Parser:
             # left debe ser IdentifierExpr o IndexExpr
             if isinstance(left, (IdentifierExpr, IndexExpr)):
                 value = self.expr_asign()  # Recursivo para asignación derecha
-                return AssignExpr(left, value)
+                return self.spanned(AssignExpr(left, value), left.start_token)
             else:
                 raise ParserError(
                     f"[L{self.current().line}] Invalid assignment target"
@@ -475,7 +676,7 @@ class Parser:
             op_tok = self.current()
             self.match(TokenType.OP_OR)
             right = self.expr_and()
-            left = LogicalOrExpr(left, op_tok, right)
+            left = self.spanned(LogicalOrExpr(left, op_tok, right), left.start_token)
         return left
 
     # ExprAnd → ExprIgual (OP_AND ExprIgual)*
@@ -485,7 +686,7 @@ class Parser:
             op_tok = self.current()
             self.match(TokenType.OP_AND)
             right = self.expr_igual()
-            left = LogicalAndExpr(left, op_tok, right)
+            left = self.spanned(LogicalAndExpr(left, op_tok, right), left.start_token)
         return left
 
     # ExprIgual → ExprRel ( (OP_IGUAL | OP_DISTINTO) ExprRel )*
@@ -495,7 +696,7 @@ class Parser:
             op_tok = self.current()
             self.match(TokenType.OP_IGUAL, TokenType.OP_DISTINTO)
             right = self.expr_rel()
-            left = EqualityExpr(left, op_tok, right)
+            left = self.spanned(EqualityExpr(left, op_tok, right), left.start_token)
         return left
 
     # ExprRel → ExprAditiva (relop ExprAditiva)*
@@ -511,7 +712,7 @@ class Parser:
                 TokenType.OP_MAYOR, TokenType.OP_MAYOR_IG
             )
             right = self.expr_aditiva()
-            left = RelationalExpr(left, op_tok, right)
+            left = self.spanned(RelationalExpr(left, op_tok, right), left.start_token)
         return left
 
     # ExprAditiva → Term ( (OP_SUMA | OP_RESTA) Term )*
@@ -521,7 +722,7 @@ class Parser:
             op_tok = self.current()
             self.match(TokenType.OP_SUMA, TokenType.OP_RESTA)
             right = self.term()
-            left = BinaryExpr(left, op_tok, right)
+            left = self.spanned(BinaryExpr(left, op_tok, right), left.start_token)
         return left
 
     # Term → Factor ( (OP_MULT | OP_DIV | OP_MOD) Factor )*
@@ -531,27 +732,27 @@ class Parser:
             op_tok = self.current()
             self.match(TokenType.OP_MULT, TokenType.OP_DIV, TokenType.OP_MOD)
             right = self.factor()
-            left = BinaryExpr(left, op_tok, right)
+            left = self.spanned(BinaryExpr(left, op_tok, right), left.start_token)
         return left
 
     # Factor → OP_NOT Factor | OP_RESTA Factor | OP_INC ExprPostfija | OP_DEC ExprPostfija | ExprPostfija
     def factor(self) -> Expression:
         if self.match(TokenType.OP_NOT):
-            op_tok = self.tokens[self.pos - 1]
+            op_tok = self.previous()
             operand = self.factor()
-            return UnaryExpr(op_tok, operand, is_prefix=True)
+            return self.spanned(UnaryExpr(op_tok, operand, is_prefix=True), op_tok)
         elif self.match(TokenType.OP_RESTA):
-            op_tok = self.tokens[self.pos - 1]
+            op_tok = self.previous()
             operand = self.factor()
-            return UnaryExpr(op_tok, operand, is_prefix=True)
+            return self.spanned(UnaryExpr(op_tok, operand, is_prefix=True), op_tok)
         elif self.match(TokenType.OP_INC):
-            op_tok = self.tokens[self.pos - 1]
+            op_tok = self.previous()
             operand = self.expr_postfija()
-            return UnaryExpr(op_tok, operand, is_prefix=True)
+            return self.spanned(UnaryExpr(op_tok, operand, is_prefix=True), op_tok)
         elif self.match(TokenType.OP_DEC):
-            op_tok = self.tokens[self.pos - 1]
+            op_tok = self.previous()
             operand = self.expr_postfija()
-            return UnaryExpr(op_tok, operand, is_prefix=True)
+            return self.spanned(UnaryExpr(op_tok, operand, is_prefix=True), op_tok)
         else:
             return self.expr_postfija()
 
@@ -560,11 +761,11 @@ class Parser:
         expr_node = self.expr_primaria()
         
         if self.match(TokenType.OP_INC):
-            op_tok = self.tokens[self.pos - 1]
-            return PostfixExpr(expr_node, op_tok)
+            op_tok = self.previous()
+            return self.spanned(PostfixExpr(expr_node, op_tok), expr_node.start_token)
         elif self.match(TokenType.OP_DEC):
-            op_tok = self.tokens[self.pos - 1]
-            return PostfixExpr(expr_node, op_tok)
+            op_tok = self.previous()
+            return self.spanned(PostfixExpr(expr_node, op_tok), expr_node.start_token)
         
         return expr_node
 
@@ -576,12 +777,12 @@ class Parser:
             TokenType.STRING, TokenType.CHAR_LITERAL,
             TokenType.TRUE, TokenType.FALSE
         ):
-            lit_tok = self.tokens[self.pos - 1]
-            return LiteralExpr(lit_tok)
+            lit_tok = self.previous()
+            return self.spanned(LiteralExpr(lit_tok), lit_tok)
         
         # Identificador (puede ser var, func call, o array access)
         if self.match(TokenType.ID):
-            id_tok = self.tokens[self.pos - 1]
+            id_tok = self.previous()
             
             # Llamada a función
             if self.match(TokenType.PAREN_IZQ):
@@ -589,23 +790,24 @@ class Parser:
                 if not self.check(TokenType.PAREN_DER):
                     args = self.lista_args()
                 self.consume(TokenType.PAREN_DER, "Expected ')' after function arguments")
-                return CallExpr(id_tok, args)
+                return self.spanned(CallExpr(id_tok, args), id_tok)
             
             # Acceso a arreglo
             elif self.match(TokenType.CORCHETE_IZQ):
                 index_expr = self.expr()
                 self.consume(TokenType.CORCHETE_DER, "Expected ']' after array index")
-                return IndexExpr(id_tok, index_expr)
+                return self.spanned(IndexExpr(id_tok, index_expr), id_tok)
             
             # Solo identificador
             else:
-                return IdentifierExpr(id_tok)
+                return self.spanned(IdentifierExpr(id_tok), id_tok)
         
         # Expresión agrupada
         if self.match(TokenType.PAREN_IZQ):
+            open_tok = self.previous()
             expr_node = self.expr()
             self.consume(TokenType.PAREN_DER, "Expected ')' after expression")
-            return GroupingExpr(expr_node)
+            return self.spanned(GroupingExpr(expr_node), open_tok)
         
         tok = self.current()
         raise ParserError(
@@ -620,6 +822,71 @@ class Parser:
             args.append(self.expr())
         return args
 
+    # ===== motor "pratt" =====
+
+    def expr_pratt(self) -> Expression:
+        """expr() por precedence climbing con BINARY_OPERATORS.
+
+        Mismo AST y mismos errores que expr_asign; cada operador binario
+        cuesta una llamada en vez de recorrer los siete niveles de
+        precedencia por cada operando.
+        """
+        left = self.binary_pratt(1)
+        if self.match(TokenType.OP_ASIG):
+            if isinstance(left, (IdentifierExpr, IndexExpr)):
+                return self.spanned(AssignExpr(left, self.expr_pratt()), left.start_token)
+            raise ParserError(
+                f"[L{self.current().line}] Invalid assignment target"
+            )
+        return left
+
+    def binary_pratt(self, min_power: int) -> Expression:
+        """Operando seguido de operadores con potencia >= min_power"""
+        left = self.operand_pratt()
+        operators = BINARY_OPERATORS
+        while True:
+            op_tok = self.current()
+            entry = operators.get(op_tok.type)
+            if entry is None or entry[0] < min_power:
+                return left
+            power, node_class = entry
+            self.advance()
+            right = self.binary_pratt(power + 1)
+            left = self.spanned(node_class(left, op_tok, right), left.start_token)
+
+    def operand_pratt(self) -> Expression:
+        """factor() en una sola llamada para los casos comunes.
+
+        Prefijos, identificador o literal y postfijo se resuelven comparando
+        el tipo del token; llamadas, arreglos, agrupación y errores siguen
+        por expr_primaria, así el resultado es el mismo.
+        """
+        tok = self.current()
+        type_ = tok.type
+        if type_ is TokenType.OP_NOT or type_ is TokenType.OP_RESTA:
+            self.advance()
+            return self.spanned(UnaryExpr(tok, self.operand_pratt(), is_prefix=True), tok)
+        if type_ is TokenType.OP_INC or type_ is TokenType.OP_DEC:
+            self.advance()
+            return self.spanned(UnaryExpr(tok, self.expr_postfija(), is_prefix=True), tok)
+        if type_ is TokenType.ID:
+            following = self.peek_next().type
+            if following is TokenType.PAREN_IZQ or following is TokenType.CORCHETE_IZQ:
+                node = self.expr_primaria()
+            else:
+                self.advance()
+                node = IdentifierExpr(tok, start_token=tok, end_token=tok)
+        elif type_ in LITERAL_TYPES:
+            self.advance()
+            node = LiteralExpr(tok, start_token=tok, end_token=tok)
+        else:
+            node = self.expr_primaria()
+        op_tok = self.current()
+        if op_tok.type is TokenType.OP_INC or op_tok.type is TokenType.OP_DEC:
+            self.advance()
+            return self.spanned(PostfixExpr(node, op_tok), node.start_token)
+        return node
+
     def es_inicio_expr(self):
         return self.check(
             TokenType.NUM_INT, TokenType.NUM_FLOAT,
@@ -629,3 +896,61 @@ class Parser:
             TokenType.OP_NOT, TokenType.OP_RESTA,
             TokenType.OP_INC, TokenType.OP_DEC
         )
+
+
+class StreamingParser(Parser):
+    """Parser que consume tokens de un iterable (p. ej. Lexer.iter_tokens()).
+
+    Solo guarda el token anterior y un buffer de lookahead de dos tokens
+    (current / peek_next); los tokens consumidos se descartan, así la
+    memoria no crece con el tamaño del flujo de tokens. Por eso no tiene
+    modo recover: sincronizar necesita volver a mirar los tokens del
+    elemento que falló.
+    """
+
+    def __init__(self, tokens: Iterable[Token], expr_engine: str = "descent"):
+        self.tokens = None
+        self.pos = 0
+        self._set_expr_engine(expr_engine)
+        self.recover = False
+        self.errors: list[str] = []
+        self._stream = iter(tokens)
+        self._buffer = deque()
+        self._previous = None
+        self._last = None  # último token leído (EOF), como tokens[-1]
+        self._fill(2)
+
+    def _fill(self, size):
+        while len(self._buffer) < size:
+            tok = next(self._stream, None)
+            if tok is None:
+                return
+            self._buffer.append(tok)
+            self._last = tok
+
+    # ===== helpers básicos =====
+
+    def current(self):
+        if not self._buffer:
+            return self._last
+        return self._buffer[0]
+
+    def peek_next(self):
+        self._fill(2)
+        if len(self._buffer) < 2:
+            return self._last
+        return self._buffer[1]
+
+    def previous(self):
+        return self._previous
+
+    def advance(self):
+        self._previous = self._buffer.popleft()
+        self.pos += 1
+        self._fill(1)
+        return self._previous
+
+    def check(self, *types):
+        if not self._buffer:
+            return False
+        return self._buffer[0].type in types
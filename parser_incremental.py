@@ -0,0 +1,152 @@
+# parser_incremental.py
+from typing import List
+
+from tokens import TokenType, Token
+from ast_nodes import Program
+from parser import Parser, ParserError
+from parser_parallel import split_declarations
+
+
+def _span_key(span: List[Token]) -> tuple:
+    """Contenido de un trozo de tokens con líneas relativas a su primer token"""
+    first_line = span[0].line
+    return tuple([(tok.type, tok.lexeme, tok.line - first_line, tok.column, tok.name_id)
+                  for tok in span])
+
+
+class _Anchor:
+    """Línea actual del primer token de un trozo en la caché"""
+    __slots__ = ("line",)
+
+    def __init__(self, line: int):
+        self.line = line
+
+
+class SpanToken(Token):
+    """Copia de un Token cuya línea es relativa al primer token de su trozo.
+
+    Los tokens de un trozo comparten un _Anchor: si el trozo se mueve de
+    línea, se cambia solo anchor.line.
+    """
+
+    def __init__(self, tok: Token, anchor: _Anchor):
+        self.type = tok.type
+        self.lexeme = tok.lexeme
+        self.column = tok.column
+        self.name_id = tok.name_id
+        self.anchor = anchor
+        self.offset = tok.line - anchor.line
+
+    @property
+    def line(self) -> int:
+        return self.anchor.line + self.offset
+
+
+class IncrementalParser:
+    """Parser que, entre una llamada y la siguiente, reutiliza las
+    declaraciones de nivel superior cuyo texto no cambió.
+
+    Cada parse() corta los tokens en declaraciones de nivel superior por
+    profundidad de llaves (como parse_parallel) y busca cada trozo en la
+    caché por el hash de su contenido: tipo, lexema, columna, id de nombre
+    y línea relativa al primer token. Si está, se reutilizan los mismos
+    objetos FuncDecl/ClassDecl/VarDecl de la llamada anterior. Los trozos
+    nuevos o editados se parsean solos, lo que da el mismo AST y los
+    mismos errores que Parser.parse().
+
+    Cada trozo se parsea sobre una copia de sus tokens (SpanToken), que
+    pasa a ser del parser: los tokens del llamador no se modifican nunca.
+    Las líneas de la copia son relativas al primer token del trozo, así
+    un trozo que solo se movió de línea se corrige con una asignación. El
+    AST retornado apunta a esas copias; self.tokens es la secuencia
+    completa (BOF, copias, EOF), la que se le pasa p. ej. a
+    ASTArena.from_tree. Las declaraciones reutilizadas son compartidas
+    con el AST de la llamada anterior y muestran siempre las líneas de la
+    última versión.
+
+    Para reutilizar identificadores, el Lexer de cada versión debe
+    compartir la StringTable (Lexer(fuente, strings=...)). Solo se guardan
+    en la caché los trozos sin errores, así los mensajes salen siempre de
+    un análisis nuevo.
+    """
+
+    def __init__(self, expr_engine: str = "descent", recover: bool = False):
+        self.expr_engine = expr_engine
+        self.recover = recover
+        self.errors: list[str] = []
+        # tokens del último AST retornado
+        self.tokens: List[Token] = []
+        # hash del contenido -> [(contenido, _Anchor, copias de los tokens, declaraciones)]
+        self.cache: dict[int, list] = {}
+        # trozos reutilizados / parseados en la última llamada
+        self.reused = 0
+        self.reparsed = 0
+
+    def parse(self, tokens: List[Token]) -> Program:
+        """Análisis sintáctico incremental: retorna el AST raíz"""
+        self.errors = []
+        self.reused = self.reparsed = 0
+        if tokens[-1].type != TokenType.EOF:
+            self.tokens = tokens
+            return self._parser(tokens).parse()
+        self._parser(tokens).consume(TokenType.BOF, "Expected BOF at start of file")
+
+        end = len(tokens) - 1
+        kinds = [tok.type.value for tok in tokens]
+        cuts = [1] + [bound for bound in split_declarations(kinds, 1, end) if bound < end]
+        cuts.append(end)
+        eof = tokens[end]
+
+        cache = {}
+        declarations = []
+        owned = [tokens[0]]
+        try:
+            for start, stop in zip(cuts, cuts[1:]):
+                if start == stop:
+                    continue
+                span = tokens[start:stop]
+                content = _span_key(span)
+                key = hash(content)
+                entry = self._take(key, content)
+                if entry is None:
+                    self.reparsed += 1
+                    anchor = _Anchor(span[0].line)
+                    copies = [SpanToken(tok, anchor) for tok in span]
+                    parser = self._parser(copies + [eof])
+                    span_declarations = parser.parse_declarations()
+                    if parser.errors:
+                        self.errors.extend(parser.errors)
+                    else:
+                        entry = (content, anchor, copies, span_declarations)
+                else:
+                    self.reused += 1
+                    _, anchor, copies, span_declarations = entry
+                    anchor.line = span[0].line
+                declarations.extend(span_declarations)
+                owned.extend(copies)
+                if entry is not None:
+                    cache.setdefault(key, []).append(entry)
+        except ParserError:
+            # versión a medio editar: se conserva también lo no visitado
+            for key, entries in self.cache.items():
+                cache.setdefault(key, []).extend(entries)
+            raise
+        finally:
+            self.cache = cache
+        owned.append(eof)
+        self.tokens = owned
+        return Program(declarations, start_token=tokens[0], end_token=eof)
+
+    def _parser(self, tokens: List[Token]) -> Parser:
+        return Parser(tokens, self.expr_engine, self.recover)
+
+    def _take(self, key: int, content: tuple):
+        """Saca de la caché la entrada con el mismo contenido, o None"""
+        entries = self.cache.get(key)
+        if not entries:
+            return None
+        for i, entry in enumerate(entries):
+            if entry[0] == content:
+                del entries[i]
+                return entry
+        return None
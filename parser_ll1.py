@@ -0,0 +1,831 @@
+# parser_ll1.py
+from array import array
+
+from tokens import TokenType, TokenBuffer
+from ast_nodes import *
+from parser import ParserError, SYNC_DECL, SYNC_MIEMBRO, SYNC_SENTENCIA, synchronize
+
+
+# Motor LL(1) dirigido por tabla. La gramática es la de GRAMATICA.md /
+# tabla_pred.md, escrita tal como la acepta Parser (factorizada por la
+# izquierda y con las mismas decisiones), más acciones semánticas que arman
+# los mismos nodos de ast_nodes sobre una pila de valores.
+#
+# Símbolos de una producción:
+#   "NOMBRE"         no terminal
+#   _t(tipo, msg)    terminal que se descarta
+#   _k(tipo, msg)    terminal que se apila como valor (el token)
+#   función          acción semántica: recibe el LL1Parser
+#
+# Cada no terminal es una lista de producciones. Una producción se predice
+# con el FIRST de su lado derecho, o con un conjunto explícito (_on). La
+# producción ε (o la marcada con _default, o la única) se elige con
+# cualquier otro token, igual que los `while self.check(...)` y
+# `if not self.check(...)` de Parser: el error sale después, en el terminal
+# que no coincide, con el mismo mensaje.
+
+
+def _t(type_: TokenType, msg: str = None):
+    return ("t", type_, msg, False)
+
+
+def _k(type_: TokenType, msg: str = None):
+    return ("t", type_, msg, True)
+
+
+def _on(types, *rhs):
+    return ("on", tuple(types), list(rhs))
+
+
+def _default(*rhs):
+    return ("default", None, list(rhs))
+
+
+TIPOS = (
+    TokenType.INT, TokenType.FLOAT, TokenType.DOUBLE,
+    TokenType.CHAR, TokenType.BOOL, TokenType.VOID,
+)
+# Parser.sentencia y el init del for no aceptan `void` como declaración
+TIPOS_VAR = TIPOS[:-1]
+LITERALES = (
+    TokenType.NUM_INT, TokenType.NUM_FLOAT,
+    TokenType.STRING, TokenType.CHAR_LITERAL,
+    TokenType.TRUE, TokenType.FALSE,
+)
+
+
+# ===== acciones semánticas =====
+
+def _a_list(p):
+    p.values.append([])
+
+
+def _a_none(p):
+    p.values.append(None)
+
+
+def _a_append(p):
+    item = p.values.pop()
+    p.values[-1].append(item)
+
+
+def _a_list1(p):
+    p.values.append([p.values.pop()])
+
+
+def _a_drop(p):
+    p.values.pop()
+
+
+# Cada nodo se anota con p.spanned(nodo, primer token): el último es el
+# último terminal consumido. Los terminales con los que empieza un nodo se
+# apilan (_k) aunque el nodo no los guarde, para tener su primer token.
+
+def _a_program(p):
+    declarations = p.values.pop()
+    p.values.append(p.spanned(Program(declarations), p.values.pop()))
+
+
+def _a_declarator(p):
+    init = p.values.pop()
+    name = p.values.pop()
+    p.values.append(p.spanned(VarDeclarator(name, init, is_array=False), name))
+
+
+def _a_array_declarator(p):
+    name = p.values.pop()
+    p.values.append(p.spanned(VarDeclarator(name, None, is_array=True), name))
+
+
+def _a_plain_declarator(p):
+    name = p.values.pop()
+    p.values.append(p.spanned(VarDeclarator(name, None, is_array=False), name))
+
+
+def _a_var_decl(p):
+    declarators = p.values.pop()
+    type_token = p.values.pop()
+    p.values.append(p.spanned(VarDecl(type_token, declarators), type_token))
+
+
+def _a_var_decl_stmt(p):
+    declarators = p.values.pop()
+    type_token = p.values.pop()
+    var_decl = p.spanned(VarDecl(type_token, declarators), type_token)
+    p.values.append(p.spanned(VarDeclStmt(var_decl), type_token))
+
+
+def _a_var_decl_sin_punto(p):
+    declarators = p.values.pop()
+    type_token = p.values.pop()
+    p.values.append(p.spanned(VarDeclSinPunto(type_token, declarators), type_token))
+
+
+def _a_func_decl(p):
+    values = p.values
+    body = values.pop()
+    parameters = values.pop()
+    name = values.pop()
+    return_type = values.pop()
+    values.append(p.spanned(FuncDecl(return_type, name, parameters, body), return_type))
+
+
+def _a_param(p):
+    name = p.values.pop()
+    type_token = p.values.pop()
+    p.values.append(p.spanned(Param(type_token, name), type_token))
+
+
+def _a_class_decl(p):
+    members = p.values.pop()
+    name = p.values.pop()
+    p.values.append(p.spanned(ClassDecl(name, members), p.values.pop()))
+
+
+def _a_class_member(p):
+    decl = p.values.pop()
+    access_modifier = p.values.pop()
+    start = decl.start_token if access_modifier is None else access_modifier
+    p.values.append(p.spanned(ClassMember(access_modifier, decl), start))
+
+
+def _a_block(p):
+    statements = p.values.pop()
+    p.values.append(p.spanned(BlockStmt(statements), p.values.pop()))
+
+
+def _a_empty_stmt(p):
+    p.values.append(p.spanned(ExprStmt(None), p.values.pop()))
+
+
+def _a_expr_stmt(p):
+    expression = p.values.pop()
+    p.values.append(p.spanned(ExprStmt(expression), expression.start_token))
+
+
+def _a_if(p):
+    values = p.values
+    else_stmt = values.pop()
+    then_stmt = values.pop()
+    condition = values.pop()
+    values.append(p.spanned(IfStmt(condition, then_stmt, else_stmt), values.pop()))
+
+
+def _a_while(p):
+    body = p.values.pop()
+    condition = p.values.pop()
+    p.values.append(p.spanned(WhileStmt(condition, body), p.values.pop()))
+
+
+def _a_for(p):
+    values = p.values
+    body = values.pop()
+    update = values.pop()
+    condition = values.pop()
+    init = values.pop()
+    values.append(p.spanned(ForStmt(init, condition, update, body), values.pop()))
+
+
+def _a_switch(p):
+    cases = p.values.pop()
+    expr = p.values.pop()
+    p.values.append(p.spanned(SwitchStmt(expr, cases), p.values.pop()))
+
+
+def _a_case(p):
+    statements = p.values.pop()
+    case_expr = p.values.pop()
+    p.values.append(p.spanned(CaseStmt(case_expr, statements), p.values.pop()))
+
+
+def _a_return(p):
+    return_expr = p.values.pop()
+    p.values.append(p.spanned(ReturnStmt(return_expr), p.values.pop()))
+
+
+def _a_assign_target(p):
+    # mismo chequeo (y mensaje) que Parser.expr_asign, antes del lado derecho
+    if not isinstance(p.values[-1], (IdentifierExpr, IndexExpr)):
+        raise ParserError(f"[L{p.current().line}] Invalid assignment target")
+
+
+def _a_assign(p):
+    value = p.values.pop()
+    target = p.values.pop()
+    p.values.append(p.spanned(AssignExpr(target, value), target.start_token))
+
+
+def _binary(node_class):
+    def action(p):
+        values = p.values
+        right = values.pop()
+        operator = values.pop()
+        left = values.pop()
+        values.append(p.spanned(node_class(left, operator, right), left.start_token))
+    action.__name__ = f"_a_{node_class.__name__}"
+    return action
+
+
+_a_logical_or = _binary(LogicalOrExpr)
+_a_logical_and = _binary(LogicalAndExpr)
+_a_equality = _binary(EqualityExpr)
+_a_relational = _binary(RelationalExpr)
+_a_binary = _binary(BinaryExpr)
+
+
+def _a_unary(p):
+    operand = p.values.pop()
+    operator = p.values.pop()
+    p.values.append(p.spanned(UnaryExpr(operator, operand, is_prefix=True), operator))
+
+
+def _a_postfix(p):
+    operator = p.values.pop()
+    operand = p.values.pop()
+    p.values.append(p.spanned(PostfixExpr(operand, operator), operand.start_token))
+
+
+def _a_call(p):
+    args = p.values.pop()
+    func_token = p.values.pop()
+    p.values.append(p.spanned(CallExpr(func_token, args), func_token))
+
+
+def _a_index(p):
+    index = p.values.pop()
+    array_token = p.values.pop()
+    p.values.append(p.spanned(IndexExpr(array_token, index), array_token))
+
+
+def _a_identifier(p):
+    tok = p.values.pop()
+    p.values.append(IdentifierExpr(tok, start_token=tok, end_token=tok))
+
+
+def _a_literal(p):
+    tok = p.values.pop()
+    p.values.append(LiteralExpr(tok, start_token=tok, end_token=tok))
+
+
+def _a_grouping(p):
+    expression = p.values.pop()
+    p.values.append(p.spanned(GroupingExpr(expression), p.values.pop()))
+
+
+# ===== modo recover =====
+# Cada elemento de ListaDecl / ListaMiembros / ListaSentencias abre un
+# marco de recuperación (los mismos puntos donde Parser captura el
+# ParserError) y _a_item lo cierra al añadirlo a la lista.
+
+def _error_member(token, message, start_token, end_token):
+    error_decl = ErrorDecl(token, message, start_token=start_token, end_token=end_token)
+    return ClassMember(None, error_decl, start_token=start_token, end_token=end_token)
+
+
+def _frame(stop, node_class):
+    def action(p):
+        # la pila queda [..., Lista, _a_item, Elemento]: al recuperar se
+        # vuelve a [..., Lista, _a_item] con el nodo de error como valor
+        if p.recover:
+            p.frames.append((len(p.stack) - 1, len(p.values), p.pos, stop, node_class))
+    action.__name__ = f"_a_frame_{node_class.__name__}"
+    return action
+
+
+_a_decl_frame = _frame(SYNC_DECL, ErrorDecl)
+_a_member_frame = _frame(SYNC_MIEMBRO, _error_member)
+_a_stmt_frame = _frame(SYNC_SENTENCIA, ErrorStmt)
+
+
+def _a_item(p):
+    if p.recover:
+        p.frames.pop()
+    item = p.values.pop()
+    p.values[-1].append(item)
+
+
+# ===== gramática =====
+
+GRAMMAR = {
+    # S → BOF Programa EOF ; Programa → ListaDecl
+    "S": [
+        [_k(TokenType.BOF, "Expected BOF at start of file"), _a_list, "LISTADECL",
+         _t(TokenType.EOF, "Expected EOF at end of file"), _a_program],
+    ],
+    "LISTADECL": [
+        [_a_decl_frame, "DECL", _a_item, "LISTADECL"],
+        [],
+    ],
+    # Decl → DeclClase | Tipo id (DeclFunc | DeclVar)
+    "DECL": [
+        ["DECLCLASE"],
+        ["TIPO", _k(TokenType.ID, "Expected identifier after type"), "DECL_RESTO"],
+    ],
+    "DECL_RESTO": [
+        ["FUNC_RESTO"],
+        _default("VAR_RESTO"),
+    ],
+    "VAR_RESTO": [
+        ["INICIALIZACION", _a_declarator, _a_list1, "LISTAID'",
+         _t(TokenType.PUNTO_COMA, "Expected ';' after variable declaration"), _a_var_decl],
+    ],
+    "LISTAID'": [
+        [_t(TokenType.COMA), _k(TokenType.ID, "Expected identifier after ','"),
+         "INICIALIZACION", _a_declarator, _a_append, "LISTAID'"],
+        [],
+    ],
+    "INICIALIZACION": [
+        [_t(TokenType.OP_ASIG), "EXPR"],
+        [_a_none],
+    ],
+    "TIPO": [[_k(type_)] for type_ in TIPOS],
+
+    # ===== funciones =====
+    "FUNC_RESTO": [
+        [_t(TokenType.PAREN_IZQ, "Expected '(' after function name"), "PARAMETROS",
+         _t(TokenType.PAREN_DER, "Expected ')' after parameters"), "BLOQUE", _a_func_decl],
+    ],
+    "PARAMETROS": [
+        _on([TokenType.PAREN_DER], _a_list),
+        _default(_a_list, "PARAM", _a_append, "PARAMLISTA'"),
+    ],
+    "PARAMLISTA'": [
+        [_t(TokenType.COMA), "PARAM", _a_append, "PARAMLISTA'"],
+        [],
+    ],
+    "PARAM": [
+        ["TIPO", _k(TokenType.ID, "Expected parameter name"), _a_param],
+    ],
+
+    # ===== clases =====
+    "DECLCLASE": [
+        [_k(TokenType.CLASS), _k(TokenType.ID, "Expected class name"),
+         _t(TokenType.LLAVE_IZQ, "Expected '{' after class name"), _a_list, "LISTAMIEMBROS",
+         _t(TokenType.LLAVE_DER, "Expected '}' after class body"), _a_class_decl],
+    ],
+    "LISTAMIEMBROS": [
+        [_a_member_frame, "MIEMBRO", _a_item, "LISTAMIEMBROS"],
+        [],
+    ],
+    "MIEMBRO": [
+        ["MODIFICADORACCESO", "TIPO", _k(TokenType.ID, "Expected identifier in class member"),
+         "DECL_RESTO", _a_class_member],
+    ],
+    "MODIFICADORACCESO": [
+        [_k(TokenType.PUBLIC)],
+        [_k(TokenType.PRIVATE)],
+        [_a_none],
+    ],
+
+    # ===== bloques y sentencias =====
+    "BLOQUE": [
+        [_k(TokenType.LLAVE_IZQ, "Expected '{'"), _a_list, "LISTASENTENCIAS",
+         _t(TokenType.LLAVE_DER, "Expected '}'"), _a_block],
+    ],
+    "LISTASENTENCIAS": [
+        # Parser.es_inicio_sentencia (incluye `void`, que falla como expresión)
+        _on(
+            (TokenType.LLAVE_IZQ, TokenType.IF, TokenType.WHILE, TokenType.FOR,
+             TokenType.SWITCH, TokenType.RETURN, TokenType.PUNTO_COMA, TokenType.ID)
+            + TIPOS + LITERALES
+            + (TokenType.PAREN_IZQ, TokenType.OP_NOT, TokenType.OP_RESTA,
+               TokenType.OP_INC, TokenType.OP_DEC),
+            _a_stmt_frame, "SENTENCIA", _a_item, "LISTASENTENCIAS",
+        ),
+        [],
+    ],
+    "SENTENCIA": [
+        _on(TIPOS_VAR, "TIPO", _k(TokenType.ID, "Expected identifier after type"), "DECLVAR_SENT"),
+        ["BLOQUE"],
+        ["SENTENCIASEL"],
+        ["SENTENCIAWHILE"],
+        ["SENTENCIAFOR"],
+        ["SENTENCIASWITCH"],
+        ["SENTENCIARET"],
+        _default("SENTENCIAEXPR"),
+    ],
+    # declaración dentro de sentencia: `int a[10], b;` o `int a = 1, b;`
+    "DECLVAR_SENT": [
+        [_t(TokenType.CORCHETE_IZQ), "EXPR", _a_drop,
+         _t(TokenType.CORCHETE_DER, "Expected ']' after array size"),
+         _a_array_declarator, _a_list1, "LISTAARREGLO'",
+         _t(TokenType.PUNTO_COMA, "Expected ';' after array declaration"), _a_var_decl_stmt],
+        _default("INICIALIZACION", _a_declarator, _a_list1, "LISTAVAR'",
+                 _t(TokenType.PUNTO_COMA, "Expected ';' after variable declaration"),
+                 _a_var_decl_stmt),
+    ],
+    "LISTAARREGLO'": [
+        [_t(TokenType.COMA), _k(TokenType.ID, "Expected identifier after ','"),
+         "ARREGLO_OPT", _a_append, "LISTAARREGLO'"],
+        [],
+    ],
+    "ARREGLO_OPT": [
+        [_t(TokenType.CORCHETE_IZQ), "EXPR", _a_drop,
+         _t(TokenType.CORCHETE_DER, "Expected ']'"), _a_array_declarator],
+        [_a_plain_declarator],
+    ],
+    "LISTAVAR'": [
+        [_t(TokenType.COMA), _k(TokenType.ID, "Expected identifier"),
+         "INICIALIZACION", _a_declarator, _a_append, "LISTAVAR'"],
+        [],
+    ],
+    "SENTENCIAEXPR": [
+        [_k(TokenType.PUNTO_COMA), _a_empty_stmt],
+        _default("EXPR", _t(TokenType.PUNTO_COMA, "Expected ';' after expression"), _a_expr_stmt),
+    ],
+    "SENTENCIASEL": [
+        [_k(TokenType.IF), _t(TokenType.PAREN_IZQ, "Expected '(' after 'if'"), "EXPR",
+         _t(TokenType.PAREN_DER, "Expected ')' after if condition"), "SENTENCIA", "ELSE_OPT", _a_if],
+    ],
+    "ELSE_OPT": [
+        [_t(TokenType.ELSE), "SENTENCIA"],
+        [_a_none],
+    ],
+    "SENTENCIAWHILE": [
+        [_k(TokenType.WHILE), _t(TokenType.PAREN_IZQ, "Expected '(' after 'while'"), "EXPR",
+         _t(TokenType.PAREN_DER, "Expected ')' after while condition"), "SENTENCIA", _a_while],
+    ],
+    "SENTENCIAFOR": [
+        [_k(TokenType.FOR), _t(TokenType.PAREN_IZQ, "Expected '(' after 'for'"), "FORINIT",
+         _t(TokenType.PUNTO_COMA, "Expected ';' after for init"), "EXPR_OPT_PC",
+         _t(TokenType.PUNTO_COMA, "Expected ';' after for condition"), "FORUPDATE",
+         _t(TokenType.PAREN_DER, "Expected ')' after for clauses"), "SENTENCIA", _a_for],
+    ],
+    "FORINIT": [
+        _on([TokenType.PUNTO_COMA], _a_none),
+        _on(TIPOS_VAR, "TIPO", _k(TokenType.ID, "Expected identifier in for init"),
+            "INICIALIZACION", _a_declarator, _a_list1, "LISTAID'", _a_var_decl_sin_punto),
+        _default("EXPR"),
+    ],
+    # condición del for y valor de return: vacíos solo ante ';'
+    "EXPR_OPT_PC": [
+        _on([TokenType.PUNTO_COMA], _a_none),
+        _default("EXPR"),
+    ],
+    "FORUPDATE": [
+        _on([TokenType.PAREN_DER], _a_none),
+        _default("EXPR"),
+    ],
+    "SENTENCIASWITCH": [
+        [_k(TokenType.SWITCH), _t(TokenType.PAREN_IZQ, "Expected '(' after 'switch'"), "EXPR",
+         _t(TokenType.PAREN_DER, "Expected ')' after switch expr"),
+         _t(TokenType.LLAVE_IZQ, "Expected '{' after switch header"), _a_list, "LISTACASOS",
+         _t(TokenType.LLAVE_DER, "Expected '}' after switch body"), _a_switch],
+    ],
+    "LISTACASOS": [
+        ["CASO", _a_append, "LISTACASOS"],
+        [],
+    ],
+    "CASO": [
+        [_k(TokenType.CASE), "EXPR", _t(TokenType.PUNTO_COMA, "Expected ':' after case expression"),
+         _a_list, "LISTASENTENCIAS", _a_case],
+        [_k(TokenType.DEFAULT), _a_none, _t(TokenType.PUNTO_COMA, "Expected ':' after default"),
+         _a_list, "LISTASENTENCIAS", _a_case],
+    ],
+    "SENTENCIARET": [
+        [_k(TokenType.RETURN), "EXPR_OPT_PC",
+         _t(TokenType.PUNTO_COMA, "Expected ';' after 'return'"), _a_return],
+    ],
+
+    # ===== expresiones =====
+    "EXPR": [
+        ["EXPRLOGICA", "EXPRASIGNACION'"],
+    ],
+    "EXPRASIGNACION'": [
+        [_t(TokenType.OP_ASIG), _a_assign_target, "EXPR", _a_assign],
+        [],
+    ],
+    "EXPRLOGICA": [["EXPRAND", "EXPRLOGICA'"]],
+    "EXPRLOGICA'": [
+        [_k(TokenType.OP_OR), "EXPRAND", _a_logical_or, "EXPRLOGICA'"],
+        [],
+    ],
+    "EXPRAND": [["EXPRIGUALDAD", "EXPRAND'"]],
+    "EXPRAND'": [
+        [_k(TokenType.OP_AND), "EXPRIGUALDAD", _a_logical_and, "EXPRAND'"],
+        [],
+    ],
+    "EXPRIGUALDAD": [["EXPRRELACIONAL", "EXPRIGUALDAD'"]],
+    "EXPRIGUALDAD'": [
+        [_k(type_), "EXPRRELACIONAL", _a_equality, "EXPRIGUALDAD'"]
+        for type_ in (TokenType.OP_IGUAL, TokenType.OP_DISTINTO)
+    ] + [[]],
+    "EXPRRELACIONAL": [["EXPRADITIVA", "EXPRRELACIONAL'"]],
+    "EXPRRELACIONAL'": [
+        [_k(type_), "EXPRADITIVA", _a_relational, "EXPRRELACIONAL'"]
+        for type_ in (TokenType.OP_MENOR, TokenType.OP_MENOR_IG,
+                      TokenType.OP_MAYOR, TokenType.OP_MAYOR_IG)
+    ] + [[]],
+    "EXPRADITIVA": [["TERM", "EXPRADITIVA'"]],
+    "EXPRADITIVA'": [
+        [_k(type_), "TERM", _a_binary, "EXPRADITIVA'"]
+        for type_ in (TokenType.OP_SUMA, TokenType.OP_RESTA)
+    ] + [[]],
+    "TERM": [["FACTOR", "TERM'"]],
+    "TERM'": [
+        [_k(type_), "FACTOR", _a_binary, "TERM'"]
+        for type_ in (TokenType.OP_MULT, TokenType.OP_DIV, TokenType.OP_MOD)
+    ] + [[]],
+    "FACTOR": [
+        [_k(TokenType.OP_NOT), "FACTOR", _a_unary],
+        [_k(TokenType.OP_RESTA), "FACTOR", _a_unary],
+        [_k(TokenType.OP_INC), "EXPRPOSTFIJA", _a_unary],
+        [_k(TokenType.OP_DEC), "EXPRPOSTFIJA", _a_unary],
+        _default("EXPRPOSTFIJA"),
+    ],
+    "EXPRPOSTFIJA": [["EXPRPRIMARIA", "EXPRPOSTFIJA'"]],
+    "EXPRPOSTFIJA'": [
+        [_k(TokenType.OP_INC), _a_postfix],
+        [_k(TokenType.OP_DEC), _a_postfix],
+        [],
+    ],
+    "EXPRPRIMARIA": [[_k(type_), _a_literal] for type_ in LITERALES] + [
+        [_k(TokenType.ID), "ID_RESTO"],
+        [_k(TokenType.PAREN_IZQ), "EXPR",
+         _t(TokenType.PAREN_DER, "Expected ')' after expression"), _a_grouping],
+    ],
+    # id seguido de llamada, acceso a arreglo o nada
+    "ID_RESTO": [
+        [_t(TokenType.PAREN_IZQ), "ARGSOPTS",
+         _t(TokenType.PAREN_DER, "Expected ')' after function arguments"), _a_call],
+        [_t(TokenType.CORCHETE_IZQ), "EXPR",
+         _t(TokenType.CORCHETE_DER, "Expected ']' after array index"), _a_index],
+        [_a_identifier],
+    ],
+    "ARGSOPTS": [
+        _on([TokenType.PAREN_DER], _a_list),
+        _default(_a_list, "EXPR", _a_append, "LISTAARGS'"),
+    ],
+    "LISTAARGS'": [
+        [_t(TokenType.COMA), "EXPR", _a_append, "LISTAARGS'"],
+        [],
+    ],
+}
+
+START = "S"
+
+# no terminales que pueden quedarse sin producción: mensaje de Parser
+_TYPE_ERROR = "Expected type (int, float, double, char, bool, void)"
+NONTERMINAL_ERRORS = {
+    "TIPO": _TYPE_ERROR,
+    "EXPRPRIMARIA": "Invalid expression start",
+}
+
+
+# ===== construcción de la tabla =====
+
+class LL1Table:
+    """Tabla predictiva densa construida una vez desde GRAMMAR.
+
+    Los símbolos se codifican como enteros: [0, nt_base) son terminales
+    (uno por aparición distinta de tipo/mensaje/valor), [nt_base,
+    action_base) no terminales y desde action_base acciones. La tabla es un
+    array('H') plano indexado por no_terminal * width + token.value, con el
+    número de producción (0 = error); rhs[producción] es el lado derecho ya
+    invertido, listo para apilar.
+    """
+
+    def __init__(self, grammar: dict, start: str):
+        self.nonterminals = list(grammar)
+        nt_index = {name: i for i, name in enumerate(self.nonterminals)}
+        self.width = len(TokenType) + 1
+
+        # terminales y acciones distintos
+        terminals = {}
+        actions = {}
+        for productions in grammar.values():
+            for production in productions:
+                for symbol in self._rhs(production):
+                    if isinstance(symbol, tuple):
+                        terminals.setdefault(symbol[1:], len(terminals))
+                    elif callable(symbol):
+                        actions.setdefault(symbol, len(actions))
+        self.nt_base = len(terminals)
+        self.action_base = self.nt_base + len(self.nonterminals)
+        self.term_kind = [0] * len(terminals)
+        self.term_msg = [None] * len(terminals)
+        self.term_keep = [False] * len(terminals)
+        for (type_, msg, keep), code in terminals.items():
+            self.term_kind[code] = type_.value
+            self.term_msg[code] = msg
+            self.term_keep[code] = keep
+        self.actions = list(actions)
+
+        def encode(symbol):
+            if isinstance(symbol, tuple):
+                return terminals[symbol[1:]]
+            if callable(symbol):
+                return self.action_base + actions[symbol]
+            return self.nt_base + nt_index[symbol]
+
+        first, nullable = self._first_sets(grammar)
+
+        self.rhs = [None]  # producción 0: error
+        self.table = array("H", [0]) * (len(self.nonterminals) * self.width)
+        for name, productions in grammar.items():
+            row = nt_index[name] * self.width
+            fallback = None
+            for production in productions:
+                rhs = self._rhs(production)
+                number = len(self.rhs)
+                self.rhs.append(tuple(encode(symbol) for symbol in reversed(rhs)))
+                if isinstance(production, tuple) and production[0] == "on":
+                    predict = {type_.value for type_ in production[1]}
+                else:
+                    predict, empty = self._first_of(rhs, first, nullable)
+                    if empty or (isinstance(production, tuple) and production[0] == "default"):
+                        if fallback is not None:
+                            raise ValueError(f"{name}: more than one default production")
+                        fallback = number
+                for kind in predict:
+                    if self.table[row + kind]:
+                        raise ValueError(f"LL(1) conflict in {name} on {TokenType(kind)}")
+                    self.table[row + kind] = number
+            if fallback is None and len(productions) == 1:
+                # producción única: el error sale en su primer terminal
+                fallback = number
+            if fallback is not None:
+                for kind in range(self.width):
+                    if not self.table[row + kind]:
+                        self.table[row + kind] = fallback
+
+        self.start = encode(start)
+        self.errors = {nt_index[name] + self.nt_base: msg
+                       for name, msg in NONTERMINAL_ERRORS.items()}
+
+    @staticmethod
+    def _rhs(production):
+        if isinstance(production, tuple):
+            return production[2]
+        return production
+
+    def _first_of(self, rhs, first, nullable):
+        """(FIRST de una secuencia como valores de TokenType, ¿es anulable?)"""
+        result = set()
+        for symbol in rhs:
+            if callable(symbol):
+                continue
+            if isinstance(symbol, tuple):
+                result.add(symbol[1].value)
+                return result, False
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        return result, True
+
+    def _first_sets(self, grammar):
+        """FIRST y anulables por punto fijo (las acciones son transparentes)"""
+        first = {name: set() for name in grammar}
+        nullable = set()
+        changed = True
+        while changed:
+            changed = False
+            for name, productions in grammar.items():
+                for production in productions:
+                    symbols, empty = self._first_of(self._rhs(production), first, nullable)
+                    if not symbols <= first[name]:
+                        first[name] |= symbols
+                        changed = True
+                    if empty and name not in nullable:
+                        nullable.add(name)
+                        changed = True
+        return first, nullable
+
+
+TABLE = LL1Table(GRAMMAR, START)
+
+
+# ===== motor =====
+
+class LL1Parser:
+    """Parser LL(1) dirigido por TABLE con pila explícita.
+
+    Acepta lo mismo que Parser y construye el mismo AST (mismos mensajes de
+    ParserError). Cada decisión es un acceso a la tabla por el tipo del
+    token actual, sin recursión ni llamadas por nivel de la gramática.
+    tokens puede ser list[Token] o un TokenBuffer. Con recover=True se
+    recupera igual que Parser(recover=True): mismos errores y mismo AST.
+    """
+
+    def __init__(self, tokens, recover: bool = False):
+        self.tokens = tokens
+        if isinstance(tokens, TokenBuffer):
+            self.kinds = tokens.kinds
+        else:
+            self.kinds = [tok.type.value for tok in tokens]
+        self.pos = 0
+        self.values = []
+        self.stack = []
+        self.recover = recover
+        self.errors: list[str] = []
+        self.frames = []  # marcos de recuperación abiertos (ver _frame)
+
+    def current(self):
+        if self.pos >= len(self.tokens):
+            return self.tokens[-1]
+        return self.tokens[self.pos]
+
+    def spanned(self, node, start_token):
+        """Anota en node su primer token y el último consumido; retorna node"""
+        node.start_token = start_token
+        node.end_token = self.tokens[self.pos - 1]
+        return node
+
+    def parse(self) -> Program:
+        """Análisis sintáctico: retorna el AST raíz"""
+        self.stack = [TABLE.start]
+        while True:
+            try:
+                self._run()
+                return self.values.pop()
+            except ParserError as error:
+                if not self.recover:
+                    raise
+                self._recover_error(error)
+
+    def _run(self):
+        """Vacía la pila de símbolos desde self.pos"""
+        table = TABLE
+        grammar_table = table.table
+        rhs = table.rhs
+        width = table.width
+        nt_base = table.nt_base
+        action_base = table.action_base
+        term_kind = table.term_kind
+        term_keep = table.term_keep
+        actions = table.actions
+        tokens = self.tokens
+        kinds = self.kinds
+        values = self.values
+        stack = self.stack
+        pop = stack.pop
+        push = stack.extend
+        pos = self.pos
+
+        while stack:
+            symbol = pop()
+            if symbol < nt_base:
+                if kinds[pos] != term_kind[symbol]:
+                    self.pos = pos
+                    raise self._expected(symbol)
+                if term_keep[symbol]:
+                    values.append(tokens[pos])
+                pos += 1
+            elif symbol < action_base:
+                production = grammar_table[(symbol - nt_base) * width + kinds[pos]]
+                if not production:
+                    self.pos = pos
+                    raise self._unexpected(symbol)
+                push(rhs[production])
+            else:
+                self.pos = pos
+                actions[symbol - action_base](self)
+
+        self.pos = pos
+
+    def _recover_error(self, error: ParserError):
+        """Modo recover: registra el error y deja la pila lista para seguir"""
+        tok = self.current()
+        stack = self.stack
+        if self.frames:
+            base, size, start, stop, node_class = self.frames[-1]
+            del stack[base:]
+            del self.values[size:]
+            items = self.values
+        else:
+            # fuera de todo elemento solo puede fallar el EOF de S (basura
+            # entre declaraciones): se sigue como un elemento más de ListaDecl
+            table = TABLE
+            s_rhs = table.rhs[table.table[(table.start - table.nt_base) * table.width
+                                          + TokenType.BOF.value]]
+            if stack != [s_rhs[0]]:
+                raise error
+            start = self.pos
+            stop = SYNC_DECL
+            node_class = ErrorDecl
+            items = self.values[-1]
+            stack.extend(s_rhs[1:3])  # EOF, LISTADECL
+        self.errors.append(str(error))
+        self.pos = synchronize(self.kinds.__getitem__, start, self.pos, stop)
+        # el nodo de error cubre los tokens descartados
+        tokens = self.tokens
+        items.append(node_class(tok, str(error), start_token=tokens[start],
+                                end_token=tokens[max(self.pos, start + 1) - 1]))
+
+    def _expected(self, symbol: int) -> ParserError:
+        tok = self.current()
+        msg = TABLE.term_msg[symbol] or f"Expected {TokenType(TABLE.term_kind[symbol])}"
+        return ParserError(
+            f"[L{tok.line},C{tok.column}] {msg}. Found {tok.type} ({tok.lexeme!r})"
+        )
+
+    def _unexpected(self, symbol: int) -> ParserError:
+        tok = self.current()
+        msg = TABLE.errors.get(symbol)
+        if msg == _TYPE_ERROR:
+            return ParserError(msg)
+        if msg is None:
+            msg = f"Unexpected token in {TABLE.nonterminals[symbol - TABLE.nt_base]}"
+        return ParserError(
+            f"[L{tok.line},C{tok.column}] {msg}: {tok.type} ({tok.lexeme!r})"
+        )
@@ -0,0 +1,181 @@
+# parser_parallel.py
+import io
+import os
+import pickle
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, is_dataclass
+from operator import attrgetter
+
+import ast_nodes
+from tokens import TokenType, Token, TOKEN_TYPES_BY_VALUE
+from ast_nodes import Program
+from parser import Parser
+
+
+# por debajo de estos tokens por trozo no compensa repartir el trabajo
+MIN_CHUNK_TOKENS = 32 * 1024
+
+
+def split_declarations(kinds, start: int, end: int) -> list[int]:
+    """Fronteras de las declaraciones de nivel superior en kinds[start:end].
+
+    Por profundidad de llaves: una declaración termina en un ';' fuera de
+    llaves o en la '}' que vuelve a profundidad 0 (una '}' suelta también
+    cierra). Retorna el índice siguiente a cada cierre.
+    """
+    semicolon = TokenType.PUNTO_COMA.value
+    open_brace = TokenType.LLAVE_IZQ.value
+    close_brace = TokenType.LLAVE_DER.value
+    bounds = []
+    depth = 0
+    for i in range(start, end):
+        kind = kinds[i]
+        if kind == open_brace:
+            depth += 1
+        elif kind == close_brace:
+            if depth <= 1:
+                depth = 0
+                bounds.append(i + 1)
+            else:
+                depth -= 1
+        elif kind == semicolon and depth == 0:
+            bounds.append(i + 1)
+    return bounds
+
+
+# ===== transporte del AST entre procesos =====
+# Los nodos viajan como _make_node(clase, span, campos), que se deshace con
+# una llamada en lugar de __new__ + __dict__ (la mitad de tiempo al
+# cargar), y los tokens como _token_ref(índice global): el proceso
+# principal ya los tiene, así el AST armado apunta a los mismos Token que
+# el de parse().
+
+def _make_node(node_class, start_token, end_token, *values):
+    return node_class(*values, start_token=start_token, end_token=end_token)
+
+
+def _node_reducer(node_class):
+    names = [field.name for field in fields(node_class) if not field.kw_only]
+    get = attrgetter(*names)
+    if len(names) == 1:
+        return lambda node: (_make_node, (node_class, node.start_token, node.end_token, get(node)))
+    return lambda node: (_make_node, (node_class, node.start_token, node.end_token) + get(node))
+
+
+# nodos concretos: las bases abstractas solo tienen los campos del span
+AST_REDUCERS = {
+    node_class: _node_reducer(node_class)
+    for node_class in vars(ast_nodes).values()
+    if isinstance(node_class, type) and is_dataclass(node_class)
+    and any(not field.kw_only for field in fields(node_class))
+}
+
+
+def _token_ref(index: int):
+    # solo se referencia: _ASTUnpickler la sustituye por tokens[index]
+    raise RuntimeError("token reference outside _ASTUnpickler")
+
+
+def _dump_ast(obj, token_index: dict) -> bytes:
+    out = io.BytesIO()
+    pickler = pickle.Pickler(out, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = dict(AST_REDUCERS)
+    pickler.dispatch_table[Token] = lambda tok: (_token_ref, (token_index[id(tok)],))
+    pickler.dump(obj)
+    return out.getvalue()
+
+
+class _ASTUnpickler(pickle.Unpickler):
+    def __init__(self, file, tokens):
+        super().__init__(file)
+        self.tokens = tokens
+
+    def find_class(self, module, name):
+        if module == __name__ and name == "_token_ref":
+            return self.tokens.__getitem__
+        return super().find_class(module, name)
+
+
+def _parse_chunk(start: int, kinds, lexemes, lines, columns, name_ids, eof: tuple,
+                 expr_engine: str, recover: bool) -> bytes:
+    """Parsea un trozo de declaraciones completas (en un proceso del pool).
+
+    El trozo empieza en el token global start y se cierra con una copia
+    del EOF real (eof = índice, línea, columna); como empieza y termina en fronteras de declaración, el
+    parser hace y ve lo mismo que en el análisis secuencial. Retorna
+    (declaraciones, errores del modo recover) serializados.
+    """
+    types = TOKEN_TYPES_BY_VALUE
+    tokens = [Token(types[kind], lexeme, line, column, name_id)
+              for kind, lexeme, line, column, name_id
+              in zip(kinds, lexemes, lines, columns, name_ids)]
+    eof_index, eof_line, eof_column = eof
+    tokens.append(Token(TokenType.EOF, "EOF", eof_line, eof_column))
+    parser = Parser(tokens, expr_engine, recover)
+    declarations = parser.parse_declarations()
+
+    token_index = {id(tok): start + i for i, tok in enumerate(tokens)}
+    token_index[id(tokens[-1])] = eof_index
+    return _dump_ast((declarations, parser.errors), token_index)
+
+
+def parse_parallel(parser: Parser, workers: int = None) -> Program:
+    """Parsea los tokens de `parser` en paralelo; equivale a parser.parse().
+
+    Tras el BOF, un pre-escaneo por profundidad de llaves encuentra las
+    fronteras de las declaraciones de nivel superior; los tokens se cortan
+    en trozos de declaraciones completas y cada trozo se parsea en un
+    ProcessPoolExecutor con el motor de expresiones y el modo recover del
+    parser. Los errores salen con el mismo mensaje y posición: sin recover
+    se relanza el del primer trozo que falló, que es el primero del fuente;
+    con recover se concatenan en orden.
+    """
+    tokens = parser.tokens
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers, max(1, len(tokens) // MIN_CHUNK_TOKENS))
+    if parts <= 1 or tokens[-1].type != TokenType.EOF:
+        return parser.parse()
+
+    parser.consume(TokenType.BOF, "Expected BOF at start of file")
+    end = len(tokens) - 1
+    kinds = array("i", [tokens[i].type.value for i in range(end)])
+    bounds = split_declarations(kinds, parser.pos, end)
+
+    # cortes en la primera frontera tras cada parte igual de tokens
+    cuts = [parser.pos]
+    for i in range(1, parts):
+        j = bisect_left(bounds, parser.pos + i * (end - parser.pos) // parts)
+        if j < len(bounds) and cuts[-1] < bounds[j] < end:
+            cuts.append(bounds[j])
+    cuts.append(end)
+
+    chunks = []
+    for start, stop in zip(cuts, cuts[1:]):
+        chunk = [tokens[i] for i in range(start, stop)]
+        chunks.append((
+            start,
+            kinds[start:stop],
+            [tok.lexeme for tok in chunk],
+            array("i", [tok.line for tok in chunk]),
+            array("i", [tok.column for tok in chunk]),
+            [tok.name_id for tok in chunk],
+        ))
+    eof = (end, tokens[end].line, tokens[end].column)
+
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        results = pool.map(
+            _parse_chunk, *zip(*chunks),
+            [eof] * len(chunks),
+            [parser.expr_engine] * len(chunks),
+            [parser.recover] * len(chunks),
+        )
+        declarations = []
+        for data in results:
+            chunk_declarations, errors = _ASTUnpickler(io.BytesIO(data), tokens).load()
+            declarations.extend(chunk_declarations)
+            parser.errors.extend(errors)
+
+    parser.pos = len(tokens)
+    return Program(declarations, start_token=tokens[0], end_token=tokens[end])
@@ -0,0 +1,110 @@
+# semantic_parallel.py
+import multiprocessing
+import os
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import List
+
+from ast_nodes import Program
+from analizador_semantico import SemanticAnalyzer
+from name_resolver import NameResolver
+
+
+# por debajo de esto por proceso, crear el pool cuesta más de lo que ahorra
+MIN_CHUNK_LINES = 4 * 1024
+
+# AST que heredan los procesos del pool (fork): no se serializa
+_program = None
+
+
+def _declaration_lines(program: Program) -> List[int]:
+    """Líneas de fuente de cada declaración de nivel superior (1 sin span)"""
+    lines = []
+    for decl in program.declarations:
+        if decl.start_token is None or decl.end_token is None:
+            lines.append(1)
+        else:
+            lines.append(decl.end_token.line - decl.start_token.line + 1)
+    return lines
+
+
+def _check_declarations(start: int, stop: int) -> tuple:
+    """Resuelve y verifica program.declarations[start:stop] (en un proceso
+    del pool). Retorna (errores, True si hubo una excepción inesperada).
+    """
+    program = _program
+    analyzer = SemanticAnalyzer()
+    try:
+        NameResolver().resolve_declarations(program, start, stop)
+        for decl in program.declarations[start:stop]:
+            analyzer.visit(decl)
+    except Exception:
+        return analyzer.errors, True
+    return analyzer.errors, False
+
+
+def analyze_parallel(analyzer: SemanticAnalyzer, program: Program, workers: int = None) -> List[str]:
+    """Analiza `program` en paralelo; equivale a analyzer.analyze(program).
+
+    Tras la resolución de nombres, cada declaración de nivel superior se
+    verifica sola: su resultado depende solo de los símbolos de su
+    subárbol. Las declaraciones se cortan en trozos contiguos de líneas
+    parecidas y cada proceso del pool (creado con fork: hereda el AST sin
+    serializarlo) arma el scope global que vería el primero de sus
+    trozos (NameResolver.resolve_declarations), resuelve y verifica sus
+    declaraciones y retorna sus errores. Mientras tanto, este proceso
+    resuelve el programa entero, así el AST queda con sus symbol, y
+    reporta las redefiniciones de la primera pasada. Los errores se
+    concatenan en el orden del fuente: la lista es la misma que la de
+    analyze().
+
+    Los expr_type se calculan en los procesos del pool y no vuelven: en
+    el AST de este proceso quedan en None y analyzer.type_of() los
+    calcula al pedirlos. Sin fork (Windows, macOS) o con un programa
+    chico se analiza secuencialmente; si un proceso falla con una
+    excepción inesperada, se repite el análisis secuencial, que la
+    reporta como siempre.
+    """
+    global _program
+    workers = workers or os.cpu_count() or 1
+    lines = _declaration_lines(program)
+    total = sum(lines)
+    parts = min(workers, len(lines), max(1, total // MIN_CHUNK_LINES))
+    if parts <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return analyzer.analyze(program)
+
+    # cortes en la primera declaración tras cada parte igual de líneas
+    ends = list(accumulate(lines))
+    cuts = [0]
+    for i in range(1, parts):
+        j = bisect_left(ends, i * total // parts) + 1
+        if cuts[-1] < j < len(lines):
+            cuts.append(j)
+    cuts.append(len(lines))
+
+    _program = program
+    try:
+        with ProcessPoolExecutor(max_workers=len(cuts) - 1,
+                                 mp_context=multiprocessing.get_context("fork")) as pool:
+            futures = [pool.submit(_check_declarations, start, stop)
+                       for start, stop in zip(cuts, cuts[1:])]
+            # los procesos ya se crearon (con fork se crean todos al primer
+            # submit): anotar el AST acá no cambia el que ven ellos
+            try:
+                analyzer.global_scope = NameResolver().resolve(program)
+                for decl in program.declarations:
+                    analyzer.collect_declaration(decl)
+                failed = False
+            except Exception:
+                failed = True
+            results = [future.result() for future in futures]
+    finally:
+        _program = None
+
+    if failed or any(chunk_failed for _, chunk_failed in results):
+        analyzer.errors = []
+        return analyzer.analyze(program)
+    for errors, _ in results:
+        analyzer.errors.extend(errors)
+    return analyzer.errors
@@ -0,0 +1,45 @@
+# source_input.py
+import mmap
+
+from analizador_lexico import Lexer
+
+
+class SourceFile:
+    """Archivo fuente mapeado en memoria (mmap) en modo solo lectura.
+
+    Evita leer y decodificar todo el archivo antes de lexear: `lexer()`
+    entrega un Lexer sobre los bytes mapeados, y
+    `lexer().scan_buffer(lazy_positions=True)` lexea directamente sobre ellos
+    si el archivo es ASCII. El archivo debe seguir abierto mientras se usen
+    los lexemas del TokenBuffer resultante.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no admite archivos vacíos
+            self.data = b""
+
+    def __len__(self):
+        return len(self.data)
+
+    def lexer(self, **kwargs) -> Lexer:
+        return Lexer(self.data, **kwargs)
+
+    def text(self) -> str:
+        """Contenido decodificado (copia completa)"""
+        return str(self.data, "utf-8")
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,48 @@
+# source_map.py
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+
+NEWLINE_BYTES = re.compile(rb"\n")
+
+
+class SourceMap:
+    """Índice de inicios de línea de un fuente.
+
+    Se construye una sola vez (split + accumulate, sin recorrer el texto
+    carácter a carácter) y convierte offsets en (línea, columna), ambas
+    desde 1, por bisección: O(log n) por consulta.
+
+    También acepta fuentes bytes/mmap; entonces los offsets son de bytes.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        if isinstance(source, str):
+            # inicio de cada línea = suma de (longitud + 1) de las anteriores
+            lengths = map((1).__add__, map(len, source.split("\n")))
+            self.line_starts = array("i", accumulate(lengths, initial=0))
+            self.line_starts.pop()  # el último valor queda después del fin del texto
+        else:
+            self.line_starts = array("i", [0])
+            self.line_starts.extend(m.end() for m in NEWLINE_BYTES.finditer(source))
+
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        return bisect_right(self.line_starts, offset)
+
+    def line_col(self, offset: int) -> tuple[int, int]:
+        line = bisect_right(self.line_starts, offset)
+        return line, offset - self.line_starts[line - 1] + 1
+
+    def line_text(self, line: int) -> str:
+        start = self.line_starts[line - 1]
+        if line < len(self.line_starts):
+            text = self.source[start:self.line_starts[line] - 1]
+        else:
+            text = self.source[start:]
+        return text if isinstance(text, str) else str(text, "utf-8")
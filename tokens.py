@@ -1,4 +1,5 @@
 # tokens.py
+from array import array
 from enum import Enum, auto
 
 
@@ -87,11 +88,186 @@ class TokenType(Enum):
 
 
 class Token:
-    def __init__(self, type_, lexeme, line, column=0):
+    def __init__(self, type_, lexeme, line, column=0, name_id=None):
         self.type = type_
         self.lexeme = lexeme
         self.line = line
         self.column = column
+        self.name_id = name_id  # id en la StringTable (solo identificadores)
 
     def __repr__(self):
         return f"Token({self.type}, {self.lexeme!r}, line={self.line}, col={self.column})"
+
+
+class StringTable:
+    """Tabla de cadenas por compilación.
+
+    Interna los lexemas de identificadores y literales: cada texto distinto
+    se guarda una sola vez. Los identificadores reciben además un id entero
+    pequeño (su posición en `names`), estable durante toda la compilación.
+    """
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.names: list[str] = []
+        self.literals: dict[str, str] = {}
+
+    def intern(self, text: str) -> int:
+        """Retorna el id de `text`, registrándolo si es nuevo"""
+        name_id = self.ids.get(text)
+        if name_id is None:
+            name_id = len(self.names)
+            self.ids[text] = name_id
+            self.names.append(text)
+        return name_id
+
+    def canonical(self, text: str) -> str:
+        """Retorna la copia compartida de un literal (sin asignarle id)"""
+        return self.literals.setdefault(text, text)
+
+    def lookup(self, text: str):
+        """Id de `text` o None si nunca se internó"""
+        return self.ids.get(text)
+
+    def __len__(self):
+        return len(self.names)
+
+
+# TokenType indexado por su valor entero (los valores de auto() empiezan en 1)
+TOKEN_TYPES_BY_VALUE = (None,) + tuple(TokenType)
+
+
+class TokenView:
+    """Vista tipo Token sobre una posición de un TokenBuffer.
+
+    Expone type, lexeme, line y column como Token, pero los lee de las
+    columnas del buffer; el lexema se corta del fuente al pedirlo.
+    """
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return TOKEN_TYPES_BY_VALUE[self.buffer.kinds[self.index]]
+
+    @property
+    def lexeme(self):
+        return self.buffer.lexeme(self.index)
+
+    @property
+    def line(self):
+        buffer = self.buffer
+        if buffer.source_map is not None:
+            return buffer.position(self.index)[0]
+        return buffer.lines[self.index]
+
+    @property
+    def column(self):
+        buffer = self.buffer
+        if buffer.source_map is not None:
+            return buffer.position(self.index)[1]
+        return buffer.columns[self.index]
+
+    @property
+    def offset(self):
+        return self.buffer.offset(self.index)
+
+    @property
+    def name_id(self):
+        name_id = self.buffer.name_ids[self.index]
+        return None if name_id < 0 else name_id
+
+    def to_token(self) -> Token:
+        return Token(self.type, self.lexeme, self.line, self.column, self.name_id)
+
+    def __repr__(self):
+        return f"Token({self.type}, {self.lexeme!r}, line={self.line}, col={self.column})"
+
+
+class TokenBuffer:
+    """Tokens guardados como columnas array('i') (struct-of-arrays).
+
+    Por token solo se guardan tipo, offsets [start, end) del lexema en el
+    fuente, línea y columna. Indexar devuelve un TokenView, así Parser y
+    SemanticAnalyzer pueden usarlo en lugar de list[Token].
+
+    Si se da un source_map (SourceMap), las columnas lines/columns quedan
+    vacías y la posición de cada token se calcula desde su offset al
+    pedirla.
+
+    source puede ser str o bytes/mmap (UTF-8); en ese caso los lexemas se
+    decodifican al pedirlos.
+    """
+
+    def __init__(self, source: str, strings: StringTable = None, source_map=None):
+        self.source = source
+        self.strings = strings if strings is not None else StringTable()
+        self.source_map = source_map
+        self.kinds = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.name_ids = array("i")  # -1 si el token no es identificador
+        # lexemas que no son un corte del fuente (BOF, EOF)
+        self.extra_lexemes: dict[int, str] = {}
+
+    def append(self, type_: TokenType, start: int, end: int, line: int, column: int,
+               name_id: int = -1):
+        self.kinds.append(type_.value)
+        self.starts.append(start)
+        self.ends.append(end)
+        if self.source_map is None:
+            self.lines.append(line)
+            self.columns.append(column)
+        self.name_ids.append(name_id)
+
+    def append_special(self, type_: TokenType, lexeme: str, line: int, column: int,
+                       offset: int = 0):
+        self.extra_lexemes[len(self.kinds)] = lexeme
+        self.append(type_, offset, offset, line, column)
+
+    def offset(self, index: int) -> int:
+        """Offset del primer carácter del token (la comilla en STRING)"""
+        if self.kinds[index] == TokenType.STRING.value:
+            return self.starts[index] - 1
+        return self.starts[index]
+
+    def position(self, index: int) -> tuple[int, int]:
+        """(línea, columna) del token"""
+        if self.source_map is not None:
+            return self.source_map.line_col(self.offset(index))
+        return self.lines[index], self.columns[index]
+
+    def lexeme(self, index: int) -> str:
+        name_id = self.name_ids[index]
+        if name_id >= 0:
+            return self.strings.names[name_id]
+        extra = self.extra_lexemes.get(index)
+        if extra is not None:
+            return extra
+        text = self.source[self.starts[index]:self.ends[index]]
+        return text if isinstance(text, str) else str(text, "utf-8")
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TokenView(self, i) for i in range(*index.indices(len(self.kinds)))]
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("TokenBuffer index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self):
+        for i in range(len(self.kinds)):
+            yield TokenView(self, i)
+
+    def to_tokens(self) -> list[Token]:
+        """Materializa el buffer como list[Token]"""
+        return [TokenView(self, i).to_token() for i in range(len(self.kinds))]